@@ -4,7 +4,8 @@ from django.contrib import messages
 from django.db.models import Sum, Count, Avg, Q
 from django.core.paginator import Paginator
 from django.utils import timezone
-from tutors.models import TutorProfile, TutorDocument, QualityAudit, QualityCertification, Subject
+from tutors.models import TutorProfile, TutorDocument, QualityAudit, QualityCertification, Subject, TutorStats
+from tutors.stats import average_rating, stats_totals
 from bookings.models import Booking
 from payments.models import Payment, Commission
 from users.models import User
@@ -91,9 +92,11 @@ def global_admin_dashboard(request):
     total_students = User.objects.filter(role__in=['student', 'parent']).count()
     total_tutors = TutorProfile.objects.count()
     total_city_admins = User.objects.filter(role='city_admin').count()
-    total_bookings = Booking.objects.count()
-    total_revenue = Payment.objects.filter(status='completed').aggregate(Sum('amount'))['amount__sum'] or 0
-    total_commission = Payment.objects.filter(status='completed').aggregate(Sum('commission_amount'))['commission_amount__sum'] or 0
+    # Booking, payment and review totals from the tutors' daily rollup
+    stats = stats_totals(TutorStats.objects.all())
+    total_bookings = stats['bookings']
+    total_revenue = stats['revenue']
+    total_commission = stats['commission']
     
     # Quality metrics
     tutors_needing_intervention = TutorProfile.objects.filter(intervention_required=True).count()
@@ -107,8 +110,8 @@ def global_admin_dashboard(request):
     pending_safety_reports = SafetyReport.objects.filter(status='pending').count()
     
     # Reviews and ratings
-    total_reviews = Review.objects.count()
-    avg_rating = Review.objects.aggregate(Avg('rating'))['rating__avg'] or 0
+    total_reviews = stats['reviews']
+    avg_rating = average_rating(stats)
     
     # Recent activity
     recent_bookings = Booking.objects.all().order_by('-created_at')[:5]
@@ -232,6 +235,14 @@ def conduct_quality_audit(request, tutor_id):
         if action == 'resolve_intervention':
             tutor.intervention_required = False
             tutor.save()
+            # Recorded as an admin audit so scheduled audits leave the decision alone
+            QualityAudit.objects.create(
+                tutor=tutor,
+                audit_type='manual',
+                quality_score=tutor.quality_score,
+                audited_by=request.user,
+                is_resolved=True,
+            )
             messages.success(request, 'Intervention resolved. Tutor is no longer flagged for intervention.')
             return redirect('admin_panel:quality_audits')
         
@@ -0,0 +1,178 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+from datetime import timedelta
+from urllib.parse import parse_qsl, urlencode
+from django.db import DatabaseError, connection
+from django.db.models import Avg, Count, FloatField, Max, Q
+from django.db.models.fields.json import KT
+from django.db.models.functions import Cast
+from django.utils import timezone
+from .models import AnalyticsEvent
+
+logger = logging.getLogger(__name__)
+
+
+# Most events written by one insert
+SEARCH_LOG_BATCH_SIZE = 100
+
+# Longest an event waits in memory before being written (seconds)
+SEARCH_LOG_FLUSH_INTERVAL = 5.0
+
+# Searches slower than this on average (ms) are reported as slow
+SLOW_SEARCH_MS = 500
+
+
+class EventBuffer:
+    """
+    Collects analytics events in memory and writes them from a background
+    thread with one bulk insert per batch, so requests never wait on the
+    database. A batch is written when it is full or has waited
+    flush_interval seconds; anything left is written at process exit.
+    """
+
+    def __init__(self, batch_size=SEARCH_LOG_BATCH_SIZE, flush_interval=SEARCH_LOG_FLUSH_INTERVAL):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+
+    def add(self, event):
+        self.queue.put(event)
+        # Checked per event so worker processes forked after startup get their own thread
+        if self._worker is None or not self._worker.is_alive():
+            with self._lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(target=self._run, name='analytics-event-buffer', daemon=True)
+                    self._worker.start()
+
+    def flush(self):
+        """Write every queued event now, in the calling thread"""
+        batch = []
+        while True:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+            if len(batch) >= self.batch_size:
+                self._write(batch)
+                batch = []
+        if batch:
+            self._write(batch)
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            self._write(batch)
+            # The worker's connection would otherwise sit idle between batches
+            connection.close()
+
+    def _write(self, batch):
+        try:
+            AnalyticsEvent.objects.bulk_create(batch)
+        except DatabaseError:
+            # Losing analytics events must never affect the site
+            logger.exception('Could not write %d analytics event(s)', len(batch))
+
+
+_search_events = EventBuffer()
+atexit.register(_search_events.flush)
+
+
+def search_query_key(filters):
+    """Canonical string for normalized search filters, e.g. 'q=maths&city=pune'"""
+    return urlencode(filters)
+
+
+def log_search(request, filters, result_count, latency_ms, **extra):
+    """
+    Queue a tutor_search event for normalized filters (see
+    tutors.search_cache.normalize_search_filters). Returns immediately,
+    the event is written with the next batch.
+    """
+    user = request.user if request.user.is_authenticated else None
+    _search_events.add(AnalyticsEvent(
+        user=user,
+        event_type='tutor_search',
+        event_data={
+            'query_key': search_query_key(filters),
+            'filters': dict(filters),
+            'results': result_count,
+            'latency_ms': round(latency_ms, 1),
+            **extra,
+        },
+        ip_address=request.META.get('REMOTE_ADDR') or None,
+        user_agent=request.META.get('HTTP_USER_AGENT', ''),
+    ))
+
+
+def search_query_stats(days=7):
+    """
+    Logged searches of the last `days` days grouped by normalized filters,
+    with the number of searches, zero-result searches and latency.
+    """
+    latency = Cast(KT('event_data__latency_ms'), FloatField())
+    return (
+        AnalyticsEvent.objects.filter(
+            event_type='tutor_search',
+            created_at__gte=timezone.now() - timedelta(days=days)
+        )
+        .values(query_key=KT('event_data__query_key'))
+        .annotate(
+            searches=Count('id'),
+            zero_results=Count('id', filter=Q(event_data__results=0)),
+            avg_latency_ms=Avg(latency),
+            max_latency_ms=Max(latency),
+        )
+    )
+
+
+def _with_labels(rows):
+    """
+    Add each stats row's search params and a readable label naming
+    subjects instead of ids.
+    """
+    from tutors.models import Subject
+
+    rows = list(rows)
+    for row in rows:
+        row['params'] = dict(parse_qsl(row['query_key'] or ''))
+    subject_ids = {row['params']['subject'] for row in rows if row['params'].get('subject', '').isdigit()}
+    subject_names = dict(Subject.objects.filter(id__in=subject_ids).values_list('id', 'name'))
+    for row in rows:
+        described = dict(row['params'])
+        if described.get('subject', '').isdigit():
+            described['subject'] = subject_names.get(int(described['subject']), described['subject'])
+        row['label'] = ', '.join(f'{name}: {value}' for name, value in described.items()) or 'All tutors'
+    return rows
+
+
+def popular_searches(days=7, limit=20):
+    """Most frequent searches"""
+    return _with_labels(search_query_stats(days).order_by('-searches', 'query_key')[:limit])
+
+
+def zero_result_searches(days=7, limit=20):
+    """Searches that most often found no tutors"""
+    return _with_labels(
+        search_query_stats(days).filter(zero_results__gt=0).order_by('-zero_results', 'query_key')[:limit]
+    )
+
+
+def slow_searches(days=7, limit=20, threshold_ms=SLOW_SEARCH_MS):
+    """Searches averaging at least threshold_ms, slowest first"""
+    return _with_labels(
+        search_query_stats(days).filter(avg_latency_ms__gte=threshold_ms).order_by('-avg_latency_ms')[:limit]
+    )
@@ -13,6 +13,7 @@ from tutors.models import TutorProfile
 from bookings.models import Booking
 from payments.models import Payment, Commission
 from reviews.models import Review
+from .search_log import popular_searches, slow_searches, zero_result_searches
 
 
 @login_required
@@ -134,6 +135,11 @@ def analytics_dashboard(request):
         'revenue_trends': list(revenue_trends),
         'top_subjects': list(top_subjects),
         'top_tutors': list(top_tutors),
+        
+        # Tutor searches (last 7 days)
+        'popular_searches': popular_searches(limit=10),
+        'zero_result_searches': zero_result_searches(limit=10),
+        'slow_searches': slow_searches(limit=10),
     }
     return render(request, 'analytics/dashboard.jinja', context)
 
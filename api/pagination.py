@@ -0,0 +1,56 @@
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from tutors.pagination import paginate_keyset
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Cursor pagination over a composite keyset ordering.
+    The view provides the ordered queryset and sets `keyset_fields`; views
+    without keyset fields (e.g. nearest-K results) are returned whole.
+    """
+    page_size = 20
+    cursor_query_param = 'cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.next_cursor = None
+        keyset_fields = getattr(view, 'keyset_fields', None)
+        if not keyset_fields:
+            return list(queryset)
+        items, self.next_cursor = paginate_keyset(
+            queryset,
+            keyset_fields,
+            request.query_params.get(self.cursor_query_param),
+            self.page_size
+        )
+        return items
+
+    def get_next_link(self):
+        if not self.next_cursor:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_first_link(self):
+        if not self.request.query_params.get(self.cursor_query_param):
+            return None
+        return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'first': self.get_first_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'first': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -25,6 +25,7 @@ class SubjectSerializer(serializers.ModelSerializer):
 class TutorProfileSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     subjects = SubjectSerializer(many=True, read_only=True)
+    distance = serializers.SerializerMethodField()
     
     class Meta:
         model = TutorProfile
@@ -32,8 +33,13 @@ class TutorProfileSerializer(serializers.ModelSerializer):
             'id', 'user', 'bio', 'city', 'state', 'pincode',
             'is_available_online', 'is_available_home',
             'average_rating', 'total_reviews', 'quality_score',
-            'is_verified', 'subjects'
+            'is_verified', 'subjects', 'distance'
         ]
+    
+    def get_distance(self, obj):
+        """Distance in km, only present when searching by location"""
+        distance = getattr(obj, 'distance', None)
+        return round(distance, 2) if distance is not None else None
 
 
 class BookingSerializer(serializers.ModelSerializer):
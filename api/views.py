@@ -4,11 +4,14 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from .pagination import KeysetCursorPagination
 from .serializers import (
     UserSerializer, TutorProfileSerializer, BookingSerializer,
     PaymentSerializer, ReviewSerializer, AvailabilitySlotSerializer
 )
 from tutors.models import TutorProfile
+from tutors.ranking import RANKING_KEYSET, assign_ranking_variant
+from tutors.search import apply_search_filters, apply_nearest, get_nearest_params, ranked_search
 from bookings.models import Booking, AvailabilitySlot
 from payments.models import Payment
 from reviews.models import Review
@@ -23,6 +26,27 @@ class TutorProfileViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = TutorProfileSerializer
     permission_classes = [AllowAny]
     
+    pagination_class = KeysetCursorPagination
+    keyset_fields = None
+    
+    def get_queryset(self):
+        queryset = super().get_queryset().select_related('user').prefetch_related('subjects')
+        if self.action != 'list':
+            return queryset
+        # Same filters and ranking as the search page; ?lat=&lon=&nearest=K returns the K nearest by distance
+        params = self.request.query_params
+        if get_nearest_params(params) is not None:
+            return apply_nearest(apply_search_filters(queryset, params), params)[0]
+        student_profile = None
+        user = self.request.user
+        if user.is_authenticated and hasattr(user, 'student_profile'):
+            student_profile = user.student_profile
+        variant, weights = assign_ranking_variant(self.request)
+        queryset, summary, timer = ranked_search(queryset, params, weights, student_profile, facets=False)
+        self.keyset_fields = RANKING_KEYSET
+        timer.log(variant, summary['count'])
+        return queryset
+    
     @action(detail=True, methods=['get'])
     def availability(self, request, pk=None):
         """Get tutor availability slots"""
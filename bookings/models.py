@@ -2,6 +2,7 @@ from django.db import models
 from django.conf import settings
 from django.utils import timezone
 from core.models import TimeStampedModel, SoftDeleteModel
+from tutors.stats import TutorStatsMixin, booking_stats, record_deleted_booking_student, record_new_student
 
 
 class AvailabilitySlot(TimeStampedModel):
@@ -27,9 +28,23 @@ class AvailabilitySlot(TimeStampedModel):
     
     def __str__(self):
         return f"{self.tutor.username} - {self.get_day_of_week_display()} {self.start_time}-{self.end_time}"
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.refresh_tutor_availability()
+    
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        self.refresh_tutor_availability()
+        return result
+    
+    def refresh_tutor_availability(self):
+        """Recompile the tutor's searchable weekly availability"""
+        if hasattr(self.tutor, 'tutor_profile'):
+            self.tutor.tutor_profile.refresh_availability()
 
 
-class Booking(TimeStampedModel, SoftDeleteModel):
+class Booking(TutorStatsMixin, TimeStampedModel, SoftDeleteModel):
     """Booking/lesson booking"""
     student = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='bookings', limit_choices_to={'role__in': ['student', 'parent']})
     tutor = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='tutor_bookings', limit_choices_to={'role': 'tutor'})
@@ -109,7 +124,18 @@ class Booking(TimeStampedModel, SoftDeleteModel):
         from django.conf import settings
         commission_rate = getattr(settings, 'COMMISSION_PERCENTAGE', 15) / 100
         self.commission_amount = self.total_amount * commission_rate
+        adding = self._state.adding
         super().save(*args, **kwargs)
+        if adding:
+            record_new_student(self)
+    
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        record_deleted_booking_student(self)
+        return result
+    
+    def stats_contribution(self):
+        return booking_stats(self)
 
 
 class Lesson(TimeStampedModel):
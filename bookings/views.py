@@ -5,6 +5,7 @@ from django.utils import timezone
 from datetime import datetime, timedelta
 from .models import Booking, Lesson, AvailabilitySlot, CalendarSync
 from tutors.models import TutorProfile, PricingOption
+from tutors.stats import record_left_pending
 from payments.utils import create_payment_from_booking
 from payments.models import Payment, Wallet
 
@@ -170,10 +171,13 @@ def accept_booking(request, booking_id):
     
     # Accept all recurring bookings if this is a parent booking
     if booking.is_recurring and not booking.parent_booking:
-        Booking.objects.filter(parent_booking=booking, status='pending').update(
+        recurring = Booking.objects.filter(parent_booking=booking, status='pending')
+        accepted = list(recurring.values_list('tutor_id', 'created_at'))
+        recurring.update(
             status='accepted',
             accepted_at=timezone.now()
         )
+        record_left_pending(accepted)
     
     # Create payment record (pending until payment is made)
     create_payment_from_booking(booking)
@@ -317,16 +321,22 @@ def manage_availability(request):
         AvailabilitySlot.objects.filter(tutor=request.user).delete()
         
         # Create new slots
+        slots = []
         for day in range(7):
             start_time = request.POST.get(f'day_{day}_start')
             end_time = request.POST.get(f'day_{day}_end')
             if start_time and end_time:
-                AvailabilitySlot.objects.create(
+                slots.append(AvailabilitySlot(
                     tutor=request.user,
                     day_of_week=day,
                     start_time=start_time,
                     end_time=end_time,
-                )
+                ))
+        AvailabilitySlot.objects.bulk_create(slots)
+        
+        # Bulk writes skip AvailabilitySlot.save(), so recompile the searchable availability once here
+        if hasattr(request.user, 'tutor_profile'):
+            request.user.tutor_profile.refresh_availability()
         
         messages.success(request, 'Availability updated!')
         return redirect('bookings:manage_availability')
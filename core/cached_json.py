@@ -0,0 +1,32 @@
+import hashlib
+import json
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+
+# Seconds a user's dashboard data is cached, on the server and in the browser
+DASHBOARD_DATA_TIMEOUT = 60
+
+
+def cached_json_response(request, name, build, timeout=DASHBOARD_DATA_TIMEOUT):
+    """
+    JSON response for one of the signed-in user's dashboard data sets,
+    calling build() at most once per user every `timeout` seconds. The body
+    hash is the ETag, so revalidating browsers get an empty 304 when the
+    data has not changed.
+    """
+    key = f'dashboard:{request.user.pk}:{name}'
+    body = cache.get(key)
+    if body is None:
+        body = json.dumps(build(), cls=DjangoJSONEncoder)
+        cache.set(key, body, timeout)
+
+    etag = f'"{hashlib.md5(body.encode()).hexdigest()}"'
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(body, content_type='application/json')
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, max_age=timeout)
+    return response
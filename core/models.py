@@ -30,3 +30,51 @@ class SoftDeleteModel(models.Model):
         self.is_deleted = False
         self.deleted_at = None
         self.save()
+
+
+class ContributionMixin:
+    """
+    Keeps data derived from a model's rows in step with them. Each entry of
+    `contributions` pairs a method returning what the row's current field
+    values contribute (or None) with a method taking (old, new) that moves
+    the derived data; every save() or delete() applies the difference from
+    what the row contributed when it was loaded. Queryset update()/delete()
+    bypass this.
+    """
+    contributions = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if not instance.get_deferred_fields():
+            instance._loaded_contributions = instance._current_contributions()
+        return instance
+
+    def _current_contributions(self):
+        return {name: getattr(self, name)() for name, _ in self.contributions}
+
+    def _stored_contributions(self):
+        if not self._state.adding:
+            if hasattr(self, '_loaded_contributions'):
+                return self._loaded_contributions
+            # Loaded with deferred fields, read what is stored
+            stored = type(self)._base_manager.filter(pk=self.pk).first()
+            if stored is not None:
+                return stored._current_contributions()
+        return {name: None for name, _ in self.contributions}
+
+    def _apply_contributions(self, old, new):
+        for name, apply in self.contributions:
+            getattr(self, apply)(old[name], new[name])
+
+    def save(self, *args, **kwargs):
+        old = self._stored_contributions()
+        super().save(*args, **kwargs)
+        self._loaded_contributions = self._current_contributions()
+        self._apply_contributions(old, self._loaded_contributions)
+
+    def delete(self, *args, **kwargs):
+        old = self._stored_contributions()
+        result = super().delete(*args, **kwargs)
+        self._apply_contributions(old, {name: None for name in old})
+        return result
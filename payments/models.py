@@ -3,9 +3,10 @@ from django.conf import settings
 from django.db.models import DecimalField
 from decimal import Decimal
 from core.models import TimeStampedModel
+from tutors.stats import TutorStatsMixin, payment_stats
 
 
-class Payment(TimeStampedModel):
+class Payment(TutorStatsMixin, TimeStampedModel):
     """Payment records"""
     booking = models.ForeignKey('bookings.Booking', on_delete=models.CASCADE, related_name='payments')
     student = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='payments', limit_choices_to={'role__in': ['student', 'parent']})
@@ -55,6 +56,9 @@ class Payment(TimeStampedModel):
     def __str__(self):
         return f"Payment: ₹{self.amount} for {self.booking}"
     
+    def stats_contribution(self):
+        return payment_stats(self)
+    
     def can_be_released(self):
         """Check if payment can be released (cooling period over)"""
         if self.status != 'on_hold':
@@ -9,6 +9,8 @@ from django.views.decorators.http import require_http_methods
 from datetime import timedelta
 from .models import Payment, Invoice, Commission, Wallet, WalletTransaction
 from bookings.models import Booking
+from tutors.models import TutorStats
+from tutors.stats import stats_totals
 import json
 
 
@@ -75,11 +77,12 @@ def tutor_earnings(request):
         messages.error(request, 'Access denied. Tutor access required.')
         return redirect('/')
     
-    # Get earnings statistics
-    total_earnings = Payment.objects.filter(
-        tutor=request.user,
-        status='completed'
-    ).aggregate(total=Sum('tutor_payout'))['total'] or 0
+    # Earnings statistics from the daily rollup
+    stats = TutorStats.objects.filter(tutor=request.user)
+    totals = stats_totals(stats)
+    total_earnings = totals['earnings']
+    on_hold_total = totals['held_earnings']
+    pending_earnings = totals['processing_earnings']
     
     # Payments on hold (waiting for cooling period)
     payments_on_hold = Payment.objects.filter(
@@ -87,13 +90,6 @@ def tutor_earnings(request):
         status='on_hold'
     ).order_by('-created_at')
     
-    on_hold_total = payments_on_hold.aggregate(total=Sum('tutor_payout'))['total'] or 0
-    
-    pending_earnings = Payment.objects.filter(
-        tutor=request.user,
-        status='processing'
-    ).aggregate(total=Sum('tutor_payout'))['total'] or 0
-    
     # Recent payments
     recent_payments = Payment.objects.filter(
         tutor=request.user
@@ -101,13 +97,12 @@ def tutor_earnings(request):
     
     # Monthly earnings (last 6 months)
     from django.db.models.functions import TruncMonth
-    monthly_earnings = Payment.objects.filter(
-        tutor=request.user,
-        status='completed'
+    monthly_earnings = stats.filter(
+        earnings__gt=0
     ).annotate(
-        month=TruncMonth('created_at')
+        month=TruncMonth('day')
     ).values('month').annotate(
-        total=Sum('tutor_payout')
+        total=Sum('earnings')
     ).order_by('-month')[:6]
     
     context = {
@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ranktutor.settings')
 
 application = get_asgi_application()
+
+# Warm in-memory lookup structures before the first request
+from tutors.autocomplete import warm_autocomplete_index  # noqa: E402
+
+warm_autocomplete_index()
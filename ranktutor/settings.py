@@ -344,6 +344,9 @@ RAZORPAY_KEY_SECRET = config('RAZORPAY_KEY_SECRET', default='')
 # Commission Configuration
 COMMISSION_PERCENTAGE = config('COMMISSION_PERCENTAGE', default=15, cast=int)
 
+# Tutor search ranking: set TUTOR_RANKING_VARIANTS to run A/B weight variants;
+# tutors.ranking.DEFAULT_RANKING_VARIANTS applies when it is unset.
+
 # Security Settings
 if not DEBUG:
     SECURE_SSL_REDIRECT = True
@@ -414,3 +417,20 @@ else:
         }
     }
     SESSION_ENGINE = 'django.contrib.sessions.backends.db'  # Use database sessions
+
+# Logging: per-stage ranking timings are logged by tutors.ranking at INFO
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'tutors.ranking': {
+            'handlers': ['console'],
+            'level': config('RANKING_LOG_LEVEL', default='INFO'),
+        },
+    },
+}
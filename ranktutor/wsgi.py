@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ranktutor.settings')
 
 application = get_wsgi_application()
+
+# Warm in-memory lookup structures before the first request
+from tutors.autocomplete import warm_autocomplete_index  # noqa: E402
+
+warm_autocomplete_index()
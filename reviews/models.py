@@ -1,10 +1,14 @@
 from django.db import models
 from django.conf import settings
 from core.models import TimeStampedModel, SoftDeleteModel
+from tutors.stats import TutorStatsMixin, review_stats
 
 
-class Review(TimeStampedModel, SoftDeleteModel):
+class Review(TutorStatsMixin, TimeStampedModel, SoftDeleteModel):
     """Reviews and ratings"""
+    # Approving, unapproving, editing or soft-deleting also moves the tutor's rating aggregates
+    contributions = TutorStatsMixin.contributions + (('counted_rating', 'update_tutor_rating'),)
+    
     booking = models.ForeignKey('bookings.Booking', on_delete=models.CASCADE, related_name='reviews')
     student = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='reviews_given', limit_choices_to={'role__in': ['student', 'parent']})
     tutor = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='reviews_received', limit_choices_to={'role': 'tutor'})
@@ -33,6 +37,21 @@ class Review(TimeStampedModel, SoftDeleteModel):
     
     def __str__(self):
         return f"Review: {self.rating}/5 by {self.student.username} for {self.tutor.username}"
+    
+    def counted_rating(self):
+        """The rating this review adds to the tutor's rating aggregates, None when it does not count"""
+        if self.is_approved and not self.is_deleted:
+            return self.rating
+        return None
+    
+    def update_tutor_rating(self, previous, current):
+        """Move the tutor's rating aggregates from the previously counted rating to the current one"""
+        from tutors.models import TutorProfile
+        if previous != current:
+            TutorProfile.apply_rating_change(self.tutor_id, added=current, removed=previous)
+    
+    def stats_contribution(self):
+        return review_stats(self)
 
 
 class Dispute(TimeStampedModel):
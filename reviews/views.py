@@ -24,7 +24,8 @@ def create_review(request, booking_id):
             messages.error(request, 'Please provide a review comment.')
             return redirect('reviews:create', booking_id=booking_id)
         
-        review = Review.objects.create(
+        # Saving an approved review also updates the tutor's rating aggregates
+        Review.objects.create(
             booking=booking,
             student=request.user,
             tutor=booking.tutor,
@@ -33,15 +34,6 @@ def create_review(request, booking_id):
             is_approved=True  # Auto-approve for now, can be moderated later
         )
         
-        # Update tutor's average rating
-        from tutors.models import TutorProfile
-        from django.db.models import Avg
-        tutor_profile = booking.tutor.tutor_profile
-        reviews = Review.objects.filter(tutor=booking.tutor, is_approved=True)
-        tutor_profile.average_rating = reviews.aggregate(Avg('rating'))['rating__avg'] or 0
-        tutor_profile.total_reviews = reviews.count()
-        tutor_profile.save()
-        
         messages.success(request, 'Review submitted successfully!')
         return redirect('bookings:detail', booking_id=booking_id)
     
@@ -9,3 +9,8 @@ class StudentProfileAdmin(admin.ModelAdmin):
     search_fields = ['user__username', 'user__email', 'student_name', 'city']
     raw_id_fields = ['user']
     filter_horizontal = ['preferred_subjects']
+    
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        # Preferred subjects are saved after the profile itself
+        StudentProfile.objects.filter(pk=form.instance.pk).update(recommendations_stale=True)
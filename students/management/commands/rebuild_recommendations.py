@@ -0,0 +1,71 @@
+import multiprocessing
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.utils import timezone
+from students.models import StudentProfile
+from students.recommendations import refresh_recommendations
+
+
+def _init_worker():
+    django.setup()
+    # Forked workers must not share the parent's database connections
+    connections.close_all()
+
+
+def _refresh_chunk(args):
+    student_ids, now = args
+    count = 0
+    for student_profile in StudentProfile.objects.filter(id__in=student_ids):
+        refresh_recommendations(student_profile, now)
+        count += 1
+    connections.close_all()
+    return count
+
+
+class Command(BaseCommand):
+    help = 'Recompute precomputed student recommendations (stale ones only unless --all)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Rebuild recommendations for every student'
+        )
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=1,
+            help='Number of worker processes'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=200,
+            help='Students handed to a worker at a time'
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        students = StudentProfile.objects.all()
+        if not options['all']:
+            students = students.filter(recommendations_stale=True)
+        student_ids = list(students.order_by('id').values_list('id', flat=True))
+
+        chunk_size = max(options['chunk_size'], 1)
+        chunks = [
+            (student_ids[start:start + chunk_size], now)
+            for start in range(0, len(student_ids), chunk_size)
+        ]
+
+        processes = max(options['processes'], 1)
+        if processes == 1 or len(chunks) <= 1:
+            count = sum(_refresh_chunk(chunk) for chunk in chunks)
+        else:
+            connections.close_all()
+            with multiprocessing.Pool(processes, initializer=_init_worker) as pool:
+                count = sum(pool.imap_unordered(_refresh_chunk, chunks))
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Refreshed recommendations for {count} student(s).')
+        )
@@ -0,0 +1,38 @@
+# Generated by Django 5.0.1 on 2026-10-17 23:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0001_initial'),
+        ('tutors', '0009_tutorprofile_ranking_tier'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentprofile',
+            name='recommendations_stale',
+            field=models.BooleanField(db_index=True, default=True, editable=False),
+        ),
+        migrations.CreateModel(
+            name='StudentRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('match_score', models.FloatField()),
+                ('computed_at', models.DateTimeField()),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommendations', to='students.studentprofile')),
+                ('tutor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='student_recommendations', to='tutors.tutorprofile')),
+            ],
+            options={
+                'verbose_name': 'Student Recommendation',
+                'verbose_name_plural': 'Student Recommendations',
+                'ordering': ['student', 'rank'],
+                'indexes': [models.Index(fields=['student', 'rank'], name='students_st_student_2ec763_idx')],
+                'unique_together': {('student', 'tutor')},
+            },
+        ),
+    ]
@@ -43,9 +43,45 @@ class StudentProfile(TimeStampedModel):
     # Learning Goals
     learning_goals = models.TextField(blank=True, help_text='What do you want to achieve?')
     
+    # Precomputed recommendations need recomputing (see students.recommendations)
+    recommendations_stale = models.BooleanField(default=True, db_index=True, editable=False)
+    
+    # Fields that affect AI match scores
+    PREFERENCE_FIELDS = {'grade_level', 'preferred_mode'}
+    
     class Meta:
         verbose_name = 'Student Profile'
         verbose_name_plural = 'Student Profiles'
     
     def __str__(self):
         return f"Student Profile: {self.user.get_full_name() or self.user.username}"
+    
+    def save(self, *args, **kwargs):
+        # Preferences may have changed, recompute recommendations on the next rebuild
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or self.PREFERENCE_FIELDS & set(update_fields):
+            self.recommendations_stale = True
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'recommendations_stale'}
+        super().save(*args, **kwargs)
+
+
+class StudentRecommendation(models.Model):
+    """Precomputed top tutor recommendation for a student"""
+    student = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, related_name='recommendations')
+    tutor = models.ForeignKey('tutors.TutorProfile', on_delete=models.CASCADE, related_name='student_recommendations')
+    rank = models.PositiveSmallIntegerField()
+    match_score = models.FloatField()
+    computed_at = models.DateTimeField()
+    
+    class Meta:
+        verbose_name = 'Student Recommendation'
+        verbose_name_plural = 'Student Recommendations'
+        ordering = ['student', 'rank']
+        unique_together = ['student', 'tutor']
+        indexes = [
+            models.Index(fields=['student', 'rank']),
+        ]
+    
+    def __str__(self):
+        return f"#{self.rank} {self.tutor} for {self.student}"
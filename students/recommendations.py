@@ -0,0 +1,61 @@
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from tutors.models import TutorProfile
+from tutors.utils import get_ai_recommendations
+from .models import StudentProfile, StudentRecommendation
+
+
+# Number of recommendations stored per student
+RECOMMENDATION_LIMIT = 20
+
+
+def refresh_recommendations(student_profile, now=None):
+    """Recompute and store a student's top recommendations"""
+    now = now or timezone.now()
+    tutors = get_ai_recommendations(student_profile, limit=RECOMMENDATION_LIMIT)
+    with transaction.atomic():
+        StudentRecommendation.objects.filter(student=student_profile).delete()
+        StudentRecommendation.objects.bulk_create([
+            StudentRecommendation(
+                student=student_profile,
+                tutor=tutor,
+                rank=rank,
+                match_score=tutor.match_score,
+                computed_at=now,
+            )
+            for rank, tutor in enumerate(tutors, start=1)
+        ])
+        StudentProfile.objects.filter(pk=student_profile.pk).update(recommendations_stale=False)
+    student_profile.recommendations_stale = False
+    return tutors
+
+
+def get_recommendations(student_profile, limit=10):
+    """
+    Get a student's precomputed recommendations, best first. Stale ones are
+    served as stored until rebuild_recommendations refreshes them, so reads
+    never score tutors.
+    """
+    return list(
+        TutorProfile.objects.filter(student_recommendations__student=student_profile)
+        .select_related('user')
+        .order_by('student_recommendations__rank')[:limit]
+    )
+
+
+def mark_recommendations_stale_for_tutor(tutor_profile):
+    """
+    Mark recommendations stale for every student a tutor change can affect:
+    students currently recommended the tutor and, while the tutor can be
+    recommended, students preferring one of the tutor's subjects. Students
+    without preferred subjects are never shown recommendations.
+    """
+    affected = Q(recommendations__tutor=tutor_profile)
+    if tutor_profile.is_verified and tutor_profile.verification_status == 'approved':
+        affected |= Q(preferred_subjects__in=tutor_profile.subjects.all())
+    affected = StudentProfile.objects.filter(affected)
+    return StudentProfile.objects.filter(
+        id__in=affected.values('id'),
+        recommendations_stale=False
+    ).update(recommendations_stale=True)
@@ -5,6 +5,7 @@ app_name = 'students'
 
 urlpatterns = [
     path('dashboard/', views.student_dashboard, name='dashboard'),
+    path('dashboard/recommendations/', views.dashboard_recommendations, name='dashboard_recommendations'),
     path('classes/', views.student_classes, name='classes'),
     path('payments/', views.student_payments, name='payments'),
     path('homework/', views.student_homework, name='homework'),
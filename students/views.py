@@ -1,4 +1,6 @@
 from django.shortcuts import render, redirect
+from django.http import JsonResponse
+from django.urls import reverse
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.utils import timezone
@@ -7,8 +9,10 @@ from .models import StudentProfile
 from bookings.models import Booking
 from payments.models import Payment, Wallet
 from reviews.models import Review, Dispute
-from tutors.utils import get_ai_recommendations
+from .recommendations import get_recommendations
 from tutors.models import TutorProfile
+from tutors.collaborative import get_collaborative_recommendations
+from core.cached_json import cached_json_response
 
 
 @login_required
@@ -30,10 +34,7 @@ def student_dashboard(request):
     # Get or create wallet
     wallet, wallet_created = Wallet.objects.get_or_create(user=request.user)
     
-    # Get AI recommendations
-    ai_recommendations = []
-    if student_profile.preferred_subjects.exists():
-        ai_recommendations = get_ai_recommendations(student_profile, limit=5)
+    # Recommendations are fetched after the page loads, see dashboard_recommendations
     
     # Get bookings
     upcoming_bookings = Booking.objects.filter(
@@ -82,11 +83,41 @@ def student_dashboard(request):
         'past_bookings': past_bookings,
         'bookings_needing_review': bookings_needing_review,
         'student_disputes': student_disputes,
-        'ai_recommendations': ai_recommendations,
     }
     return render(request, 'students/dashboard.jinja', context)
 
 
+def _recommendation_card(tutor):
+    return {
+        'name': tutor.user.get_full_name() or tutor.user.username,
+        'city': tutor.city,
+        'state': tutor.state,
+        'average_rating': tutor.average_rating,
+        'url': reverse('tutors:detail', args=[tutor.id]),
+    }
+
+
+@login_required
+def dashboard_recommendations(request):
+    """Recommended tutors for the student dashboard, cached per student"""
+    if not (request.user.is_student() or request.user.is_parent()):
+        return JsonResponse({'error': 'Student/Parent access required.'}, status=403)
+    
+    def build():
+        student_profile, created = StudentProfile.objects.get_or_create(user=request.user)
+        ai_recommendations = []
+        if student_profile.preferred_subjects.exists():
+            ai_recommendations = get_recommendations(student_profile, limit=5)
+        # "Students like you booked..." from booking history
+        collaborative_recommendations = get_collaborative_recommendations(request.user, limit=5)
+        return {
+            'recommended': [_recommendation_card(tutor) for tutor in ai_recommendations],
+            'booked_by_similar': [_recommendation_card(tutor) for tutor in collaborative_recommendations],
+        }
+    
+    return cached_json_response(request, 'student-recommendations', build)
+
+
 @login_required
 def student_classes(request):
     """Student classes view - past and upcoming in table format"""
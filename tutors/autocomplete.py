@@ -0,0 +1,208 @@
+import bisect
+import heapq
+import re
+from django.core.cache import cache
+from .fuzzy import BKTree, max_typos
+
+
+# Suggestion kinds, in the order they are listed when equally good
+SUGGESTION_KINDS = ('subject', 'city', 'area', 'tutor')
+
+# Most suggestions returned by one lookup
+MAX_SUGGESTIONS = 20
+
+# Index entries examined per lookup, bounds the cost of one-letter prefixes
+MAX_SCANNED = 500
+
+# Kinds with typo-tolerant matching, tutor names are left exact
+FUZZY_KINDS = ('subject', 'city', 'area')
+
+_VERSION_KEY_PREFIX = 'tutors:autocomplete:version'
+
+
+def normalize_prefix(text):
+    """Lowercase with single spaces, the form index keys are stored in"""
+    return ' '.join(str(text).lower().split())
+
+
+def _entries_for(kind, label, value):
+    """
+    Index entries for a label, one per word start so 'Sharma' also
+    finds 'Priya Sharma'.
+    """
+    words = normalize_prefix(label).split(' ')
+    return [(' '.join(words[index:]), kind, label, value) for index in range(len(words)) if words[index]]
+
+
+def _load_segment(kind):
+    from .models import Subject, TutorProfile, TutorServiceArea
+
+    public_tutors = TutorProfile.objects.filter(is_verified=True, verification_status='approved', is_deleted=False)
+    entries = []
+    if kind == 'subject':
+        for subject_id, name in Subject.objects.values_list('id', 'name'):
+            entries.extend(_entries_for('subject', name, subject_id))
+    elif kind == 'city':
+        cities = {city.strip().title() for city in public_tutors.values_list('city', flat=True) if city.strip()}
+        for city in cities:
+            entries.extend(_entries_for('city', city, city))
+    elif kind == 'area':
+        areas = TutorServiceArea.objects.filter(kind='area', tutor__in=public_tutors).values_list('value', flat=True).distinct()
+        for area in areas:
+            entries.extend(_entries_for('area', area.title(), area))
+    elif kind == 'tutor':
+        names = public_tutors.values_list('id', 'user__first_name', 'user__last_name')
+        for tutor_id, first_name, last_name in names:
+            name = f'{first_name} {last_name}'.strip()
+            if name:
+                entries.extend(_entries_for('tutor', name, tutor_id))
+    entries.sort()
+    return entries
+
+
+class AutocompleteIndex:
+    """
+    Sorted arrays of (key, kind, label, value) entries per suggestion kind,
+    searched by bisecting for the prefix. Each kind is a separate segment
+    so a change only rebuilds the segment it affects.
+    """
+
+    def __init__(self):
+        self.segments = {}
+        self.versions = {}
+        # (entries, keys) swapped as one value so concurrent lookups see a consistent pair
+        self.merged = ([], [])
+        # kind -> (BKTree of normalized labels, {normalized label: (label, value)})
+        self.fuzzy = {}
+        # BK-tree and set of the words in fuzzy kinds' labels, for correcting keywords
+        self.words = (BKTree(), frozenset())
+
+    def refresh(self, versions):
+        """Rebuild the segments whose version changed, then re-merge"""
+        changed = [kind for kind in SUGGESTION_KINDS if self.versions.get(kind) != versions.get(kind) or kind not in self.segments]
+        if not changed:
+            return
+        for kind in changed:
+            self.segments[kind] = _load_segment(kind)
+            self.versions[kind] = versions.get(kind)
+            if kind in FUZZY_KINDS:
+                labels = {normalize_prefix(label): (label, value) for key, _, label, value in self.segments[kind]}
+                self.fuzzy[kind] = (BKTree(labels), labels)
+        entries = list(heapq.merge(*self.segments.values()))
+        self.merged = (entries, [entry[0] for entry in entries])
+        if set(changed) & set(FUZZY_KINDS):
+            words = frozenset(
+                word
+                for kind in FUZZY_KINDS
+                for label in self.fuzzy[kind][1]
+                for word in re.findall(r'\w+', label)
+                if len(word) > 1
+            )
+            self.words = (BKTree(sorted(words)), words)
+
+    def suggest(self, prefix, limit=10, kinds=None):
+        """Get up to `limit` distinct suggestions whose words start with prefix"""
+        prefix = normalize_prefix(prefix)
+        if not prefix:
+            return []
+        entries, keys = self.merged
+        start = bisect.bisect_left(keys, prefix)
+        end = bisect.bisect_left(keys, prefix + '\uffff', lo=start)
+
+        seen = set()
+        matches = []
+        for key, kind, label, value in entries[start:min(end, start + MAX_SCANNED)]:
+            if (kinds and kind not in kinds) or (kind, value) in seen:
+                continue
+            seen.add((kind, value))
+            # Whole-label matches before later-word matches, then shorter labels
+            starts_label = normalize_prefix(label).startswith(prefix)
+            matches.append((not starts_label, SUGGESTION_KINDS.index(kind), len(label), label, kind, value))
+        matches.sort()
+        results = [
+            {'type': kind, 'label': label, 'value': value}
+            for _, _, _, label, kind, value in matches[:limit]
+        ]
+        if len(results) < limit:
+            # Typo-tolerant matches on whole labels ("bangalor", "mathmatics")
+            for kind in FUZZY_KINDS:
+                if kinds and kind not in kinds:
+                    continue
+                for label, value in self.fuzzy_matches(kind, prefix):
+                    if (kind, value) not in seen and len(results) < limit:
+                        seen.add((kind, value))
+                        results.append({'type': kind, 'label': label, 'value': value})
+        return results
+    
+    def fuzzy_matches(self, kind, text):
+        """Get [(label, value), ...] of a kind within the typo tolerance of text"""
+        if kind not in self.fuzzy:
+            return []
+        text = normalize_prefix(text)
+        tree, labels = self.fuzzy[kind]
+        return [labels[label] for distance, label in tree.search(text, max_typos(text))]
+    
+    def labels_containing(self, kind, text):
+        """Get the labels of a kind containing text anywhere, ignoring case and spacing"""
+        text = normalize_prefix(text)
+        if not text or kind not in self.fuzzy:
+            return []
+        return [label for normalized, (label, value) in self.fuzzy[kind][1].items() if text in normalized]
+    
+    def resolve(self, kind, text):
+        """
+        Resolve free text to one (label, value) of a kind: an exact label,
+        else the best prefix match, else the closest label within the typo
+        tolerance. Returns None if nothing is close enough.
+        """
+        text = normalize_prefix(text)
+        if not text:
+            return None
+        labels = self.fuzzy[kind][1] if kind in self.fuzzy else {}
+        if text in labels:
+            return labels[text]
+        suggestions = self.suggest(text, 1, [kind])
+        if suggestions:
+            return suggestions[0]['label'], suggestions[0]['value']
+        return None
+    
+    def correct_word(self, word):
+        """
+        Get the closest subject, city or area word for a misspelt keyword, or
+        None if the word is known (or a prefix of a known word) or has no match.
+        """
+        tree, words = self.words
+        word = word.lower()
+        if word in words or any(known.startswith(word) for known in words):
+            return None
+        return tree.closest(word)
+
+
+_index = AutocompleteIndex()
+
+
+def get_autocomplete_index():
+    """Get the process-wide index, rebuilding segments changed anywhere since last use"""
+    keys = {kind: f'{_VERSION_KEY_PREFIX}:{kind}' for kind in SUGGESTION_KINDS}
+    stored = cache.get_many(keys.values())
+    _index.refresh({kind: stored.get(key, 0) for kind, key in keys.items()})
+    return _index
+
+
+def warm_autocomplete_index():
+    """Build the index at process start so the first lookups are fast"""
+    try:
+        get_autocomplete_index()
+    except Exception:
+        # The database may not be migrated yet, the index builds on first use instead
+        pass
+
+
+def invalidate_autocomplete(*kinds):
+    """Mark autocomplete segments stale in every process"""
+    for kind in kinds:
+        key = f'{_VERSION_KEY_PREFIX}:{kind}'
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
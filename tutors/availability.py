@@ -0,0 +1,131 @@
+import re
+import numpy as np
+from django.db.models import F, Q
+from django.db.models.lookups import Exact, GreaterThan
+
+
+# Width of one availability bucket in minutes
+BUCKET_MINUTES = 15
+
+BUCKETS_PER_DAY = 24 * 60 // BUCKET_MINUTES
+
+# Buckets in each stored half-day word
+WORD_BUCKETS = BUCKETS_PER_DAY // 2
+
+# TutorProfile columns holding the weekly availability, (before noon, after noon)
+# per day from Monday. Bit i of a word is set when bucket i of that half-day is free,
+# so filters are bitwise ANDs the database evaluates.
+AVAILABILITY_FIELDS = tuple(
+    (f'available_{day}_am', f'available_{day}_pm') for day in ('mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')
+)
+
+# Day filter values: a single day (0 = Monday) or a group of days
+AVAILABILITY_DAYS = {
+    'weekdays': (0, 1, 2, 3, 4),
+    'weekends': (5, 6),
+    **{str(day): (day,) for day in range(7)},
+}
+
+# Named times of day as (start, end) minutes, matched by any overlap
+AVAILABILITY_PERIODS = {
+    'morning': (6 * 60, 12 * 60),
+    'afternoon': (12 * 60, 17 * 60),
+    'evening': (17 * 60, 21 * 60),
+}
+
+_TIME_RANGE_RE = re.compile(r'^(\d{1,2}):(\d{2})-(\d{1,2}):(\d{2})$')
+
+
+def _minutes(value):
+    return value.hour * 60 + value.minute
+
+
+def _words(bits):
+    """{field: int} of AVAILABILITY_FIELDS for a (7, BUCKETS_PER_DAY) bool array"""
+    words = {}
+    for day, fields in enumerate(AVAILABILITY_FIELDS):
+        for half, field in enumerate(fields):
+            chunk = bits[day, half * WORD_BUCKETS:(half + 1) * WORD_BUCKETS]
+            words[field] = int.from_bytes(np.packbits(chunk, bitorder='little').tobytes(), 'little')
+    return words
+
+
+def compile_availability(slots):
+    """
+    Compile (day_of_week, start_time, end_time) slots into the stored
+    {field: word} weekly availability. Only buckets wholly inside a slot
+    are set, and an end time of midnight means the end of the day.
+    """
+    bits = np.zeros((7, BUCKETS_PER_DAY), dtype=bool)
+    for day, start_time, end_time in slots:
+        start = _minutes(start_time)
+        end = _minutes(end_time) or 24 * 60
+        first = -(-start // BUCKET_MINUTES)
+        last = end // BUCKET_MINUTES
+        if 0 <= day < 7 and first < last:
+            bits[day, first:last] = True
+    return _words(bits)
+
+
+def parse_availability_filter(day=None, time=None):
+    """
+    Turn the search page's availability params into (masks, require_all),
+    masks being {field: word} like compile_availability().
+    `day` is a day number or 'weekdays'/'weekends'; `time` is a named
+    period or an 'HH:MM-HH:MM' range. A range must be free in full on one
+    of the days, a period or a whole day only needs some free time.
+    Returns None when neither param is usable.
+    """
+    days = AVAILABILITY_DAYS.get((day or '').strip().lower())
+    time = (time or '').strip().lower()
+    require_all = False
+    if time in AVAILABILITY_PERIODS:
+        start, end = AVAILABILITY_PERIODS[time]
+    elif _TIME_RANGE_RE.match(time):
+        start_hour, start_minute, end_hour, end_minute = map(int, _TIME_RANGE_RE.match(time).groups())
+        start = start_hour * 60 + start_minute
+        end = end_hour * 60 + end_minute
+        if not (start < end <= 24 * 60 and start_minute < 60 and end_minute < 60):
+            return None
+        require_all = True
+    elif days is not None:
+        start, end = 0, 24 * 60
+    else:
+        return None
+
+    bits = np.zeros((7, BUCKETS_PER_DAY), dtype=bool)
+    # Round outwards so a requested 9:10 still needs the 9:00 bucket free
+    first = start // BUCKET_MINUTES
+    last = -(-end // BUCKET_MINUTES)
+    for selected_day in (days if days is not None else range(7)):
+        bits[selected_day, first:last] = True
+    return _words(bits), require_all
+
+
+def filter_tutors_by_availability(tutors, day=None, time=None):
+    """
+    Keep tutors free at the requested day/time, matching the requested
+    buckets against the stored words with bitwise ANDs in SQL.
+    """
+    parsed = parse_availability_filter(day, time)
+    if parsed is None:
+        return tutors
+    masks, require_all = parsed
+
+    condition = Q(pk__in=[])
+    for fields in AVAILABILITY_FIELDS:
+        day_masks = [(field, masks[field]) for field in fields if masks[field]]
+        if not day_masks:
+            continue
+        if require_all:
+            # Every requested bucket free on this day
+            free = Q()
+            for field, mask in day_masks:
+                free &= Q(Exact(F(field).bitand(mask), mask))
+        else:
+            # Some requested bucket free on this day
+            free = Q(pk__in=[])
+            for field, mask in day_masks:
+                free |= Q(GreaterThan(F(field).bitand(mask), 0))
+        condition |= free
+    return tutors.filter(condition)
@@ -0,0 +1,74 @@
+from django.core.cache import cache
+
+
+# Tutors shown in the home page carousel
+CAROUSEL_SIZE = 15
+
+# Snapshots are rebuilt at least this often (seconds) even without a refresh
+CAROUSEL_TIMEOUT = 60 * 15
+
+_CAROUSEL_CACHE_KEY = 'tutors:featured_carousel'
+
+
+def build_featured_carousel():
+    """
+    Build the home page carousel cards, ranked by the search ranking
+    pipeline with the default weights, so paid tiers come first.
+    Cards are plain dicts so the snapshot can be cached as is.
+    """
+    from .models import TutorProfile
+    from .ranking import default_ranking_weights, rank_tutors
+
+    public_tutors = TutorProfile.objects.filter(
+        is_verified=True,
+        verification_status='approved',
+        is_deleted=False
+    ).select_related('user').prefetch_related('subjects')
+    tutors = rank_tutors(public_tutors, default_ranking_weights())[:CAROUSEL_SIZE]
+
+    cards = []
+    for tutor in tutors:
+        full_name = tutor.user.get_full_name() or tutor.user.username
+        initials = ''.join(part[0].upper() for part in full_name.split()[:2])
+        cards.append({
+            'id': tutor.id,
+            'display_name': full_name,
+            'initials': initials if initials else full_name[:2].upper(),
+            'headline': tutor.headline,
+            'bio': tutor.bio,
+            'subject_names': [subject.name for subject in tutor.subjects.all()][:4],
+            'verification_badges': tutor.get_verification_badges(),
+            'is_verified': tutor.is_verified,
+            'is_available_online': tutor.is_available_online,
+            'is_available_home': tutor.is_available_home,
+            'average_rating': tutor.average_rating,
+            'total_reviews': tutor.total_reviews,
+            'years_of_experience': tutor.years_of_experience,
+            'price_min': float(tutor.min_price) if tutor.min_price is not None else None,
+            'price_max': float(tutor.max_price) if tutor.max_price is not None else None,
+            'is_premium': tutor.ranking_tier == TutorProfile.TIER_PREMIUM,
+            'is_featured': tutor.ranking_tier == TutorProfile.TIER_FEATURED,
+            'is_boosted': tutor.ranking_tier == TutorProfile.TIER_BOOST,
+            'date_joined': tutor.user.date_joined,
+        })
+    return cards
+
+
+def get_featured_carousel():
+    """Get the carousel snapshot, building it only if none is stored"""
+    cards = cache.get(_CAROUSEL_CACHE_KEY)
+    if cards is None:
+        cards = refresh_featured_carousel()
+    return cards
+
+
+def refresh_featured_carousel():
+    """Rebuild and store the carousel snapshot"""
+    cards = build_featured_carousel()
+    cache.set(_CAROUSEL_CACHE_KEY, cards, CAROUSEL_TIMEOUT)
+    return cards
+
+
+def invalidate_featured_carousel():
+    """Drop the snapshot so the next home page view rebuilds it"""
+    cache.delete(_CAROUSEL_CACHE_KEY)
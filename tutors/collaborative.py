@@ -0,0 +1,201 @@
+"""
+Item-item collaborative filtering over booking and review history
+("students like you booked...").
+
+Interactions form a sparse student x tutor matrix kept as coordinate
+arrays. Tutor-tutor cosine similarity is computed offline in one
+vectorized pass over co-booked pairs and the top-K neighbours of each
+tutor are stored in TutorSimilarity, so a lookup only reads the
+neighbours of the tutors a student has already booked.
+"""
+from collections import defaultdict
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+
+
+# Neighbours stored per tutor
+DEFAULT_NEIGHBOURS = 20
+
+# Bookings that count as a student choosing a tutor
+INTERACTION_BOOKING_STATUSES = ['accepted', 'completed']
+
+
+def load_interactions(student=None):
+    """
+    Load (student user id, tutor profile id, weight, last interaction) rows,
+    for one student user when given. Each accepted or completed booking
+    counts 1 and an approved review adds rating - 3, so a poor review
+    can cancel out a booking.
+    """
+    from bookings.models import Booking
+    from reviews.models import Review
+
+    bookings = Booking.objects.filter(
+        status__in=INTERACTION_BOOKING_STATUSES,
+        is_deleted=False,
+        tutor__tutor_profile__isnull=False
+    )
+    reviews = Review.objects.filter(
+        is_approved=True,
+        is_deleted=False,
+        tutor__tutor_profile__isnull=False
+    )
+    if student is not None:
+        bookings = bookings.filter(student=student)
+        reviews = reviews.filter(student=student)
+
+    weights = defaultdict(float)
+    last_seen = {}
+    bookings = bookings.values_list('student_id', 'tutor__tutor_profile__id', 'created_at')
+    for student_id, tutor_id, created_at in bookings.iterator():
+        key = (student_id, tutor_id)
+        weights[key] += 1
+        if key not in last_seen or created_at > last_seen[key]:
+            last_seen[key] = created_at
+
+    reviews = reviews.values_list('student_id', 'tutor__tutor_profile__id', 'rating')
+    for student_id, tutor_id, rating in reviews.iterator():
+        weights[(student_id, tutor_id)] += rating - 3
+
+    return [
+        (student_id, tutor_id, weight, last_seen.get((student_id, tutor_id)))
+        for (student_id, tutor_id), weight in weights.items()
+        if weight > 0
+    ]
+
+
+class InteractionMatrix:
+    """Sparse student x tutor interaction weights in coordinate form"""
+
+    def __init__(self, student_ids, tutor_ids, weights):
+        student_ids = np.asarray(student_ids, dtype=np.int64)
+        tutor_ids = np.asarray(tutor_ids, dtype=np.int64)
+        weights = np.asarray(weights, dtype=np.float64)
+        self.students, self.rows = np.unique(student_ids, return_inverse=True)
+        self.tutors, self.cols = np.unique(tutor_ids, return_inverse=True)
+        self.values = weights
+
+    @classmethod
+    def from_interactions(cls, interactions):
+        return cls(
+            [row[0] for row in interactions],
+            [row[1] for row in interactions],
+            [row[2] for row in interactions],
+        )
+
+    def __len__(self):
+        return len(self.values)
+
+    def tutor_neighbours(self, k=DEFAULT_NEIGHBOURS):
+        """
+        Top-k most similar tutors for every tutor by cosine similarity of
+        their student columns. Returns {tutor_id: [(tutor_id, score), ...]}.
+        """
+        if not len(self.values):
+            return {}
+
+        # Expand every pair of entries sharing a student (the nonzeros of X^T X)
+        order = np.argsort(self.rows, kind='stable')
+        rows = self.rows[order]
+        cols = self.cols[order]
+        values = self.values[order]
+        counts = np.bincount(rows)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        sizes = counts[rows]
+        left = np.repeat(np.arange(len(rows)), sizes)
+        group_offsets = np.arange(len(left)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        right = starts[rows[left]] + group_offsets
+        pair_left = cols[left]
+        pair_right = cols[right]
+        distinct = pair_left != pair_right
+        pair_left = pair_left[distinct]
+        pair_right = pair_right[distinct]
+        pair_weights = values[left][distinct] * values[right][distinct]
+
+        # Sum co-occurrence per tutor pair and normalize to cosine similarity
+        n_tutors = len(self.tutors)
+        keys, inverse = np.unique(pair_left * n_tutors + pair_right, return_inverse=True)
+        dot = np.bincount(inverse, weights=pair_weights)
+        norms = np.sqrt(np.bincount(self.cols, weights=self.values ** 2, minlength=n_tutors))
+        source = keys // n_tutors
+        target = keys % n_tutors
+        scores = dot / (norms[source] * norms[target])
+
+        # Best k per source tutor
+        order = np.lexsort((target, -scores, source))
+        source = source[order]
+        target = target[order]
+        scores = scores[order]
+        first = np.searchsorted(source, source, side='left')
+        keep = (np.arange(len(source)) - first) < k
+
+        neighbours = defaultdict(list)
+        for src, dst, score in zip(self.tutors[source[keep]], self.tutors[target[keep]], scores[keep]):
+            neighbours[int(src)].append((int(dst), float(score)))
+        return dict(neighbours)
+
+
+def score_candidates(interacted, neighbours, limit=10):
+    """
+    Rank unseen tutors for one student from their interacted tutors'
+    neighbour lists. interacted maps tutor id -> interaction weight and
+    neighbours maps tutor id -> [(tutor id, similarity), ...].
+    Returns [(tutor_id, score), ...] best first.
+    """
+    scores = defaultdict(float)
+    for tutor_id, weight in interacted.items():
+        for neighbour_id, similarity in neighbours.get(tutor_id, ()):
+            if neighbour_id not in interacted:
+                scores[neighbour_id] += weight * similarity
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+    return ranked[:limit]
+
+
+def rebuild_tutor_similarity(k=DEFAULT_NEIGHBOURS, interactions=None):
+    """Recompute and store the top-k neighbours of every tutor"""
+    from .models import TutorSimilarity
+
+    if interactions is None:
+        interactions = load_interactions()
+    neighbours = InteractionMatrix.from_interactions(interactions).tutor_neighbours(k)
+    now = timezone.now()
+    rows = [
+        TutorSimilarity(tutor_id=tutor_id, similar_tutor_id=similar_id, score=score, computed_at=now)
+        for tutor_id, similar in neighbours.items()
+        for similar_id, score in similar
+    ]
+    with transaction.atomic():
+        TutorSimilarity.objects.all().delete()
+        TutorSimilarity.objects.bulk_create(rows, batch_size=1000)
+    return len(neighbours), len(rows)
+
+
+def get_collaborative_recommendations(user, limit=10):
+    """
+    "Students like you booked..." tutors for a student user, best first,
+    read from the precomputed neighbour table.
+    """
+    from .models import TutorProfile, TutorSimilarity
+
+    interacted = {
+        tutor_id: weight
+        for student_id, tutor_id, weight, last_at in load_interactions(user)
+    }
+    if not interacted:
+        return []
+
+    neighbours = defaultdict(list)
+    rows = TutorSimilarity.objects.filter(tutor_id__in=interacted).values_list('tutor_id', 'similar_tutor_id', 'score')
+    for tutor_id, similar_id, score in rows:
+        neighbours[tutor_id].append((similar_id, score))
+
+    # Over-fetch a little since unverified tutors are dropped below
+    ranked = score_candidates(interacted, neighbours, limit * 2)
+    tutors = TutorProfile.objects.filter(
+        id__in=[tutor_id for tutor_id, score in ranked],
+        is_verified=True,
+        verification_status='approved'
+    ).select_related('user').in_bulk()
+    return [tutors[tutor_id] for tutor_id, score in ranked if tutor_id in tutors][:limit]
+
@@ -0,0 +1,97 @@
+from datetime import date, timedelta
+from django.db.models import Q, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+from .models import TutorStats
+from .stats import STATS_FIELDS, average_rating
+
+
+def last_month_starts(today, count=6):
+    """First day of each of the last `count` months, oldest first, ending with today's month"""
+    starts = []
+    for offset in range(count - 1, -1, -1):
+        year = today.year
+        month = today.month - offset
+        while month <= 0:
+            month += 12
+            year -= 1
+        starts.append(date(year, month, 1))
+    return starts
+
+
+def monthly_stats(tutor_user, month_starts):
+    """Rollup columns summed per calendar month, one dict (or None without activity) per month start"""
+    months = (
+        TutorStats.objects.filter(tutor=tutor_user, day__gte=month_starts[0])
+        .annotate(month=TruncMonth('day'))
+        .values('month')
+        .annotate(**{f'{name}_sum': Sum(name) for name in STATS_FIELDS})
+    )
+    by_month = {
+        (row['month'].year, row['month'].month): {name: row[f'{name}_sum'] or 0 for name in STATS_FIELDS}
+        for row in months
+    }
+    return [by_month.get((start.year, start.month)) for start in month_starts]
+
+
+def dashboard_cards(tutor_user, now=None):
+    """
+    Summary card figures for a tutor's dashboard: all-time totals and this
+    week's and month's earnings, from one aggregate over the TutorStats
+    daily rollup. The charts are served separately, see DASHBOARD_CHARTS.
+    """
+    today = timezone.localdate(now or timezone.now())
+    totals = TutorStats.objects.filter(tutor=tutor_user).aggregate(
+        bookings=Sum('bookings'),
+        pending_bookings=Sum('pending_bookings'),
+        new_students=Sum('new_students'),
+        reviews=Sum('reviews'),
+        rating_total=Sum('rating_total'),
+        all_earnings=Sum('earnings'),
+        # The last 7 days including today
+        earnings_week=Sum('earnings', filter=Q(day__gt=today - timedelta(days=7))),
+        earnings_month=Sum('earnings', filter=Q(day__gte=today.replace(day=1))),
+    )
+    totals = {name: value or 0 for name, value in totals.items()}
+    return {
+        'total_bookings': totals['bookings'],
+        'pending_bookings_count': totals['pending_bookings'],
+        'total_students': totals['new_students'],
+        'current_avg_rating': round(average_rating(totals), 1),
+        'earnings_this_week': float(totals['earnings_week']),
+        'earnings_this_month': float(totals['earnings_month']),
+        'total_earnings': float(totals['all_earnings']),
+    }
+
+
+def monthly_chart(tutor_user, today):
+    """
+    New students and average review rating in each of the last six months,
+    from one rollup query. A month without reviews repeats the previous
+    month's rating.
+    """
+    month_starts = last_month_starts(today)
+    students = []
+    ratings = []
+    for month in monthly_stats(tutor_user, month_starts):
+        students.append(month['new_students'] if month else 0)
+        if month and month['reviews']:
+            ratings.append(round(average_rating(month), 1))
+        else:
+            ratings.append(ratings[-1] if ratings else 0)
+    return {
+        'labels': [start.strftime('%b %Y') for start in month_starts],
+        'students': students,
+        'ratings': ratings,
+    }
+
+
+# Chart data the dashboard fetches after the page has loaded, by URL name
+DASHBOARD_CHARTS = {
+    'monthly': monthly_chart,
+}
+
+
+def dashboard_chart(tutor_user, name, now=None):
+    """Data of one of the DASHBOARD_CHARTS"""
+    return DASHBOARD_CHARTS[name](tutor_user, timezone.localdate(now or timezone.now()))
@@ -0,0 +1,109 @@
+from collections import defaultdict
+from decimal import Decimal
+from django.db.models import Count, Q
+from .models import TutorProfile
+from .search_cache import search_param
+from .utils import price_condition
+
+
+# Minimum rating options offered by the search filter
+RATING_FACETS = ['4.5', '4.0', '3.5', '3.0']
+
+# (label, min_price, max_price) price ranges from min_price up to but not
+# including max_price, so a price on a boundary falls in one bucket only
+PRICE_FACETS = [
+    ('Under ₹500', None, 500),
+    ('₹500 - ₹1000', 500, 1000),
+    ('₹1000 - ₹2000', 1000, 2000),
+    ('₹2000+', 2000, None),
+]
+
+# Prices are stored to the paisa, so a bucket's inclusive price filter ends this far below its max_price
+PRICE_STEP = Decimal('0.01')
+
+# Cities listed in the city facet
+MAX_CITY_FACETS = 10
+
+# Search params behind each facet group. A group's counts ignore its own
+# filter, so picking one value still shows how many tutors the others have.
+FACET_PARAMS = {
+    'subjects': ('subject',),
+    'cities': ('city',),
+    'modes': ('mode',),
+    'class_levels': ('class_level',),
+    'ratings': ('min_rating',),
+    'prices': ('min_price', 'max_price'),
+}
+
+
+def price_facet_bounds(min_price, max_price):
+    """A PRICE_FACETS bucket as inclusive (min_price, max_price) filter bounds"""
+    return min_price, None if max_price is None else Decimal(max_price) - PRICE_STEP
+
+
+def compute_facets(tutors, params):
+    """
+    Count tutors per facet value for a search, given the tutors with its
+    apply_base_filters() applied. Each facet group counts the tutors
+    matching every other filter of the search (see FACET_PARAMS). Mode,
+    class level, rating and price counts come from one conditional aggregate
+    per distinct set of ignored filters, subjects and cities from one grouped
+    query each, so the number of queries does not depend on the number of
+    facet values. Price counts use the searched subject's prices like the
+    price filter.
+    """
+    from .search import apply_facet_filters
+
+    subject = search_param(params, 'subject')
+    mode = search_param(params, 'mode')
+    level_choices = TutorProfile._meta.get_field('teaching_levels').choices
+
+    def ignored(group):
+        # Only filters the search sets need leaving out
+        return tuple(name for name in FACET_PARAMS[group] if search_param(params, name))
+
+    def matching(exclude):
+        return TutorProfile.objects.filter(id__in=apply_facet_filters(tutors, params, exclude).values('id'))
+
+    aggregates = defaultdict(dict)
+    aggregates[()]['total'] = Count('id')
+    aggregates[ignored('modes')].update(
+        mode_online=Count('id', filter=Q(is_available_online=True)),
+        mode_home=Count('id', filter=Q(is_available_home=True)),
+    )
+    for value, label in level_choices:
+        aggregates[ignored('class_levels')][f'level_{value}'] = Count('id', filter=Q(teaching_levels=value))
+    for index, rating in enumerate(RATING_FACETS):
+        aggregates[ignored('ratings')][f'rating_{index}'] = Count('id', filter=Q(average_rating__gte=Decimal(rating)))
+    for index, (label, min_price, max_price) in enumerate(PRICE_FACETS):
+        condition = price_condition(*price_facet_bounds(min_price, max_price), subject, mode)
+        aggregates[ignored('prices')][f'price_{index}'] = Count('id', filter=condition)
+    counts = {}
+    for exclude, group_aggregates in aggregates.items():
+        counts.update(matching(exclude).aggregate(**group_aggregates))
+
+    subjects = (
+        TutorProfile.subjects.through.objects.filter(tutorprofile_id__in=matching(ignored('subjects')).values('id'))
+        .values('subject_id', 'subject__name')
+        .annotate(count=Count('tutorprofile_id'))
+        .order_by('subject__name')
+    )
+    cities = (
+        matching(ignored('cities')).exclude(city='')
+        .values('city')
+        .annotate(count=Count('id'))
+        .order_by('-count', 'city')[:MAX_CITY_FACETS]
+    )
+
+    return {
+        'total': counts['total'],
+        'subjects': {row['subject_id']: row['count'] for row in subjects},
+        'cities': [(row['city'], row['count']) for row in cities],
+        'modes': {'online': counts['mode_online'], 'home': counts['mode_home']},
+        'class_levels': {value: counts[f'level_{value}'] for value, label in level_choices},
+        'ratings': {rating: counts[f'rating_{index}'] for index, rating in enumerate(RATING_FACETS)},
+        'prices': [
+            {'label': label, 'min_price': min_price, 'max_price': max_price, 'count': counts[f'price_{index}']}
+            for index, (label, min_price, max_price) in enumerate(PRICE_FACETS)
+        ],
+    }
@@ -0,0 +1,117 @@
+import math
+import re
+from collections import defaultdict
+from django.db.models import Count, FloatField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+# Profile fields in the keyword index and how much a match in each counts
+FIELD_WEIGHTS = {
+    'headline': 3.0,
+    'city': 2.0,
+    'state': 2.0,
+    'service_areas': 2.0,
+    'bio': 1.0,
+    'education': 1.0,
+    'experience_summary': 1.0,
+    'teaching_style': 1.0,
+}
+SUBJECT_WEIGHT = 3.0
+
+# Longest term stored, matches TutorSearchTerm.term
+MAX_TERM_LENGTH = 64
+
+# Most query terms used, the rest are ignored
+MAX_QUERY_TERMS = 8
+
+STOP_WORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'have', 'i', 'in', 'is',
+    'it', 'my', 'of', 'on', 'or', 'that', 'the', 'to', 'was', 'we', 'with', 'you', 'your',
+}
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def normalize_term(token):
+    """Lowercase a token and strip a plural 's' so 'teachers' matches 'teacher'"""
+    term = token.lower()
+    if len(term) > 3 and term.endswith('s') and not term.endswith('ss'):
+        term = term[:-1]
+    return term[:MAX_TERM_LENGTH]
+
+
+def tokenize(text):
+    """Split text into normalized index terms, skipping stop words"""
+    terms = []
+    for token in _TOKEN_RE.findall(text or ''):
+        token = token.lower()
+        if len(token) < 2 or token in STOP_WORDS:
+            continue
+        terms.append(normalize_term(token))
+    return terms
+
+
+def build_terms(tutor_profile, subject_names=None):
+    """Get {term: weight} for a tutor, summing field weights per occurrence"""
+    if subject_names is None:
+        subject_names = tutor_profile.subjects.values_list('name', flat=True)
+    weights = defaultdict(float)
+    for field, weight in FIELD_WEIGHTS.items():
+        for term in tokenize(getattr(tutor_profile, field)):
+            weights[term] += weight
+    for name in subject_names:
+        for term in tokenize(name):
+            weights[term] += SUBJECT_WEIGHT
+    return weights
+
+
+def index_tutor(tutor_profile):
+    """Replace a tutor's rows in the keyword index"""
+    from .models import TutorSearchTerm
+
+    TutorSearchTerm.objects.filter(tutor=tutor_profile).delete()
+    TutorSearchTerm.objects.bulk_create([
+        TutorSearchTerm(tutor=tutor_profile, term=term, weight=weight)
+        for term, weight in build_terms(tutor_profile).items()
+    ])
+
+
+def _term_condition(term):
+    # Prefix match so 'math' finds 'mathematics', served by the pattern_ops term index
+    return Q(term__startswith=term)
+
+
+def full_text_search(tutors, query):
+    """
+    Limit tutors to those matching every term of a free-text query and
+    annotate `text_rank`: the sum of field weights of the matched terms,
+    each scaled by how rare the term is (BM25-style idf).
+    Returns tutors unchanged if the query has no searchable terms.
+    """
+    from .models import TutorProfile, TutorSearchTerm
+
+    terms = list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+    if not terms:
+        return tutors
+
+    # Document frequency of every term in one query
+    any_term = Q()
+    for term in terms:
+        any_term |= _term_condition(term)
+    frequencies = TutorSearchTerm.objects.filter(any_term).aggregate(**{
+        f'term_{index}': Count('tutor', distinct=True, filter=_term_condition(term))
+        for index, term in enumerate(terms)
+    })
+    total = TutorProfile.objects.count()
+
+    rank = Value(0.0, output_field=FloatField())
+    for index, term in enumerate(terms):
+        frequency = frequencies[f'term_{index}']
+        # Each IN subquery is a range scan on the term index
+        tutors = tutors.filter(id__in=TutorSearchTerm.objects.filter(_term_condition(term)).values('tutor_id'))
+        idf = math.log(1 + (total - frequency + 0.5) / (frequency + 0.5))
+        term_weight = TutorSearchTerm.objects.filter(
+            _term_condition(term), tutor=OuterRef('pk')
+        ).values('tutor').annotate(total=Sum('weight')).values('total')
+        rank = rank + Coalesce(Subquery(term_weight, output_field=FloatField()), Value(0.0)) * Value(idf)
+    return tutors.annotate(text_rank=rank)
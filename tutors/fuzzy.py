@@ -0,0 +1,92 @@
+def edit_distance(a, b, max_distance=None):
+    """
+    Levenshtein distance between two strings. With max_distance, stops early
+    and returns max_distance + 1 once the distance is known to exceed it.
+    """
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    if max_distance is not None and len(a) - len(b) > max_distance:
+        return max_distance + 1
+
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, start=1):
+        current = [i]
+        for j, char_b in enumerate(b, start=1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b),
+            ))
+        if max_distance is not None and min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+def max_typos(word):
+    """Edits tolerated for a word: none up to 3 letters, one up to 6, then two"""
+    if len(word) <= 3:
+        return 0
+    if len(word) <= 6:
+        return 1
+    return 2
+
+
+class BKTree:
+    """
+    Burkhard-Keller tree over edit distance. Finding words within distance d
+    of a query only visits children whose edge distance is within d of the
+    query's distance to the node, so most of the vocabulary is skipped.
+    """
+
+    def __init__(self, words=()):
+        self.root = None
+        self.size = 0
+        for word in words:
+            self.add(word)
+
+    def add(self, word):
+        if self.root is None:
+            self.root = (word, {})
+            self.size = 1
+            return
+        node = self.root
+        while True:
+            distance = edit_distance(word, node[0])
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = (word, {})
+                self.size += 1
+                return
+            node = child
+
+    def search(self, word, max_distance):
+        """Get [(distance, word), ...] within max_distance, closest first"""
+        if self.root is None:
+            return []
+        matches = []
+        stack = [self.root]
+        while stack:
+            node_word, children = stack.pop()
+            distance = edit_distance(word, node_word)
+            if distance <= max_distance:
+                matches.append((distance, node_word))
+            for edge, child in children.items():
+                if distance - max_distance <= edge <= distance + max_distance:
+                    stack.append(child)
+        matches.sort()
+        return matches
+
+    def closest(self, word, max_distance=None):
+        """Get the closest word within max_distance (default from word length), or None"""
+        if max_distance is None:
+            max_distance = max_typos(word)
+        matches = self.search(word, max_distance)
+        return matches[0][1] if matches else None
+
+    def __len__(self):
+        return self.size
@@ -0,0 +1,186 @@
+import math
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import ASin, Cast, Cos, Power, Radians, Sin, Sqrt
+
+
+# Radius of earth in kilometers
+EARTH_RADIUS_KM = 6371
+
+# Precision stored on TutorProfile.geohash (~5m cells), queries use shorter prefixes
+GEOHASH_PRECISION = 9
+
+_GEOHASH_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    """
+    Encode a coordinate as a geohash string.
+    Nearby points share a common prefix, so a prefix lookup on an
+    indexed column finds every point inside a grid cell.
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    latitude = float(latitude)
+    longitude = float(longitude)
+
+    geohash = []
+    bits = 0
+    bit_count = 0
+    even_bit = True
+    while len(geohash) < precision:
+        if even_bit:
+            mid = (lon_range[0] + lon_range[1]) / 2
+            if longitude >= mid:
+                bits = (bits << 1) | 1
+                lon_range[0] = mid
+            else:
+                bits = bits << 1
+                lon_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if latitude >= mid:
+                bits = (bits << 1) | 1
+                lat_range[0] = mid
+            else:
+                bits = bits << 1
+                lat_range[1] = mid
+        even_bit = not even_bit
+        bit_count += 1
+        if bit_count == 5:
+            geohash.append(_GEOHASH_BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return ''.join(geohash)
+
+
+def parse_coordinates(latitude, longitude):
+    """
+    (lat, lon) as floats from request values, or None unless both are
+    finite numbers on the globe: latitude in [-90, 90], longitude in [-180, 180].
+    """
+    try:
+        latitude = float(latitude)
+        longitude = float(longitude)
+    except (ValueError, TypeError):
+        return None
+    if not (math.isfinite(latitude) and math.isfinite(longitude)):
+        return None
+    if not (-90.0 <= latitude <= 90.0 and -180.0 <= longitude <= 180.0):
+        return None
+    return latitude, longitude
+
+
+def geohash_cell_size(precision):
+    """Return (lat_degrees, lon_degrees) covered by one geohash cell"""
+    total_bits = precision * 5
+    lon_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lon_bits)
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    Get the (min_lat, max_lat, min_lon, max_lon) box enclosing a circle.
+    Longitude bounds are None when the box wraps a pole or the antimeridian.
+    """
+    latitude = float(latitude)
+    longitude = float(longitude)
+    lat_delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat = max(latitude - lat_delta, -90.0)
+    max_lat = min(latitude + lat_delta, 90.0)
+
+    cos_lat = math.cos(math.radians(latitude))
+    if cos_lat <= 1e-9 or min_lat <= -90.0 or max_lat >= 90.0:
+        return min_lat, max_lat, None, None
+    lon_delta = math.degrees(radius_km / (EARTH_RADIUS_KM * cos_lat))
+    min_lon = longitude - lon_delta
+    max_lon = longitude + lon_delta
+    if min_lon < -180.0 or max_lon > 180.0:
+        return min_lat, max_lat, None, None
+    return min_lat, max_lat, min_lon, max_lon
+
+
+def covering_geohashes(latitude, longitude, radius_km):
+    """
+    Get geohash prefixes whose cells together cover the circle's bounding box.
+    Picks the finest precision where a cell is at least as large as the box,
+    so at most a handful of prefixes are returned. Returns None when the
+    circle is too large for a prefix filter to help.
+    """
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+    if min_lon is None:
+        return None
+
+    precision = 0
+    for candidate in range(GEOHASH_PRECISION, 0, -1):
+        cell_lat, cell_lon = geohash_cell_size(candidate)
+        if cell_lat >= (max_lat - min_lat) and cell_lon >= (max_lon - min_lon):
+            precision = candidate
+            break
+    if not precision:
+        return None
+
+    cell_lat, cell_lon = geohash_cell_size(precision)
+    cells = set()
+    lat = min_lat
+    while True:
+        lon = min_lon
+        while True:
+            cells.add(encode_geohash(lat, lon, precision))
+            if lon >= max_lon:
+                break
+            lon = min(lon + cell_lon, max_lon)
+        if lat >= max_lat:
+            break
+        lat = min(lat + cell_lat, max_lat)
+    return cells
+
+
+def within_bounding_box(latitude, longitude, radius_km):
+    """
+    Build an index-friendly Q for tutors that may lie within radius_km.
+    Combines geohash prefixes with a latitude/longitude range check.
+    """
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+    condition = Q(latitude__gte=min_lat, latitude__lte=max_lat)
+    if min_lon is not None:
+        condition &= Q(longitude__gte=min_lon, longitude__lte=max_lon)
+
+    cells = covering_geohashes(latitude, longitude, radius_km)
+    if cells:
+        cell_condition = Q()
+        for cell in cells:
+            cell_condition |= Q(geohash__startswith=cell)
+        condition &= cell_condition
+    return condition
+
+
+def covers_point(latitude, longitude):
+    """
+    Build an index-friendly Q for tutors whose travel coverage box contains
+    the point. Coverage boxes without longitude bounds wrap the globe.
+    """
+    latitude = float(latitude)
+    longitude = float(longitude)
+    return Q(coverage_min_lat__lte=latitude, coverage_max_lat__gte=latitude) & (
+        Q(coverage_min_lon__isnull=True) |
+        Q(coverage_min_lon__lte=longitude, coverage_max_lon__gte=longitude)
+    )
+
+
+def distance_expression(latitude, longitude, lat_field='latitude', lon_field='longitude'):
+    """
+    Haversine distance in kilometers from a fixed point to the given fields,
+    evaluated by the database so the result can be filtered and ordered.
+    """
+    lat0 = math.radians(float(latitude))
+    lon0 = math.radians(float(longitude))
+    lat = Radians(Cast(F(lat_field), FloatField()))
+    lon = Radians(Cast(F(lon_field), FloatField()))
+
+    a = (
+        Power(Sin((lat - Value(lat0)) / Value(2.0)), Value(2.0))
+        + Value(math.cos(lat0)) * Cos(lat) * Power(Sin((lon - Value(lon0)) / Value(2.0)), Value(2.0))
+    )
+    return Value(2.0 * EARTH_RADIUS_KM) * ASin(Sqrt(a, output_field=FloatField()), output_field=FloatField())
+
@@ -0,0 +1,75 @@
+import multiprocessing
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.utils import timezone
+from tutors.models import QualityAudit, Subject, TutorProfile
+from tutors.quality import audit_tutors
+from tutors.search_cache import invalidate_search_cache
+
+
+def _init_worker():
+    django.setup()
+    # Forked workers must not share the parent's database connections
+    connections.close_all()
+
+
+def _audit_chunk(args):
+    tutor_ids, now, audit_type = args
+    result = audit_tutors(tutor_ids, now, audit_type)
+    connections.close_all()
+    return result
+
+
+class Command(BaseCommand):
+    help = 'Recompute every tutor quality score in bulk and record a QualityAudit for each (run nightly)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=1,
+            help='Number of worker processes'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Tutors loaded, scored and written at a time'
+        )
+        parser.add_argument(
+            '--audit-type',
+            choices=[choice for choice, _ in QualityAudit.AUDIT_TYPES],
+            default='scheduled',
+            help='Type recorded on the audit rows (default: scheduled)'
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        tutor_ids = list(TutorProfile.objects.filter(is_deleted=False).order_by('id').values_list('id', flat=True))
+
+        chunk_size = max(options['chunk_size'], 1)
+        chunks = [
+            (tutor_ids[start:start + chunk_size], now, options['audit_type'])
+            for start in range(0, len(tutor_ids), chunk_size)
+        ]
+
+        processes = max(options['processes'], 1)
+        if processes == 1 or len(chunks) <= 1:
+            results = [_audit_chunk(chunk) for chunk in chunks]
+        else:
+            connections.close_all()
+            with multiprocessing.Pool(processes, initializer=_init_worker) as pool:
+                results = list(pool.imap_unordered(_audit_chunk, chunks))
+
+        # Quality scores feed search ranking
+        invalidate_search_cache(
+            TutorProfile.objects.values_list('city', flat=True).distinct(),
+            Subject.objects.values_list('id', flat=True),
+        )
+
+        audited = sum(count for count, _ in results)
+        flagged = sum(count for _, count in results)
+        self.stdout.write(
+            self.style.SUCCESS(f'Audited {audited} tutor(s), {flagged} flagged for intervention.')
+        )
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from tutors.models import TutorProfile, TutorServiceArea
+from tutors.utils import tutor_service_areas
+
+
+class Command(BaseCommand):
+    help = 'One-time backfill of normalized tutor service areas from TutorProfile.service_areas, city and state'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows per bulk insert (default: 1000)'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(options['batch_size'], 1)
+        tutors = TutorProfile.objects.values_list('id', 'service_areas', 'city', 'state')
+
+        batch = []
+        created = 0
+        tutor_count = 0
+        for tutor_id, service_areas, city, state in tutors.iterator(chunk_size=batch_size):
+            tutor_count += 1
+            for kind, value in tutor_service_areas(service_areas, city, state):
+                batch.append(TutorServiceArea(tutor_id=tutor_id, kind=kind, value=value))
+            if len(batch) >= batch_size:
+                created += len(TutorServiceArea.objects.bulk_create(batch, ignore_conflicts=True))
+                batch = []
+        if batch:
+            created += len(TutorServiceArea.objects.bulk_create(batch, ignore_conflicts=True))
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Backfilled {created} service area(s) for {tutor_count} tutor(s).')
+        )
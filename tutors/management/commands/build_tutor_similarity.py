@@ -0,0 +1,25 @@
+import time
+from django.core.management.base import BaseCommand
+from tutors.collaborative import DEFAULT_NEIGHBOURS, rebuild_tutor_similarity
+
+
+class Command(BaseCommand):
+    help = 'Recompute collaborative-filtering tutor neighbours from booking and review history (run periodically)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--neighbours',
+            type=int,
+            default=DEFAULT_NEIGHBOURS,
+            help='Similar tutors stored per tutor'
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        tutor_count, row_count = rebuild_tutor_similarity(max(options['neighbours'], 1))
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Stored {row_count} neighbour(s) for {tutor_count} tutor(s) in {elapsed:.2f}s.'
+            )
+        )
@@ -0,0 +1,69 @@
+from collections import defaultdict
+from django.core.management.base import BaseCommand
+from tutors.collaborative import DEFAULT_NEIGHBOURS, InteractionMatrix, load_interactions, score_candidates
+
+
+class Command(BaseCommand):
+    help = 'Offline leave-one-out hit-rate evaluation of collaborative-filtering recommendations'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=10,
+            help='Recommendation list length used for hit-rate (default: 10)'
+        )
+        parser.add_argument(
+            '--neighbours',
+            type=int,
+            default=DEFAULT_NEIGHBOURS,
+            help=f'Similar tutors kept per tutor (default: {DEFAULT_NEIGHBOURS})'
+        )
+
+    def handle(self, *args, **options):
+        top = max(options['top'], 1)
+        interactions = load_interactions()
+
+        by_student = defaultdict(list)
+        for row in interactions:
+            by_student[row[0]].append(row)
+
+        # Hold out each student's most recently booked tutor
+        held_out = {}
+        for student_id, rows in by_student.items():
+            booked = [row for row in rows if row[3] is not None]
+            if len(rows) >= 2 and booked:
+                latest = max(booked, key=lambda row: row[3])
+                held_out[student_id] = latest[1]
+        if not held_out:
+            self.stdout.write(self.style.WARNING('No students with two or more booked tutors to evaluate.'))
+            return
+
+        training = [row for row in interactions if held_out.get(row[0]) != row[1]]
+        neighbours = InteractionMatrix.from_interactions(training).tutor_neighbours(options['neighbours'])
+
+        popularity = defaultdict(float)
+        for student_id, tutor_id, weight, last_at in training:
+            popularity[tutor_id] += weight
+        popular = sorted(popularity, key=lambda tutor_id: (-popularity[tutor_id], tutor_id))
+
+        hits = popular_hits = covered = 0
+        for student_id, target in held_out.items():
+            interacted = {
+                tutor_id: weight
+                for _, tutor_id, weight, last_at in by_student[student_id]
+                if tutor_id != target
+            }
+            ranked = score_candidates(interacted, neighbours, top)
+            if ranked:
+                covered += 1
+            if target in {tutor_id for tutor_id, score in ranked}:
+                hits += 1
+            if target in [tutor_id for tutor_id in popular if tutor_id not in interacted][:top]:
+                popular_hits += 1
+
+        total = len(held_out)
+        self.stdout.write(f'Students evaluated: {total}')
+        self.stdout.write(f'Students with recommendations: {covered} ({covered / total:.1%})')
+        self.stdout.write(f'Collaborative hit-rate@{top}: {hits / total:.3f}')
+        self.stdout.write(f'Popularity baseline hit-rate@{top}: {popular_hits / total:.3f}')
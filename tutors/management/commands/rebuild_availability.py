@@ -0,0 +1,44 @@
+from collections import defaultdict
+from django.core.management.base import BaseCommand
+from bookings.models import AvailabilitySlot
+from tutors.availability import AVAILABILITY_FIELDS, compile_availability
+from tutors.models import Subject, TutorProfile
+from tutors.search_cache import invalidate_search_cache
+
+
+class Command(BaseCommand):
+    help = 'Recompile every tutor\'s stored weekly availability from their availability slots'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows per bulk update (default: 1000)'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(options['batch_size'], 1)
+        slots = defaultdict(list)
+        rows = AvailabilitySlot.objects.filter(is_available=True).values_list('tutor_id', 'day_of_week', 'start_time', 'end_time')
+        for user_id, day, start_time, end_time in rows.iterator(chunk_size=batch_size):
+            slots[user_id].append((day, start_time, end_time))
+
+        fields = [field for day_fields in AVAILABILITY_FIELDS for field in day_fields]
+        tutors = []
+        available = 0
+        for tutor in TutorProfile.objects.only('id', 'user_id').iterator(chunk_size=batch_size):
+            words = compile_availability(slots.get(tutor.user_id, ()))
+            for field, word in words.items():
+                setattr(tutor, field, word)
+            available += any(words.values())
+            tutors.append(tutor)
+        TutorProfile.objects.bulk_update(tutors, fields, batch_size=batch_size)
+        invalidate_search_cache(
+            TutorProfile.objects.values_list('city', flat=True).distinct(),
+            Subject.objects.values_list('id', flat=True),
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Compiled availability for {len(tutors)} tutor(s), {available} with free time.')
+        )
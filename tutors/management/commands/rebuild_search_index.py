@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from tutors.fulltext import build_terms
+from tutors.models import TutorProfile, TutorSearchTerm
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the tutor keyword search index (e.g. after renaming subjects)'
+
+    def handle(self, *args, **options):
+        rows = []
+        count = 0
+        for tutor in TutorProfile.objects.prefetch_related('subjects').iterator(chunk_size=500):
+            terms = build_terms(tutor, [subject.name for subject in tutor.subjects.all()])
+            rows.extend(TutorSearchTerm(tutor=tutor, term=term, weight=weight) for term, weight in terms.items())
+            count += 1
+
+        with transaction.atomic():
+            TutorSearchTerm.objects.all().delete()
+            TutorSearchTerm.objects.bulk_create(rows, batch_size=1000)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Indexed {len(rows)} term(s) for {count} tutor(s).')
+        )
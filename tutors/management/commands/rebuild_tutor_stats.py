@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from tutors.stats import rebuild_tutor_stats
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the TutorStats daily rollup from bookings, payments and reviews'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tutor',
+            type=int,
+            action='append',
+            dest='tutor_ids',
+            help='Only rebuild this tutor user id (repeatable)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows per bulk insert (default: 1000)'
+        )
+
+    def handle(self, *args, **options):
+        rows = rebuild_tutor_stats(options['tutor_ids'], batch_size=max(options['batch_size'], 1))
+        scope = f"{len(options['tutor_ids'])} tutor(s)" if options['tutor_ids'] else 'all tutors'
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rows} daily stats row(s) for {scope}.'))
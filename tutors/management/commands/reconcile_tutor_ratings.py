@@ -0,0 +1,68 @@
+from decimal import ROUND_HALF_UP, Decimal
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Q, Sum
+from reviews.models import Review
+from students.recommendations import mark_recommendations_stale_for_tutor
+from tutors.models import Subject, TutorProfile
+from tutors.ranking import refresh_base_rank_scores
+from tutors.search_cache import invalidate_search_cache
+
+
+class Command(BaseCommand):
+    help = 'Recompute tutor rating counts, sums, histograms and averages from reviews and repair any drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report drifted tutors without updating them'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows per bulk update (default: 1000)'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(options['batch_size'], 1)
+        star_fields = TutorProfile.RATING_COUNT_FIELDS
+        rows = (
+            Review.objects.filter(is_approved=True, is_deleted=False)
+            .values('tutor_id')
+            .annotate(
+                total_reviews=Count('id'),
+                rating_sum=Sum('rating'),
+                **{field: Count('id', filter=Q(rating=star)) for star, field in star_fields.items()},
+            )
+        )
+        aggregates = {row.pop('tutor_id'): row for row in rows}
+
+        fields = ['total_reviews', 'rating_sum', *star_fields.values(), 'average_rating']
+        empty = {field: 0 for field in fields}
+        drifted = []
+        for tutor in TutorProfile.objects.only('id', 'user_id', *fields).iterator(chunk_size=batch_size):
+            expected = dict(aggregates.get(tutor.user_id, empty))
+            expected['average_rating'] = (
+                (Decimal(expected['rating_sum']) / expected['total_reviews']).quantize(Decimal('0.01'), ROUND_HALF_UP)
+                if expected['total_reviews'] else Decimal('0.00')
+            )
+            if any(getattr(tutor, field) != expected[field] for field in fields):
+                for field in fields:
+                    setattr(tutor, field, expected[field])
+                drifted.append(tutor)
+
+        if drifted and not options['dry_run']:
+            TutorProfile.objects.bulk_update(drifted, fields, batch_size=batch_size)
+            for start in range(0, len(drifted), batch_size):
+                batch = drifted[start:start + batch_size]
+                refresh_base_rank_scores(TutorProfile.objects.filter(id__in=[tutor.id for tutor in batch]))
+            for tutor in drifted:
+                mark_recommendations_stale_for_tutor(tutor)
+            invalidate_search_cache(
+                TutorProfile.objects.values_list('city', flat=True).distinct(),
+                Subject.objects.values_list('id', flat=True),
+            )
+
+        action = 'Found' if options['dry_run'] else 'Repaired'
+        self.stdout.write(self.style.SUCCESS(f'{action} rating drift on {len(drifted)} tutor(s).'))
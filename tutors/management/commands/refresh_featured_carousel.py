@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from tutors.carousel import refresh_featured_carousel
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the home page featured tutor carousel snapshot (run periodically)'
+
+    def handle(self, *args, **options):
+        cards = refresh_featured_carousel()
+        self.stdout.write(
+            self.style.SUCCESS(f'Stored featured carousel with {len(cards)} tutor(s).')
+        )
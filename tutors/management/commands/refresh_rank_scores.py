@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from tutors.models import TutorProfile
+from tutors.ranking import refresh_base_rank_scores
+
+
+class Command(BaseCommand):
+    help = 'Recompute the stored base ranking score of every tutor (run after changing the ranking weights)'
+
+    def handle(self, *args, **options):
+        count = refresh_base_rank_scores(TutorProfile.objects.all())
+        self.stdout.write(self.style.SUCCESS(f'Refreshed the base ranking score of {count} tutor(s).'))
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+from tutors.models import TutorProfile, PremiumSubscription
+
+
+class Command(BaseCommand):
+    help = 'Expire premium subscriptions and refresh lapsed tutor ranking tiers (run periodically)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Recompute the ranking tier for every tutor'
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+
+        # Deactivate subscriptions past their end date
+        expired = PremiumSubscription.objects.filter(is_active=True, end_date__lt=now)
+        expired_tutor_ids = set(expired.values_list('tutor_id', flat=True))
+        expired_count = expired.update(is_active=False)
+
+        if options['all']:
+            tutors = TutorProfile.objects.all()
+        else:
+            tutors = TutorProfile.objects.filter(
+                Q(ranking_tier_until__lte=now) | Q(id__in=expired_tutor_ids)
+            )
+
+        count = 0
+        for tutor in tutors.iterator():
+            tutor.refresh_ranking_tier(now)
+            count += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Expired {expired_count} subscription(s), refreshed ranking tier for {count} tutor(s).'
+            )
+        )
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from analytics.search_log import popular_searches
+from tutors.models import TutorProfile
+from tutors.search import apply_base_filters, search_summary
+from tutors.search_cache import get_cached_search, is_cacheable_search
+
+
+class Command(BaseCommand):
+    help = 'Pre-compute cached result counts and facets for the most popular recent tutor searches (run at deploy time)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=50,
+            help='Number of popular searches to warm (default: 50)'
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=7,
+            help='Look at searches from this many past days (default: 7)'
+        )
+
+    def handle(self, *args, **options):
+        tutors = TutorProfile.objects.filter(is_verified=True, verification_status='approved')
+        warmed = 0
+        for search in popular_searches(days=options['days'], limit=options['limit']):
+            params = search['params']
+            if not is_cacheable_search(params):
+                continue
+            matching = apply_base_filters(tutors, params)
+            get_cached_search(params, lambda: search_summary(matching, params))
+            warmed += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Warmed the search cache for {warmed} popular search(es).')
+        )
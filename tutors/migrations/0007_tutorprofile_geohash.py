@@ -0,0 +1,35 @@
+# Generated by Django 5.0.1 on 2026-10-17 23:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_geohash(apps, schema_editor):
+    from tutors.geo import encode_geohash
+
+    TutorProfile = apps.get_model('tutors', 'TutorProfile')
+    tutors = list(TutorProfile.objects.filter(latitude__isnull=False, longitude__isnull=False))
+    for tutor in tutors:
+        tutor.geohash = encode_geohash(tutor.latitude, tutor.longitude)
+    TutorProfile.objects.bulk_update(tutors, ['geohash'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutors', '0006_auto_20250101_0001'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tutorprofile',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='Geohash of latitude/longitude for proximity search', max_length=12),
+        ),
+        migrations.AddIndex(
+            model_name='tutorprofile',
+            index=models.Index(fields=['latitude', 'longitude'], name='tutors_tuto_latitud_c56107_idx'),
+        ),
+        migrations.RunPython(populate_geohash, migrations.RunPython.noop),
+    ]
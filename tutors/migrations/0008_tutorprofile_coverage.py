@@ -0,0 +1,57 @@
+# Generated by Django 5.0.1 on 2026-10-17 23:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_coverage(apps, schema_editor):
+    from tutors.geo import bounding_box
+
+    TutorProfile = apps.get_model('tutors', 'TutorProfile')
+    tutors = list(TutorProfile.objects.filter(latitude__isnull=False, longitude__isnull=False))
+    for tutor in tutors:
+        (tutor.coverage_min_lat, tutor.coverage_max_lat,
+         tutor.coverage_min_lon, tutor.coverage_max_lon) = bounding_box(
+            tutor.latitude, tutor.longitude, max(tutor.max_travel_distance or 0, 0)
+        )
+    TutorProfile.objects.bulk_update(
+        tutors,
+        ['coverage_min_lat', 'coverage_max_lat', 'coverage_min_lon', 'coverage_max_lon'],
+        batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutors', '0007_tutorprofile_geohash'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tutorprofile',
+            name='coverage_max_lat',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='tutorprofile',
+            name='coverage_max_lon',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='tutorprofile',
+            name='coverage_min_lat',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='tutorprofile',
+            name='coverage_min_lon',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='tutorprofile',
+            index=models.Index(fields=['coverage_min_lat', 'coverage_max_lat'], name='tutors_tuto_coverag_7cf087_idx'),
+        ),
+        migrations.RunPython(populate_coverage, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.0.1 on 2026-10-17 23:41
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def populate_ranking_tier(apps, schema_editor):
+    TutorProfile = apps.get_model('tutors', 'TutorProfile')
+    PremiumSubscription = apps.get_model('tutors', 'PremiumSubscription')
+    now = timezone.now()
+
+    premium_until = {}
+    featured_until = {}
+    active_subscriptions = PremiumSubscription.objects.filter(
+        subscription_type__in=['premium', 'featured'],
+        is_active=True,
+        end_date__gte=now
+    ).values_list('tutor_id', 'subscription_type', 'end_date')
+    for tutor_id, subscription_type, end_date in active_subscriptions:
+        until = premium_until if subscription_type == 'premium' else featured_until
+        until[tutor_id] = max(until.get(tutor_id, end_date), end_date)
+
+    tutors = list(TutorProfile.objects.all())
+    for tutor in tutors:
+        # Same precedence as TutorProfile.compute_ranking_tier
+        if tutor.id in premium_until:
+            tutor.ranking_tier, tutor.ranking_tier_until = 0, premium_until[tutor.id]
+        elif tutor.is_featured:
+            tutor.ranking_tier, tutor.ranking_tier_until = 1, None
+        elif tutor.id in featured_until:
+            tutor.ranking_tier, tutor.ranking_tier_until = 1, featured_until[tutor.id]
+        elif tutor.premium_boost_until and now < tutor.premium_boost_until:
+            tutor.ranking_tier, tutor.ranking_tier_until = 2, tutor.premium_boost_until
+        else:
+            tutor.ranking_tier, tutor.ranking_tier_until = 3, None
+    TutorProfile.objects.bulk_update(tutors, ['ranking_tier', 'ranking_tier_until'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutors', '0008_tutorprofile_coverage'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tutorprofile',
+            name='ranking_tier',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'Premium Package'), (1, 'Featured'), (2, 'Boost'), (3, 'Standard')], default=3, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tutorprofile',
+            name='ranking_tier_until',
+            field=models.DateTimeField(blank=True, editable=False, help_text='When the current ranking tier lapses', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='tutorprofile',
+            index=models.Index(fields=['ranking_tier', '-average_rating', 'hourly_rate'], name='tutors_ranking_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tutorprofile',
+            index=models.Index(fields=['ranking_tier_until'], name='tutors_tuto_ranking_da1d2d_idx'),
+        ),
+        migrations.RunPython(populate_ranking_tier, migrations.RunPython.noop),
+    ]
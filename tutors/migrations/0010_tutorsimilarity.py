@@ -0,0 +1,30 @@
+# Generated by Django 5.0.1 on 2026-10-17 23:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutors', '0009_tutorprofile_ranking_tier'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TutorSimilarity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(help_text="Cosine similarity of the two tutors' students")),
+                ('computed_at', models.DateTimeField()),
+                ('similar_tutor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='tutors.tutorprofile')),
+                ('tutor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_tutors', to='tutors.tutorprofile')),
+            ],
+            options={
+                'verbose_name': 'Tutor Similarity',
+                'verbose_name_plural': 'Tutor Similarities',
+                'ordering': ['tutor', '-score'],
+                'unique_together': {('tutor', 'similar_tutor')},
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.0.1 on 2026-10-17 23:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_search_terms(apps, schema_editor):
+    from tutors.fulltext import build_terms
+
+    TutorProfile = apps.get_model('tutors', 'TutorProfile')
+    TutorSearchTerm = apps.get_model('tutors', 'TutorSearchTerm')
+    rows = []
+    for tutor in TutorProfile.objects.prefetch_related('subjects'):
+        terms = build_terms(tutor, [subject.name for subject in tutor.subjects.all()])
+        rows.extend(TutorSearchTerm(tutor=tutor, term=term, weight=weight) for term, weight in terms.items())
+    TutorSearchTerm.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutors', '0010_tutorsimilarity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TutorSearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64)),
+                ('weight', models.FloatField(help_text='Sum of field weights of the term in the profile')),
+                ('tutor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='tutors.tutorprofile')),
+            ],
+            options={
+                'verbose_name': 'Tutor Search Term',
+                'verbose_name_plural': 'Tutor Search Terms',
+                'unique_together': {('term', 'tutor')},
+            },
+        ),
+        migrations.RunPython(populate_search_terms, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.1 on 2026-10-17 23:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutors', '0011_tutorsearchterm'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TutorServiceArea',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('pincode', 'Pincode'), ('area', 'Area')], max_length=10)),
+                ('value', models.CharField(help_text='Lowercased area name or pincode without spaces', max_length=100)),
+                ('tutor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='service_area_entries', to='tutors.tutorprofile')),
+            ],
+            options={
+                'verbose_name': 'Tutor Service Area',
+                'verbose_name_plural': 'Tutor Service Areas',
+                'indexes': [models.Index(fields=['kind', 'value'], name='tutors_tuto_kind_744360_idx')],
+                'unique_together': {('value', 'tutor')},
+            },
+        ),
+    ]
@@ -0,0 +1,106 @@
+# Generated by Django 5.0.1 on 2026-10-18 00:01
+
+from collections import defaultdict
+from django.db import migrations, models
+
+
+def compile_availability_words(apps, schema_editor):
+    from tutors.availability import AVAILABILITY_FIELDS, compile_availability
+
+    TutorProfile = apps.get_model('tutors', 'TutorProfile')
+    AvailabilitySlot = apps.get_model('bookings', 'AvailabilitySlot')
+    slots = defaultdict(list)
+    rows = AvailabilitySlot.objects.filter(is_available=True).values_list('tutor_id', 'day_of_week', 'start_time', 'end_time')
+    for user_id, day, start_time, end_time in rows:
+        slots[user_id].append((day, start_time, end_time))
+    tutors = []
+    for tutor in TutorProfile.objects.only('id', 'user_id'):
+        if tutor.user_id not in slots:
+            continue
+        for field, word in compile_availability(slots[tutor.user_id]).items():
+            setattr(tutor, field, word)
+        tutors.append(tutor)
+    fields = [field for day_fields in AVAILABILITY_FIELDS for field in day_fields]
+    TutorProfile.objects.bulk_update(tutors, fields, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0002_booking_is_recurring_booking_parent_booking_and_more'),
+        ('tutors', '0012_tutorservicearea'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tutorprofile',
+            name='available_mon_am',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tutorprofile',
+            name='available_mon_pm',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tutorprofile',
+            name='available_tue_am',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tutorprofile',
+            name='available_tue_pm',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tutorprofile',
+            name='available_wed_am',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tutorprofile',
+            name='available_wed_pm',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tutorprofile',
+            name='available_thu_am',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tutorprofile',
+            name='available_thu_pm',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tutorprofile',
+            name='available_fri_am',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tutorprofile',
+            name='available_fri_pm',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tutorprofile',
+            name='available_sat_am',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tutorprofile',
+            name='available_sat_pm',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tutorprofile',
+            name='available_sun_am',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tutorprofile',
+            name='available_sun_pm',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(compile_availability_words, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.0.1 on 2026-10-18 00:07
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Max, Min
+
+
+def populate_price_ranges(apps, schema_editor):
+    TutorProfile = apps.get_model('tutors', 'TutorProfile')
+    PricingOption = apps.get_model('tutors', 'PricingOption')
+    ranges = {
+        row['tutor_id']: (row['low'], row['high'])
+        for row in PricingOption.objects.filter(is_active=True).values('tutor_id').annotate(
+            low=Min('price_per_hour'), high=Max('price_per_hour')
+        )
+    }
+    tutors = list(TutorProfile.objects.only('id', 'hourly_rate'))
+    for tutor in tutors:
+        tutor.min_price, tutor.max_price = ranges.get(tutor.id, (tutor.hourly_rate, tutor.hourly_rate))
+    TutorProfile.objects.bulk_update(tutors, ['min_price', 'max_price'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutors', '0013_tutorprofile_availability_words'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tutorprofile',
+            name='max_price',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='tutorprofile',
+            name='min_price',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=10, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='pricingoption',
+            index=models.Index(fields=['subject', 'mode', 'price_per_hour'], name='tutors_pric_subject_c25cec_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tutorprofile',
+            index=models.Index(fields=['min_price', 'max_price'], name='tutors_tuto_min_pri_95422e_idx'),
+        ),
+        migrations.RunPython(populate_price_ranges, migrations.RunPython.noop),
+    ]
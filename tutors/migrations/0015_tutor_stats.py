@@ -0,0 +1,51 @@
+# Generated by Django 5.0.1 on 2026-10-18 00:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_tutor_stats(apps, schema_editor):
+    from tutors.stats import rebuild_tutor_stats
+
+    rebuild_tutor_stats()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0002_booking_is_recurring_booking_parent_booking_and_more'),
+        ('payments', '0004_alter_premiumpayment_payment_type'),
+        ('reviews', '0002_review_moderated_by_alter_review_booking_and_more'),
+        ('tutors', '0014_tutorprofile_price_range'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TutorStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('bookings', models.IntegerField(default=0)),
+                ('pending_bookings', models.IntegerField(default=0, help_text='Bookings made this day that are still pending')),
+                ('new_students', models.IntegerField(default=0, help_text='Students whose first booking with the tutor was made this day')),
+                ('completed_payments', models.IntegerField(default=0)),
+                ('earnings', models.DecimalField(decimal_places=2, default=0, help_text='Tutor payout of completed payments', max_digits=12)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, help_text='Amount of completed payments', max_digits=12)),
+                ('commission', models.DecimalField(decimal_places=2, default=0, help_text='Commission on completed payments', max_digits=12)),
+                ('held_earnings', models.DecimalField(decimal_places=2, default=0, help_text='Tutor payout of payments on hold', max_digits=12)),
+                ('processing_earnings', models.DecimalField(decimal_places=2, default=0, help_text='Tutor payout of payments being processed', max_digits=12)),
+                ('reviews', models.IntegerField(default=0)),
+                ('rating_total', models.IntegerField(default=0, help_text='Sum of the ratings of those reviews')),
+                ('tutor', models.ForeignKey(limit_choices_to={'role': 'tutor'}, on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Tutor Stats',
+                'verbose_name_plural': 'Tutor Stats',
+                'ordering': ['tutor', 'day'],
+                'unique_together': {('tutor', 'day')},
+            },
+        ),
+        migrations.RunPython(populate_tutor_stats, migrations.RunPython.noop),
+    ]
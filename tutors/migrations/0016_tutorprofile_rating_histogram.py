@@ -0,0 +1,72 @@
+# Generated by Django 5.0.1 on 2026-10-18 00:16
+
+from decimal import ROUND_HALF_UP, Decimal
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def populate_rating_aggregates(apps, schema_editor):
+    TutorProfile = apps.get_model('tutors', 'TutorProfile')
+    Review = apps.get_model('reviews', 'Review')
+    star_fields = {star: f'rating_{star}_count' for star in range(1, 6)}
+    aggregates = {
+        row.pop('tutor_id'): row
+        for row in Review.objects.filter(is_approved=True, is_deleted=False).values('tutor_id').annotate(
+            total_reviews=Count('id'),
+            rating_sum=Sum('rating'),
+            **{field: Count('id', filter=Q(rating=star)) for star, field in star_fields.items()},
+        )
+    }
+    fields = ['total_reviews', 'rating_sum', *star_fields.values(), 'average_rating']
+    tutors = list(TutorProfile.objects.only('id', 'user_id'))
+    for tutor in tutors:
+        row = aggregates.get(tutor.user_id, {field: 0 for field in fields})
+        for field in fields[:-1]:
+            setattr(tutor, field, row[field])
+        tutor.average_rating = (
+            (Decimal(row['rating_sum']) / row['total_reviews']).quantize(Decimal('0.01'), ROUND_HALF_UP)
+            if row['total_reviews'] else Decimal('0.00')
+        )
+    TutorProfile.objects.bulk_update(tutors, fields, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_review_moderated_by_alter_review_booking_and_more'),
+        ('tutors', '0015_tutor_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tutorprofile',
+            name='rating_1_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tutorprofile',
+            name='rating_2_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tutorprofile',
+            name='rating_3_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tutorprofile',
+            name='rating_4_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tutorprofile',
+            name='rating_5_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tutorprofile',
+            name='rating_sum',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_rating_aggregates, migrations.RunPython.noop),
+    ]
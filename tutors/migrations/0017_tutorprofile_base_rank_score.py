@@ -0,0 +1,31 @@
+# Generated by Django 5.0.1 on 2026-10-18 00:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_base_rank_scores(apps, schema_editor):
+    from tutors.ranking import refresh_base_rank_scores
+
+    refresh_base_rank_scores(apps.get_model('tutors', 'TutorProfile').objects.all())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutors', '0016_tutorprofile_rating_histogram'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tutorprofile',
+            name='base_rank_score',
+            field=models.FloatField(default=0.0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='tutorprofile',
+            index=models.Index(fields=['-base_rank_score', 'id'], name='tutors_rank_score_idx'),
+        ),
+        migrations.RunPython(populate_base_rank_scores, migrations.RunPython.noop),
+    ]
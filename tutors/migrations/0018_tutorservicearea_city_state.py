@@ -0,0 +1,43 @@
+# Generated by Django 5.0.1 on 2026-10-18 00:39
+
+from django.db import migrations, models
+
+
+def index_cities_and_states(apps, schema_editor):
+    from tutors.utils import tutor_service_areas
+
+    TutorProfile = apps.get_model('tutors', 'TutorProfile')
+    TutorServiceArea = apps.get_model('tutors', 'TutorServiceArea')
+    entries = []
+    for tutor_id, city, state in TutorProfile.objects.values_list('id', 'city', 'state').iterator():
+        for kind, value in tutor_service_areas('', city, state):
+            entries.append(TutorServiceArea(tutor_id=tutor_id, kind=kind, value=value))
+    TutorServiceArea.objects.bulk_create(entries, batch_size=1000, ignore_conflicts=True)
+
+
+def drop_cities_and_states(apps, schema_editor):
+    apps.get_model('tutors', 'TutorServiceArea').objects.filter(kind__in=['city', 'state']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutors', '0017_tutorprofile_base_rank_score'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='tutorservicearea',
+            unique_together=set(),
+        ),
+        migrations.AlterField(
+            model_name='tutorservicearea',
+            name='kind',
+            field=models.CharField(choices=[('pincode', 'Pincode'), ('area', 'Area'), ('city', 'City'), ('state', 'State')], max_length=10),
+        ),
+        migrations.AlterUniqueTogether(
+            name='tutorservicearea',
+            unique_together={('tutor', 'kind', 'value')},
+        ),
+        migrations.RunPython(index_cities_and_states, drop_cities_and_states),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.1 on 2026-10-18 00:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutors', '0018_tutorservicearea_city_state'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tutorsearchterm',
+            index=models.Index(fields=['term'], name='tutors_searchterm_term_like', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.1 on 2026-10-18 00:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutors', '0019_tutorsearchterm_term_like'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='tutorservicearea',
+            name='tutors_tuto_kind_744360_idx',
+        ),
+        migrations.AddIndex(
+            model_name='tutorservicearea',
+            index=models.Index(fields=['kind', 'value'], name='tutors_servicearea_value_like', opclasses=['varchar_pattern_ops', 'varchar_pattern_ops']),
+        ),
+    ]
@@ -1,6 +1,10 @@
 from django.db import models
+from django.db.models import Case, F, Q, Value, When
+from django.db.models.functions import Cast, Round
+from django.db.models.signals import m2m_changed
 from django.conf import settings
 from core.models import TimeStampedModel, SoftDeleteModel
+from .availability import AVAILABILITY_FIELDS
 
 
 class Subject(models.Model):
@@ -14,6 +18,17 @@ class Subject(models.Model):
     
     def __str__(self):
         return self.name
+    
+    def save(self, *args, **kwargs):
+        from .autocomplete import invalidate_autocomplete
+        super().save(*args, **kwargs)
+        invalidate_autocomplete('subject')
+    
+    def delete(self, *args, **kwargs):
+        from .autocomplete import invalidate_autocomplete
+        result = super().delete(*args, **kwargs)
+        invalidate_autocomplete('subject')
+        return result
 
 
 class TutorProfile(TimeStampedModel, SoftDeleteModel):
@@ -29,6 +44,9 @@ class TutorProfile(TimeStampedModel, SoftDeleteModel):
     achievements = models.TextField(blank=True, help_text='Awards, recognitions or milestones')
     languages = models.CharField(max_length=255, blank=True, help_text='Languages spoken (comma separated)')
     hourly_rate = models.DecimalField(max_digits=8, decimal_places=2, null=True, blank=True, help_text='Default hourly rate in INR')
+    # Cheapest and dearest active pricing option, or the default hourly rate without any (see refresh_price_range)
+    min_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, editable=False)
+    max_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, editable=False)
     intro_video = models.FileField(upload_to='tutor_videos/', blank=True, null=True)
     profile_complete = models.BooleanField(default=False)
     
@@ -57,11 +75,17 @@ class TutorProfile(TimeStampedModel, SoftDeleteModel):
     # Geolocation (for map-based search)
     latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True, help_text='Latitude for map location')
     longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True, help_text='Longitude for map location')
+    geohash = models.CharField(max_length=12, blank=True, db_index=True, editable=False, help_text='Geohash of latitude/longitude for proximity search')
     
     # Availability
     is_available_online = models.BooleanField(default=True)
     is_available_home = models.BooleanField(default=False)
     max_travel_distance = models.IntegerField(default=10, help_text='Maximum travel distance in km for home tutoring')
+    # Bounding box of the travel-distance circle, for matching a student location against coverage areas
+    coverage_min_lat = models.FloatField(null=True, blank=True, editable=False)
+    coverage_max_lat = models.FloatField(null=True, blank=True, editable=False)
+    coverage_min_lon = models.FloatField(null=True, blank=True, editable=False)
+    coverage_max_lon = models.FloatField(null=True, blank=True, editable=False)
     
     # Verification Status
     is_verified = models.BooleanField(default=False)
@@ -92,23 +116,325 @@ class TutorProfile(TimeStampedModel, SoftDeleteModel):
     premium_boost_until = models.DateTimeField(null=True, blank=True, help_text='Premium boost expiration')
     boost_count = models.IntegerField(default=0, help_text='Number of times profile has been boosted')
     
+    # Search ranking tier (denormalized from premium subscriptions, lower ranks first)
+    TIER_PREMIUM = 0
+    TIER_FEATURED = 1
+    TIER_BOOST = 2
+    TIER_STANDARD = 3
+    RANKING_TIER_CHOICES = [
+        (TIER_PREMIUM, 'Premium Package'),
+        (TIER_FEATURED, 'Featured'),
+        (TIER_BOOST, 'Boost'),
+        (TIER_STANDARD, 'Standard'),
+    ]
+    ranking_tier = models.PositiveSmallIntegerField(choices=RANKING_TIER_CHOICES, default=TIER_STANDARD, editable=False)
+    ranking_tier_until = models.DateTimeField(null=True, blank=True, editable=False, help_text='When the current ranking tier lapses')
+    # Weighted sum of the ranking features computed from the tutor's own columns (see tutors.ranking)
+    base_rank_score = models.FloatField(default=0.0, editable=False)
+    
+    # Weekly availability in 15-minute buckets, compiled from availability slots (see tutors.availability)
+    available_mon_am = models.BigIntegerField(default=0, editable=False)
+    available_mon_pm = models.BigIntegerField(default=0, editable=False)
+    available_tue_am = models.BigIntegerField(default=0, editable=False)
+    available_tue_pm = models.BigIntegerField(default=0, editable=False)
+    available_wed_am = models.BigIntegerField(default=0, editable=False)
+    available_wed_pm = models.BigIntegerField(default=0, editable=False)
+    available_thu_am = models.BigIntegerField(default=0, editable=False)
+    available_thu_pm = models.BigIntegerField(default=0, editable=False)
+    available_fri_am = models.BigIntegerField(default=0, editable=False)
+    available_fri_pm = models.BigIntegerField(default=0, editable=False)
+    available_sat_am = models.BigIntegerField(default=0, editable=False)
+    available_sat_pm = models.BigIntegerField(default=0, editable=False)
+    available_sun_am = models.BigIntegerField(default=0, editable=False)
+    available_sun_pm = models.BigIntegerField(default=0, editable=False)
+    
     # Quality Assurance
     quality_score = models.DecimalField(max_digits=5, decimal_places=2, default=0.00, help_text='Overall quality score (0-100)')
     last_quality_audit = models.DateTimeField(null=True, blank=True)
     quality_issues = models.TextField(blank=True, help_text='Identified quality issues')
     intervention_required = models.BooleanField(default=False, help_text='Requires admin intervention')
     
-    # Ratings (calculated fields)
+    # Ratings (calculated fields), over approved reviews that are not deleted
     average_rating = models.DecimalField(max_digits=3, decimal_places=2, default=0.00)
     total_reviews = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0, editable=False)
+    rating_1_count = models.IntegerField(default=0, editable=False)
+    rating_2_count = models.IntegerField(default=0, editable=False)
+    rating_3_count = models.IntegerField(default=0, editable=False)
+    rating_4_count = models.IntegerField(default=0, editable=False)
+    rating_5_count = models.IntegerField(default=0, editable=False)
     
     class Meta:
         verbose_name = 'Tutor Profile'
         verbose_name_plural = 'Tutor Profiles'
+        indexes = [
+            models.Index(fields=['latitude', 'longitude']),
+            models.Index(fields=['coverage_min_lat', 'coverage_max_lat']),
+            models.Index(fields=['ranking_tier', '-average_rating', 'hourly_rate'], name='tutors_ranking_idx'),
+            models.Index(fields=['ranking_tier_until']),
+            models.Index(fields=['min_price', 'max_price']),
+            models.Index(fields=['-base_rank_score', 'id'], name='tutors_rank_score_idx'),
+        ]
     
     def __str__(self):
         return f"Tutor Profile: {self.user.get_full_name() or self.user.username}"
     
+    LOCATION_FIELDS = {'latitude', 'longitude', 'max_travel_distance'}
+    LOCATION_INDEX_FIELDS = {'geohash', 'coverage_min_lat', 'coverage_max_lat', 'coverage_min_lon', 'coverage_max_lon'}
+    RANKING_FIELDS = {'is_featured', 'premium_boost_until'}
+    RANKING_TIER_FIELDS = {'ranking_tier', 'ranking_tier_until'}
+    PRICE_RANGE_FIELDS = {'min_price', 'max_price'}
+    # Fields base_rank_score is computed from
+    BASE_RANK_FIELDS = {'ranking_tier', 'average_rating', 'quality_score', 'min_price'}
+    # Fields that affect AI match scores and recommendation eligibility
+    MATCH_FIELDS = {
+        'teaching_levels', 'is_available_online', 'is_available_home', 'average_rating',
+        'is_verified', 'verification_status', 'years_of_experience',
+    }
+    # Review count per star (see apply_rating_change)
+    RATING_COUNT_FIELDS = {star: f'rating_{star}_count' for star in range(1, 6)}
+    # Fields maintained by F() and single-column UPDATEs, which full saves leave
+    # alone so a stale in-memory value never overwrites a newer stored one
+    UPDATE_ONLY_FIELDS = {
+        'base_rank_score', *RANKING_TIER_FIELDS,
+        'average_rating', 'total_reviews', 'rating_sum', *RATING_COUNT_FIELDS.values(),
+        *(field for fields in AVAILABILITY_FIELDS for field in fields),
+    }
+    # Fields that change autocomplete suggestions and the segments they affect (see tutors.autocomplete)
+    AUTOCOMPLETE_FIELDS = {
+        'city': ('city',),
+        'service_areas': ('area',),
+        'is_verified': ('city', 'area', 'tutor'),
+        'verification_status': ('city', 'area', 'tutor'),
+        'is_deleted': ('city', 'area', 'tutor'),
+    }
+    
+    # Fields in the keyword search index (see tutors.fulltext)
+    SEARCH_TEXT_FIELDS = {
+        'headline', 'bio', 'education', 'experience_summary', 'teaching_style',
+        'city', 'state', 'service_areas',
+    }
+    
+    # Fields the service area rows are built from (see sync_service_areas)
+    SERVICE_AREA_FIELDS = {'service_areas', 'city', 'state'}
+    
+    # Fields whose stored values are remembered, so full saves only refresh what changed
+    TRACKED_FIELDS = BASE_RANK_FIELDS | MATCH_FIELDS | set(AUTOCOMPLETE_FIELDS) | SERVICE_AREA_FIELDS | RANKING_FIELDS
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored city so a move also expires the old city's cached searches
+        instance._loaded_city = instance.__dict__.get('city')
+        # Remember ranking, matching and autocomplete inputs so full saves only refresh what changed
+        instance._loaded_values = {name: instance.__dict__.get(name) for name in cls.TRACKED_FIELDS}
+        return instance
+    
+    def changed_fields(self, fields):
+        """Those of fields whose value differs from the stored one, all of them for tutors not loaded from the database"""
+        loaded = getattr(self, '_loaded_values', None)
+        if loaded is None:
+            return set(fields)
+        return {name for name in fields if name not in loaded or loaded[name] != getattr(self, name)}
+    
+    def save(self, *args, **kwargs):
+        # Keep the geohash and coverage area in sync with coordinates for proximity search
+        self.update_location_index()
+        update_fields = kwargs.get('update_fields')
+        # Keep the denormalized ranking tier in sync with premium flags. Subscription
+        # changes and lapsed tiers are refreshed separately (see refresh_ranking_tier)
+        previous_tier = self.ranking_tier
+        ranking_changed = self.changed_fields(self.RANKING_FIELDS)
+        if update_fields is not None:
+            ranking_changed &= set(update_fields)
+        if self._state.adding or ranking_changed:
+            self.ranking_tier, self.ranking_tier_until = self.compute_ranking_tier()
+        # The default hourly rate is the price range of tutors without pricing options
+        if update_fields is None or 'hourly_rate' in update_fields:
+            self.min_price, self.max_price = self.compute_price_range()
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if self.LOCATION_FIELDS & update_fields:
+                update_fields |= self.LOCATION_INDEX_FIELDS
+            if self.RANKING_FIELDS & update_fields:
+                update_fields |= self.RANKING_TIER_FIELDS
+            if 'hourly_rate' in update_fields:
+                update_fields |= self.PRICE_RANGE_FIELDS
+            kwargs['update_fields'] = update_fields
+            changed = update_fields
+        else:
+            changed = self.changed_fields(self.TRACKED_FIELDS)
+            if not self._state.adding:
+                kwargs['update_fields'] = {
+                    field.name for field in self._meta.concrete_fields if not field.primary_key
+                } - self.UPDATE_ONLY_FIELDS
+                if ranking_changed:
+                    kwargs['update_fields'] |= self.RANKING_TIER_FIELDS
+        super().save(*args, **kwargs)
+        self._loaded_values = {name: getattr(self, name) for name in self.TRACKED_FIELDS}
+        if self.BASE_RANK_FIELDS & changed:
+            self.refresh_base_rank_score()
+        if self.MATCH_FIELDS & changed:
+            self.mark_recommendations_stale()
+        if update_fields is None or self.SEARCH_TEXT_FIELDS & update_fields:
+            self.update_search_index()
+        if self.SERVICE_AREA_FIELDS & changed:
+            self.sync_service_areas()
+        self.invalidate_search_cache()
+        if self.ranking_tier != previous_tier:
+            from .carousel import invalidate_featured_carousel
+            invalidate_featured_carousel()
+        segments = {kind for name in self.AUTOCOMPLETE_FIELDS.keys() & changed for kind in self.AUTOCOMPLETE_FIELDS[name]}
+        if segments:
+            from .autocomplete import invalidate_autocomplete
+            invalidate_autocomplete(*sorted(segments))
+    
+    def subjects_changed(self, previous_subject_ids=()):
+        """Refresh data derived from subjects, called on every change to them (see tutor_subjects_changed)"""
+        self.update_search_index()
+        self.mark_recommendations_stale()
+        self.invalidate_search_cache(previous_subject_ids)
+    
+    def invalidate_search_cache(self, extra_subject_ids=()):
+        """Expire cached searches this tutor could appear in, before or after a change"""
+        from .search_cache import invalidate_search_cache
+        subject_ids = set(self.subjects.values_list('id', flat=True)) | set(extra_subject_ids)
+        invalidate_search_cache({self.city, getattr(self, '_loaded_city', None)}, subject_ids)
+        self._loaded_city = self.city
+    
+    @classmethod
+    def apply_rating_change(cls, user_id, added=None, removed=None):
+        """
+        Add and/or remove one review's rating (1-5) from a tutor's rating
+        aggregates. A single UPDATE adjusts the count, sum and histogram with
+        F() expressions and derives average_rating from the new sum and
+        count, so concurrent reviews cannot lose each other's changes.
+        """
+        count = (added is not None) - (removed is not None)
+        total = (added or 0) - (removed or 0)
+        stars = {added: 1} if added is not None else {}
+        if removed is not None:
+            stars[removed] = stars.get(removed, 0) - 1
+        updates = {
+            cls.RATING_COUNT_FIELDS[star]: F(cls.RATING_COUNT_FIELDS[star]) + delta
+            for star, delta in stars.items() if delta
+        }
+        if not updates:
+            return
+        new_count = F('total_reviews') + count
+        new_sum = F('rating_sum') + total
+        updates.update(
+            total_reviews=new_count,
+            rating_sum=new_sum,
+            average_rating=Case(
+                When(total_reviews__gt=-count, then=Round(
+                    Cast(new_sum, models.FloatField()) / Cast(new_count, models.FloatField()), 2
+                )),
+                default=Value(0.0),
+                output_field=models.DecimalField(max_digits=3, decimal_places=2),
+            ),
+        )
+        tutors = cls.objects.filter(user_id=user_id)
+        previous_rating = tutors.values_list('average_rating', flat=True).first()
+        tutors.update(**updates)
+        from .ranking import refresh_base_rank_scores
+        refresh_base_rank_scores(tutors)
+        
+        # Ratings feed the min_rating filter and ranking, and match scores when the average moves
+        tutor = tutors.first()
+        if tutor is not None:
+            if tutor.average_rating != previous_rating:
+                tutor.mark_recommendations_stale()
+            tutor.invalidate_search_cache()
+    
+    def rating_histogram(self):
+        """Number of counted reviews per star, 5 stars first, as (star, count, percent) rows"""
+        rows = []
+        for star in range(5, 0, -1):
+            count = getattr(self, self.RATING_COUNT_FIELDS[star])
+            percent = round(count * 100 / self.total_reviews) if self.total_reviews else 0
+            rows.append((star, count, percent))
+        return rows
+    
+    def compute_price_range(self):
+        """Get (min_price, max_price) over active pricing options, else the default hourly rate"""
+        if self.pk:
+            prices = self.pricing_options.filter(is_active=True).aggregate(
+                low=models.Min('price_per_hour'),
+                high=models.Max('price_per_hour')
+            )
+            if prices['low'] is not None:
+                return prices['low'], prices['high']
+        return self.hourly_rate, self.hourly_rate
+    
+    def refresh_price_range(self, extra_subject_ids=()):
+        """Recompute and store the price range after pricing options change"""
+        previous = (self.min_price, self.max_price)
+        self.min_price, self.max_price = self.compute_price_range()
+        TutorProfile.objects.filter(pk=self.pk).update(min_price=self.min_price, max_price=self.max_price)
+        # Per-subject prices may have changed even when the range did not
+        self.invalidate_search_cache(extra_subject_ids)
+        if self.min_price != previous[0]:
+            self.refresh_base_rank_score()
+        if (self.min_price, self.max_price) != previous:
+            from .carousel import invalidate_featured_carousel
+            invalidate_featured_carousel()
+    
+    def refresh_availability(self):
+        """Recompile the stored weekly availability from the tutor's availability slots"""
+        from .availability import compile_availability
+        slots = self.user.availability_slots.filter(is_available=True).values_list('day_of_week', 'start_time', 'end_time')
+        words = compile_availability(slots)
+        for field, word in words.items():
+            setattr(self, field, word)
+        TutorProfile.objects.filter(pk=self.pk).update(**words)
+        self.invalidate_search_cache()
+    
+    def refresh_base_rank_score(self):
+        """Recompute the stored base_rank_score from the stored ranking inputs"""
+        from .ranking import refresh_base_rank_scores
+        refresh_base_rank_scores(TutorProfile.objects.filter(pk=self.pk))
+    
+    def mark_recommendations_stale(self):
+        """Have precomputed student recommendations pick up changes to this tutor"""
+        from students.recommendations import mark_recommendations_stale_for_tutor
+        mark_recommendations_stale_for_tutor(self)
+    
+    def sync_service_areas(self):
+        """Bring the normalized service area rows in line with service_areas, city and state"""
+        from .utils import tutor_service_areas
+        desired = set(tutor_service_areas(self.service_areas, self.city, self.state))
+        existing = set(self.service_area_entries.values_list('kind', 'value'))
+        removed = existing - desired
+        if removed:
+            stale = Q()
+            for kind, value in removed:
+                stale |= Q(kind=kind, value=value)
+            self.service_area_entries.filter(stale).delete()
+        TutorServiceArea.objects.bulk_create([
+            TutorServiceArea(tutor=self, kind=kind, value=value)
+            for kind, value in desired - existing
+        ])
+    
+    def update_search_index(self):
+        """Rebuild this tutor's keyword search terms"""
+        from .fulltext import index_tutor
+        index_tutor(self)
+    
+    def update_location_index(self):
+        """Recompute geohash and travel coverage bounding box from coordinates"""
+        from .geo import bounding_box, encode_geohash
+        if self.latitude is None or self.longitude is None:
+            self.geohash = ''
+            self.coverage_min_lat = self.coverage_max_lat = None
+            self.coverage_min_lon = self.coverage_max_lon = None
+            return
+        self.geohash = encode_geohash(self.latitude, self.longitude)
+        (self.coverage_min_lat, self.coverage_max_lat,
+         self.coverage_min_lon, self.coverage_max_lon) = bounding_box(
+            self.latitude, self.longitude, max(self.max_travel_distance or 0, 0)
+        )
+    
     def get_verification_badges(self):
         """Get list of verification badges"""
         badges = []
@@ -147,42 +473,135 @@ class TutorProfile(TimeStampedModel, SoftDeleteModel):
             end_date__gte=timezone.now()
         ).exists()
     
-    def calculate_quality_score(self):
-        """Calculate quality score based on various factors"""
-        score = 0
-        max_score = 100
-        
-        # Profile completeness (20 points)
-        if self.bio and len(self.bio) > 50:
-            score += 10
-        if self.subjects.exists():
-            score += 5
-        if self.profile_complete:
-            score += 5
-        
-        # Verification (30 points)
-        if self.is_verified:
-            score += 10
-        verification_badges = len(self.get_verification_badges())
-        score += min(verification_badges * 5, 20)
-        
-        # Ratings (30 points)
-        if self.average_rating:
-            score += (float(self.average_rating) / 5.0) * 30
-        
-        # Reviews count (10 points)
-        if self.total_reviews >= 10:
-            score += 10
-        elif self.total_reviews >= 5:
-            score += 5
+    def compute_ranking_tier(self, now=None):
+        """
+        Get (tier, until) for search ranking: Premium Package first, then
+        Featured, then Boost. `until` is when the tier lapses, None if it doesn't.
+        """
+        from django.utils import timezone
+        now = now or timezone.now()
         
-        # Experience (10 points)
-        if self.years_of_experience >= 5:
-            score += 10
-        elif self.years_of_experience >= 3:
-            score += 5
+        premium_until = None
+        featured_until = None
+        if self.pk:
+            active_subscriptions = self.premium_subscriptions.filter(
+                subscription_type__in=['premium', 'featured'],
+                is_active=True,
+                end_date__gte=now
+            ).values_list('subscription_type', 'end_date')
+            for subscription_type, end_date in active_subscriptions:
+                if subscription_type == 'premium':
+                    premium_until = max(premium_until or end_date, end_date)
+                else:
+                    featured_until = max(featured_until or end_date, end_date)
         
-        return min(score, max_score)
+        if premium_until:
+            return self.TIER_PREMIUM, premium_until
+        if self.is_featured:
+            return self.TIER_FEATURED, None
+        if featured_until:
+            return self.TIER_FEATURED, featured_until
+        if self.premium_boost_until and now < self.premium_boost_until:
+            return self.TIER_BOOST, self.premium_boost_until
+        return self.TIER_STANDARD, None
+    
+    def refresh_ranking_tier(self, now=None):
+        """Recompute and store the ranking tier without a full save"""
+        previous_tier = self.ranking_tier
+        self.ranking_tier, self.ranking_tier_until = self.compute_ranking_tier(now)
+        TutorProfile.objects.filter(pk=self.pk).update(
+            ranking_tier=self.ranking_tier,
+            ranking_tier_until=self.ranking_tier_until
+        )
+        if self.ranking_tier != previous_tier:
+            from .carousel import invalidate_featured_carousel
+            self.refresh_base_rank_score()
+            self.invalidate_search_cache()
+            invalidate_featured_carousel()
+    
+    def calculate_quality_score(self):
+        """Calculate quality score based on various factors (see tutors.quality)"""
+        from .quality import QUALITY_FIELDS, batch_quality_scores
+        row = {name: getattr(self, name) for name in QUALITY_FIELDS}
+        row['has_subjects'] = self.subjects.exists()
+        return float(batch_quality_scores([row])[0])
+
+
+def tutor_subjects_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Refresh subject-derived tutor data after any add(), remove(), set() or
+    clear() on TutorProfile.subjects or Subject.tutors, including admin and
+    form saves, so callers never have to remember subjects_changed().
+    """
+    if action == 'pre_clear':
+        # Clears do not say what they removed, remember it for post_clear
+        related = instance.tutors if reverse else instance.subjects
+        instance._cleared_pks = set(related.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if action == 'post_clear':
+        pk_set = instance.__dict__.pop('_cleared_pks', set())
+    if reverse:
+        # A subject's tutors changed: pk_set holds tutor ids
+        for tutor in TutorProfile.objects.filter(pk__in=pk_set):
+            tutor.subjects_changed({instance.pk})
+    else:
+        instance.subjects_changed(pk_set if action != 'post_add' else ())
+
+
+m2m_changed.connect(tutor_subjects_changed, sender=TutorProfile.subjects.through)
+
+
+class TutorServiceArea(models.Model):
+    """Normalized pincode, area, city or state a tutor is found by (see TutorProfile.sync_service_areas)"""
+    KIND_CHOICES = [
+        ('pincode', 'Pincode'),
+        ('area', 'Area'),
+        ('city', 'City'),
+        ('state', 'State'),
+    ]
+    # Kinds matched by name prefix in location searches
+    NAME_KINDS = ('area', 'city', 'state')
+    
+    tutor = models.ForeignKey(TutorProfile, on_delete=models.CASCADE, related_name='service_area_entries')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    value = models.CharField(max_length=100, help_text='Lowercased area name or pincode without spaces')
+    
+    class Meta:
+        verbose_name = 'Tutor Service Area'
+        verbose_name_plural = 'Tutor Service Areas'
+        unique_together = ['tutor', 'kind', 'value']
+        indexes = [
+            # Exact pincode and prefix LIKE name matches (see filter_tutors_by_service_area),
+            # on PostgreSQL the prefix matches need the pattern_ops opclass
+            models.Index(
+                fields=['kind', 'value'], name='tutors_servicearea_value_like',
+                opclasses=['varchar_pattern_ops', 'varchar_pattern_ops'],
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.value} ({self.kind}) - {self.tutor_id}"
+
+
+class TutorSearchTerm(models.Model):
+    """Inverted keyword index entry for tutor full-text search (see tutors.fulltext)"""
+    tutor = models.ForeignKey(TutorProfile, on_delete=models.CASCADE, related_name='search_terms')
+    term = models.CharField(max_length=64)
+    weight = models.FloatField(help_text='Sum of field weights of the term in the profile')
+    
+    class Meta:
+        verbose_name = 'Tutor Search Term'
+        verbose_name_plural = 'Tutor Search Terms'
+        unique_together = ['term', 'tutor']
+        indexes = [
+            # Prefix LIKE lookups (see tutors.fulltext) can only use a pattern_ops index on PostgreSQL
+            models.Index(fields=['term'], name='tutors_searchterm_term_like', opclasses=['varchar_pattern_ops']),
+        ]
+    
+    def __str__(self):
+        return f"{self.term} ({self.weight}) - {self.tutor_id}"
 
 
 class TutorDocument(TimeStampedModel):
@@ -248,9 +667,22 @@ class PricingOption(TimeStampedModel):
         verbose_name = 'Pricing Option'
         verbose_name_plural = 'Pricing Options'
         unique_together = ['tutor', 'subject', 'mode', 'level']
+        indexes = [
+            # Per-subject price lookups in search (see tutors.utils.price_condition)
+            models.Index(fields=['subject', 'mode', 'price_per_hour']),
+        ]
     
     def __str__(self):
         return f"{self.tutor.user.username} - {self.subject.name} ({self.get_mode_display()}) - ₹{self.price_per_hour}/hr"
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.tutor.refresh_price_range([self.subject_id])
+    
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        self.tutor.refresh_price_range([self.subject_id])
+        return result
 
 
 class PremiumSubscription(TimeStampedModel):
@@ -276,6 +708,18 @@ class PremiumSubscription(TimeStampedModel):
     
     def __str__(self):
         return f"{self.tutor.user.username} - {self.get_subscription_type_display()}"
+    
+    def save(self, *args, **kwargs):
+        from .carousel import refresh_featured_carousel
+        super().save(*args, **kwargs)
+        self.tutor.refresh_ranking_tier()
+        # A purchase can reorder the home page carousel right away
+        refresh_featured_carousel()
+    
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        self.tutor.refresh_ranking_tier()
+        return result
 
 
 class QualityAudit(TimeStampedModel):
@@ -341,3 +785,56 @@ class QualityCertification(TimeStampedModel):
     
     def __str__(self):
         return f"{self.get_certification_type_display()} - {self.tutor.user.username}"
+
+
+class TutorSimilarity(models.Model):
+    """Precomputed nearest neighbour of a tutor from booking history (see tutors.collaborative)"""
+    tutor = models.ForeignKey(TutorProfile, on_delete=models.CASCADE, related_name='similar_tutors')
+    similar_tutor = models.ForeignKey(TutorProfile, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField(help_text='Cosine similarity of the two tutors\' students')
+    computed_at = models.DateTimeField()
+    
+    class Meta:
+        verbose_name = 'Tutor Similarity'
+        verbose_name_plural = 'Tutor Similarities'
+        ordering = ['tutor', '-score']
+        unique_together = ['tutor', 'similar_tutor']
+    
+    def __str__(self):
+        return f"{self.tutor} ~ {self.similar_tutor} ({self.score:.2f})"
+
+
+class TutorStats(models.Model):
+    """
+    Daily rollup of a tutor's bookings, payments and reviews, kept up to date
+    as those rows are saved (see tutors.stats) and rebuilt from scratch with
+    the rebuild_tutor_stats command.
+    """
+    tutor = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='daily_stats', limit_choices_to={'role': 'tutor'})
+    day = models.DateField()
+    
+    # Bookings, by the day they were made
+    bookings = models.IntegerField(default=0)
+    pending_bookings = models.IntegerField(default=0, help_text='Bookings made this day that are still pending')
+    new_students = models.IntegerField(default=0, help_text='Students whose first booking with the tutor was made this day')
+    
+    # Payments, by the day they were paid (or created, until paid)
+    completed_payments = models.IntegerField(default=0)
+    earnings = models.DecimalField(max_digits=12, decimal_places=2, default=0, help_text='Tutor payout of completed payments')
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0, help_text='Amount of completed payments')
+    commission = models.DecimalField(max_digits=12, decimal_places=2, default=0, help_text='Commission on completed payments')
+    held_earnings = models.DecimalField(max_digits=12, decimal_places=2, default=0, help_text='Tutor payout of payments on hold')
+    processing_earnings = models.DecimalField(max_digits=12, decimal_places=2, default=0, help_text='Tutor payout of payments being processed')
+    
+    # Reviews, by the day they were written
+    reviews = models.IntegerField(default=0)
+    rating_total = models.IntegerField(default=0, help_text='Sum of the ratings of those reviews')
+    
+    class Meta:
+        verbose_name = 'Tutor Stats'
+        verbose_name_plural = 'Tutor Stats'
+        ordering = ['tutor', 'day']
+        unique_together = ['tutor', 'day']
+    
+    def __str__(self):
+        return f"{self.tutor.username} on {self.day}"
@@ -0,0 +1,111 @@
+import base64
+import binascii
+import json
+import math
+from decimal import Decimal
+from django.db.models import Q
+
+
+class KeysetField:
+    """
+    One column of a composite keyset ordering. `type` converts a value read
+    back from a cursor (e.g. int, float or Decimal), so tampered cursors are
+    rejected instead of reaching the database.
+    """
+
+    def __init__(self, name, descending=False, nulls_last=False, type=None):
+        self.name = name
+        self.descending = descending
+        self.nulls_last = nulls_last
+        self.type = type
+
+    def parse(self, value):
+        """A cursor value as this field's type, raising ValueError if it is not one"""
+        if value is None:
+            if not self.nulls_last:
+                raise ValueError(f'{self.name} cannot be null')
+            return None
+        if isinstance(value, (bool, list, dict)):
+            raise ValueError(f'Invalid {self.name}: {value!r}')
+        if self.type is not None:
+            value = self.type(value)
+        if isinstance(value, (float, Decimal)) and not math.isfinite(value):
+            raise ValueError(f'Invalid {self.name}: {value!r}')
+        return value
+
+    def after(self, value):
+        """Q for rows strictly after value in this field's ordering"""
+        if value is None:
+            # Nulls sort last, so nothing comes after a null
+            return Q(pk__in=[])
+        lookup = 'lt' if self.descending else 'gt'
+        condition = Q(**{f'{self.name}__{lookup}': value})
+        if self.nulls_last:
+            condition |= Q(**{f'{self.name}__isnull': True})
+        return condition
+
+    def equal(self, value):
+        """Q for rows with the same value in this field"""
+        if value is None:
+            return Q(**{f'{self.name}__isnull': True})
+        return Q(**{self.name: value})
+
+
+def keyset_filter(fields, values):
+    """
+    Build the Q selecting rows after the given key values, e.g. for
+    (a, b, id): a > x OR (a = x AND b > y) OR (a = x AND b = y AND id > z),
+    with each comparison flipped for descending fields.
+    """
+    condition = Q(pk__in=[])
+    prefix = Q()
+    for field, value in zip(fields, values):
+        condition |= prefix & field.after(value)
+        prefix &= field.equal(value)
+    return condition
+
+
+def encode_cursor(values):
+    """Encode key values as an opaque URL-safe cursor"""
+    payload = [str(value) if isinstance(value, Decimal) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, fields):
+    """
+    Decode a cursor into key values parsed by each field, or None if it is
+    missing or invalid so a bad cursor shows the first page.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, TypeError, binascii.Error, UnicodeDecodeError):
+        return None
+    if not isinstance(values, list) or len(values) != len(fields):
+        return None
+    try:
+        return [field.parse(value) for field, value in zip(fields, values)]
+    except (ValueError, TypeError, ArithmeticError):
+        return None
+
+
+def paginate_keyset(queryset, fields, cursor=None, page_size=20):
+    """
+    Fetch one page of a queryset already ordered by `fields`.
+    Each page is a range scan from the cursor position, so its cost does
+    not grow with page depth and rows do not shift between pages.
+    Returns (items, next_cursor), next_cursor is None on the last page.
+    """
+    values = decode_cursor(cursor, fields)
+    if values is not None:
+        queryset = queryset.filter(keyset_filter(fields, values))
+
+    items = list(queryset[:page_size + 1])
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, field.name) for field in fields])
+    return items, next_cursor
@@ -0,0 +1,99 @@
+from datetime import timedelta
+import numpy as np
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+
+# Tutor columns the quality score is computed from
+QUALITY_FIELDS = (
+    'bio', 'profile_complete', 'is_verified', 'has_academic_verification', 'has_id_verification',
+    'has_police_verification', 'has_background_check', 'average_rating', 'total_reviews',
+    'years_of_experience',
+)
+
+# Scores below this flag the tutor for admin intervention
+INTERVENTION_THRESHOLD = 50
+
+# Scheduled audits leave tutors an admin audited more recently than this alone
+MANUAL_AUDIT_HOLD = timedelta(days=30)
+
+
+def batch_quality_scores(rows):
+    """
+    Quality scores (0-100) for many tutors at once. Each row is a dict of
+    QUALITY_FIELDS plus 'has_subjects'. Returns an array of scores rounded
+    to 2 places, in row order.
+    """
+    def column(name, dtype=np.float64):
+        return np.array([row[name] or 0 for row in rows], dtype=dtype)
+
+    # Profile completeness (20 points)
+    score = np.where(np.array([len(row['bio'] or '') > 50 for row in rows], dtype=bool), 10.0, 0.0)
+    score += np.where(column('has_subjects', bool), 5, 0)
+    score += np.where(column('profile_complete', bool), 5, 0)
+
+    # Verification (30 points)
+    score += np.where(column('is_verified', bool), 10, 0)
+    badges = sum(column(name, np.int64) for name in (
+        'has_academic_verification', 'has_id_verification', 'has_police_verification', 'has_background_check',
+    ))
+    score += np.minimum(badges * 5, 20)
+
+    # Ratings (30 points)
+    score += column('average_rating') / 5.0 * 30
+
+    # Reviews count (10 points)
+    reviews = column('total_reviews', np.int64)
+    score += np.select([reviews >= 10, reviews >= 5], [10, 5], 0)
+
+    # Experience (10 points)
+    experience = column('years_of_experience', np.int64)
+    score += np.select([experience >= 5, experience >= 3], [10, 5], 0)
+
+    return np.round(np.minimum(score, 100), 2)
+
+
+def quality_rows(tutors):
+    """The QUALITY_FIELDS of a TutorProfile queryset plus whether each tutor has subjects, in one query"""
+    from .models import TutorProfile
+
+    has_subjects = Exists(TutorProfile.subjects.through.objects.filter(tutorprofile_id=OuterRef('pk')))
+    return list(tutors.annotate(has_subjects=has_subjects).values('id', 'has_subjects', *QUALITY_FIELDS))
+
+
+def audit_tutors(tutor_ids, now, audit_type='scheduled'):
+    """
+    Recompute and store the quality scores of a chunk of tutors: one query
+    to load them, one bulk update for the profiles, one update flagging low
+    scores and one bulk insert for their QualityAudit rows. Tutors an admin
+    audited within MANUAL_AUDIT_HOLD keep their score, and the flag is only
+    ever raised, never cleared: clearing it is an admin decision.
+    Returns (audited, flagged for intervention).
+    """
+    from .models import QualityAudit, TutorProfile
+    from .ranking import refresh_base_rank_scores
+
+    manual_audits = QualityAudit.objects.filter(
+        tutor=OuterRef('pk'),
+        audited_by__isnull=False,
+        created_at__gte=now - MANUAL_AUDIT_HOLD,
+    )
+    rows = quality_rows(TutorProfile.objects.filter(id__in=tutor_ids).filter(~Exists(manual_audits)))
+    if not rows:
+        return 0, 0
+    scores = batch_quality_scores(rows)
+
+    tutors = []
+    flagged = []
+    audits = []
+    for row, score in zip(rows, scores.tolist()):
+        tutors.append(TutorProfile(id=row['id'], quality_score=score, last_quality_audit=now))
+        if score < INTERVENTION_THRESHOLD:
+            flagged.append(row['id'])
+        audits.append(QualityAudit(tutor_id=row['id'], audit_type=audit_type, quality_score=score))
+    with transaction.atomic():
+        TutorProfile.objects.bulk_update(tutors, ['quality_score', 'last_quality_audit'])
+        TutorProfile.objects.filter(id__in=flagged).update(intervention_required=True)
+        refresh_base_rank_scores(TutorProfile.objects.filter(id__in=[tutor.id for tutor in tutors]))
+        QualityAudit.objects.bulk_create(audits)
+    return len(tutors), len(flagged)
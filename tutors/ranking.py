@@ -0,0 +1,202 @@
+import hashlib
+import logging
+import time
+from contextlib import contextmanager
+from django.conf import settings
+from django.db.models import Case, F, FloatField, Max, Value, When
+from django.db.models.functions import Cast, Coalesce, Greatest, Least, Round
+from .geo import distance_expression
+from .models import TutorProfile
+from .pagination import KeysetField
+from .utils import match_score_expression
+
+logger = logging.getLogger(__name__)
+
+
+# Features the scorer can weight, each scaled to 0-1 with higher meaning better
+RANKING_FEATURES = ('tier', 'match_score', 'text_rank', 'rating', 'quality_score', 'price', 'distance')
+
+# Used when settings.TUTOR_RANKING_VARIANTS is not set. The tier weight is
+# more than three times the sum of the others, so paid tiers stay strictly first.
+DEFAULT_RANKING_VARIANTS = {
+    'control': {
+        'share': 100,
+        'weights': {
+            'tier': 10.0,
+            'match_score': 1.0,
+            'text_rank': 0.8,
+            'rating': 0.6,
+            'quality_score': 0.3,
+            'price': 0.2,
+            'distance': 0.3,
+        },
+    },
+}
+
+# Starting price (INR per hour) at and above which the price feature is 0
+PRICE_SCALE = 5000
+
+# Distance (km) at and beyond which the distance feature is 0
+DISTANCE_SCALE_KM = 25
+
+# Search results are ordered by (rank_score, id), best first
+RANKING_KEYSET = [
+    KeysetField('rank_score', descending=True, type=float),
+    KeysetField('id', type=int),
+]
+
+# Features computed from a tutor's own columns (TutorProfile.BASE_RANK_FIELDS).
+# Their weighted sum under the default weights is stored as base_rank_score.
+BASE_FEATURES = ('tier', 'rating', 'quality_score', 'price')
+
+
+class StageTimer:
+    """Wall-clock milliseconds spent in each ranking stage"""
+
+    def __init__(self):
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+    def server_timing(self):
+        """Stage timings as a Server-Timing header value, shown in browser dev tools"""
+        return ', '.join(f'{name};dur={duration:.1f}' for name, duration in self.stages.items())
+
+    def log(self, variant, tutor_count):
+        logger.info(
+            'tutor ranking variant=%s tutors=%d %s',
+            variant, tutor_count,
+            ' '.join(f'{name}={duration:.1f}ms' for name, duration in self.stages.items()),
+        )
+
+
+def _float_column(name):
+    return Coalesce(Cast(F(name), FloatField()), Value(0.0))
+
+
+def base_feature_expressions():
+    """SQL expressions of the BASE_FEATURES, each scaled to 0-1"""
+    standard = float(TutorProfile.TIER_STANDARD)
+    price_scale = float(PRICE_SCALE)
+    return {
+        'tier': (Value(standard) - _float_column('ranking_tier')) / Value(standard),
+        'rating': _float_column('average_rating') / Value(5.0),
+        'quality_score': _float_column('quality_score') / Value(100.0),
+        # Cheaper starting prices are better, tutors without a price score 0
+        'price': Case(
+            When(min_price__isnull=True, then=Value(0.0)),
+            default=Value(1.0) - Least(Greatest(_float_column('min_price'), Value(0.0)), Value(price_scale)) / Value(price_scale),
+            output_field=FloatField(),
+        ),
+    }
+
+
+def weighted_sum(features, weights):
+    """Weighted sum of feature expressions, features without a weight are ignored"""
+    score = Value(0.0)
+    for name, weight in weights.items():
+        if name in features and weight:
+            score = score + Value(float(weight)) * features[name]
+    # Rounded so the scores survive a round trip through pagination cursors
+    return Cast(Round(score, 6), FloatField())
+
+
+def _base_weights(weights):
+    return {name: float(weights[name]) for name in BASE_FEATURES if weights.get(name)}
+
+
+def refresh_base_rank_scores(tutors):
+    """Store the base_rank_score of every tutor in a TutorProfile queryset with one UPDATE"""
+    return tutors.update(base_rank_score=weighted_sum(base_feature_expressions(), default_ranking_weights()))
+
+
+def rank_tutors(tutors, weights, student_profile=None, location=None):
+    """
+    Score a filtered TutorProfile queryset in the database: annotate each
+    tutor's weighted `rank_score` and order by RANKING_KEYSET, ready for
+    paginate_keyset. With the default weights the base features come from
+    the indexed base_rank_score, so a plain search is an index range scan.
+    Match scores need a student and distance needs a (lat, lon) location,
+    otherwise they are 0.
+    """
+    features = {}
+    if student_profile is not None:
+        features['match_score'] = match_score_expression(student_profile) / Value(100.0)
+
+    if 'text_rank' in tutors.query.annotations:
+        top_rank = tutors.aggregate(top=Max('text_rank'))['top']
+        if top_rank:
+            features['text_rank'] = F('text_rank') / Value(float(top_rank))
+
+    if location is not None:
+        if 'distance' not in tutors.query.annotations:
+            tutors = tutors.annotate(distance=distance_expression(*location))
+        # Closer is better, tutors without coordinates score 0
+        features['distance'] = Coalesce(
+            Greatest(Value(1.0) - F('distance') / Value(float(DISTANCE_SCALE_KM)), Value(0.0)),
+            Value(0.0),
+        )
+
+    weights = {name: weight for name, weight in weights.items() if weight}
+    if _base_weights(weights) == _base_weights(default_ranking_weights()):
+        weights = {name: weight for name, weight in weights.items() if name not in BASE_FEATURES}
+        weights['base'] = 1.0
+        features['base'] = F('base_rank_score')
+    else:
+        features.update(base_feature_expressions())
+
+    if [name for name in weights if name in features] == ['base']:
+        score = F('base_rank_score')
+    else:
+        score = weighted_sum(features, weights)
+    return tutors.annotate(rank_score=score).order_by('-rank_score', 'id')
+
+
+def get_ranking_variants():
+    """The configured {name: {'share': percent, 'weights': {...}}} ranking variants"""
+    return getattr(settings, 'TUTOR_RANKING_VARIANTS', None) or DEFAULT_RANKING_VARIANTS
+
+
+def default_ranking_weights():
+    """Weights of the first (control) variant, for rankings outside a user's request"""
+    return next(iter(get_ranking_variants().values()))['weights']
+
+
+def ranking_bucket(identity):
+    """Deterministic 0-99 bucket for an identity string"""
+    digest = hashlib.md5(f'tutor-ranking:{identity}'.encode()).hexdigest()
+    return int(digest[:8], 16) % 100
+
+
+def assign_ranking_variant(request):
+    """
+    Pick the ranking variant for a request. Signed-in users are bucketed by
+    id so they see the same variant on every device, anonymous visitors by
+    the session they already have. Visitors without a session (e.g. API
+    clients) get the first (control) variant, and no session is ever
+    created just to pick one. Returns (name, weights).
+    """
+    variants = get_ranking_variants()
+    session = getattr(request, 'session', None)
+    if request.user.is_authenticated:
+        identity = f'user:{request.user.pk}'
+    elif session is not None and session.session_key:
+        identity = f'session:{session.session_key}'
+    else:
+        name = next(iter(variants))
+        return name, variants[name]['weights']
+
+    bucket = ranking_bucket(identity)
+    threshold = 0
+    for name, variant in variants.items():
+        threshold += variant.get('share', 0)
+        if bucket < threshold:
+            return name, variant['weights']
+    name = next(iter(variants))
+    return name, variants[name]['weights']
@@ -0,0 +1,224 @@
+import math
+from decimal import Decimal, InvalidOperation
+from .autocomplete import get_autocomplete_index
+from .availability import filter_tutors_by_availability
+from .facets import compute_facets
+from .fulltext import full_text_search
+from .geo import parse_coordinates
+from .ranking import StageTimer, rank_tutors
+from .search_cache import get_cached_search, is_cacheable_search, search_param
+from .utils import (
+    filter_tutors_by_coverage, filter_tutors_by_proximity, filter_tutors_by_service_area, nearest_tutors,
+    price_condition,
+)
+
+
+# Upper bound for the "nearest K tutors" mode
+MAX_NEAREST = 50
+
+# Results per search page
+SEARCH_PAGE_SIZE = 20
+
+
+def search_summary(tutors, params, facets=True):
+    """
+    The parts of a search result besides the ranked tutors: how many tutors
+    match the filters and the facet counts, for tutors with the
+    apply_base_filters() of the search applied. Independent of who is
+    searching, so it can be cached per filter set.
+    """
+    return {
+        'count': apply_facet_filters(tutors, params).count(),
+        'facets': compute_facets(tutors, params) if facets else None,
+    }
+
+
+def get_search_location(params):
+    """The searcher's (lat, lon) from the params, or None when missing or invalid"""
+    return parse_coordinates(params.get('lat'), params.get('lon'))
+
+
+def get_max_distance(params):
+    """The home tutoring search radius in km (default 10), or None unless finite and positive"""
+    try:
+        max_distance = float(params.get('max_distance', 10))
+    except (ValueError, TypeError):
+        return None
+    if not math.isfinite(max_distance) or max_distance <= 0:
+        return None
+    return max_distance
+
+
+def ranked_search(tutors, params, weights, student_profile=None, facets=True):
+    """
+    Run a search through the ranking pipeline: filter the tutors and score
+    them for this user in the database. Returns (tutors, summary, timer)
+    with tutors ordered by RANKING_KEYSET for paginate_keyset, and the
+    search_summary() cached per filter set when the search allows it;
+    facets are always computed for cached searches.
+    """
+    timer = StageTimer()
+    tutors = apply_base_filters(tutors, params)
+    with timer.stage('summary'):
+        if is_cacheable_search(params):
+            summary = get_cached_search(params, lambda: search_summary(tutors, params))
+        else:
+            summary = search_summary(tutors, params, facets)
+    tutors = apply_facet_filters(tutors, params)
+    with timer.stage('scoring'):
+        tutors = rank_tutors(tutors, weights, student_profile, get_search_location(params))
+    return tutors, summary, timer
+
+
+def apply_search_filters(tutors, params):
+    """
+    Apply tutor search filters from request GET/query params.
+    Shared by the search page and the REST API so both match the same tutors.
+    """
+    return apply_facet_filters(apply_base_filters(tutors, params), params)
+
+
+def apply_base_filters(tutors, params):
+    """The search filters without a facet: featured, keywords, service area and availability"""
+    # Read the way search cache keys store them (see search_param)
+    location = search_param(params, 'location')
+    available_day = search_param(params, 'available_day')
+    available_time = search_param(params, 'available_time')
+    featured_only = search_param(params, 'featured') in ('on', '1', 'true')
+    query = search_param(params, 'q')
+
+    # Premium boost: Show featured tutors first
+    if featured_only:
+        tutors = tutors.filter(is_featured=True)
+
+    # Keyword search over profile text and subject names
+    if query:
+        tutors = full_text_search(tutors, query)
+
+    if location:
+        tutors = filter_tutors_by_service_area(tutors, location)
+
+    # Availability filter, bitwise matches on the stored availability words
+    if available_day or available_time:
+        tutors = filter_tutors_by_availability(tutors, available_day, available_time)
+
+    return tutors
+
+
+def apply_facet_filters(tutors, params, exclude=()):
+    """
+    The search filters behind the facets (see tutors.facets.FACET_PARAMS),
+    skipping those of the params named in exclude.
+    """
+    def param(name):
+        return None if name in exclude else search_param(params, name)
+
+    subject = param('subject')
+    city = param('city')
+    mode = param('mode')
+    min_price = param('min_price')
+    max_price = param('max_price')
+    min_rating = param('min_rating')
+    class_level = param('class_level')
+
+    if subject:
+        tutors = tutors.filter(subjects__id=subject)
+    if city:
+        tutors = tutors.filter(city__icontains=city)
+    if mode == 'online':
+        tutors = tutors.filter(is_available_online=True)
+    elif mode == 'home':
+        tutors = tutors.filter(is_available_home=True)
+        # For home tutoring, filter by proximity if a valid location and distance are provided
+        location = get_search_location(params)
+        max_distance = get_max_distance(params)
+        if location and max_distance:
+            user_lat, user_lon = location
+            tutors = filter_tutors_by_proximity(tutors, user_lat, user_lon, max_distance)
+            # Only tutors whose travel radius reaches the student
+            tutors = filter_tutors_by_coverage(tutors, user_lat, user_lon)
+
+    # Price filters, on the subject's own prices when searching by subject
+    price_bounds = []
+    for value in (min_price, max_price):
+        try:
+            price_bounds.append(Decimal(value) if value else None)
+        except (ValueError, TypeError, InvalidOperation):
+            price_bounds.append(None)
+    if price_bounds != [None, None]:
+        tutors = tutors.filter(price_condition(*price_bounds, subject=subject, mode=mode))
+
+    # Rating filter
+    if min_rating:
+        try:
+            min_rating_decimal = Decimal(min_rating)
+            tutors = tutors.filter(average_rating__gte=min_rating_decimal)
+        except (ValueError, TypeError, InvalidOperation):
+            pass
+
+    # Class level filter
+    if class_level:
+        if class_level == 'all':
+            pass  # Show all
+        else:
+            tutors = tutors.filter(teaching_levels=class_level)
+
+    return tutors
+
+
+def get_nearest_params(params):
+    """
+    Get (lat, lon, k) for the "nearest K tutors" mode, or None if not requested.
+    Requires a valid location and a positive `nearest` count, capped at MAX_NEAREST.
+    """
+    try:
+        k = int(params.get('nearest') or 0)
+    except (ValueError, TypeError):
+        return None
+    location = get_search_location(params)
+    if k <= 0 or location is None:
+        return None
+    return (*location, min(k, MAX_NEAREST))
+
+
+def apply_nearest(tutors, params):
+    """
+    Limit tutors to the K nearest to the given location, ordered by distance.
+    Returns (tutors, applied) so callers know to keep the distance ordering.
+    """
+    nearest = get_nearest_params(params)
+    if not nearest:
+        return tutors, False
+    user_lat, user_lon, k = nearest
+    return nearest_tutors(tutors, user_lat, user_lon, k), True
+
+
+def fuzzy_correct_params(params):
+    """
+    Typo-corrected values for the q, city and location params, matched
+    against subject, city and area names in memory. Returns only the
+    params that changed, e.g. {'q': 'mathematics'} for 'mathmatics'.
+    """
+    index = get_autocomplete_index()
+    corrections = {}
+
+    query = params.get('q')
+    if query:
+        words = query.split()
+        corrected = [index.correct_word(word) or word for word in words]
+        if corrected != words:
+            corrections['q'] = ' '.join(corrected)
+
+    city = (params.get('city') or '').strip()
+    if city:
+        match = index.resolve('city', city)
+        if match and city.lower() not in match[0].lower():
+            corrections['city'] = match[0]
+
+    location = (params.get('location') or '').strip()
+    if location and not location.replace(' ', '').isdigit():
+        match = index.resolve('city', location) or index.resolve('area', location)
+        if match and location.lower() not in match[0].lower():
+            corrections['location'] = match[0]
+
+    return corrections
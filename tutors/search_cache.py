@@ -0,0 +1,119 @@
+import hashlib
+import json
+from django.core.cache import cache
+
+
+# Seconds a cached search summary is kept
+SEARCH_CACHE_TIMEOUT = 300
+
+# Bumped whenever the layout of cached results changes, so old entries are ignored
+SEARCH_CACHE_FORMAT = 5
+
+# Request params that change which tutors match or how they rank
+SEARCH_FILTER_PARAMS = (
+    'q', 'subject', 'city', 'location', 'mode', 'min_price', 'max_price',
+    'min_rating', 'class_level', 'featured', 'available_day', 'available_time',
+)
+
+# Filter params matched case-insensitively, the rest are ids, numbers and choices
+CASE_INSENSITIVE_PARAMS = ('q', 'city', 'location', 'mode', 'class_level', 'featured', 'available_day', 'available_time')
+
+_VERSION_PREFIX = 'tutors:search:version'
+_ALL_VERSION_KEY = f'{_VERSION_PREFIX}:all'
+
+
+def _city_version_key(city):
+    return f'{_VERSION_PREFIX}:city:{"_".join(city.lower().split())}'
+
+
+def _subject_version_key(subject_id):
+    return f'{_VERSION_PREFIX}:subject:{subject_id}'
+
+
+def is_cacheable_search(params):
+    """Searches around a user's coordinates are too specific to be worth caching"""
+    return not (params.get('lat') or params.get('lon') or params.get('nearest'))
+
+
+def search_param(params, name):
+    """
+    A filter param with single spaces, lowercased when it is matched
+    case-insensitively. Searches filter on exactly these values, so two
+    searches with the same cache key always match the same tutors.
+    """
+    value = ' '.join((params.get(name) or '').split())
+    return value.lower() if name in CASE_INSENSITIVE_PARAMS else value
+
+
+def normalize_search_filters(params):
+    """Get the filter params as a canonical tuple, ignoring blanks, case and spacing"""
+    filters = []
+    for name in SEARCH_FILTER_PARAMS:
+        value = search_param(params, name)
+        if value:
+            filters.append((name, value))
+    return tuple(filters)
+
+
+def search_version_keys(params):
+    """
+    Version keys a search depends on: its subject and the cities its city
+    filter matches, or the global version for searches scoped by neither.
+    Cities are matched against the in-memory autocomplete index, so a cache
+    hit does not query the database.
+    """
+    from .autocomplete import get_autocomplete_index
+
+    keys = []
+    subject = search_param(params, 'subject')
+    if subject:
+        keys.append(_subject_version_key(subject))
+    city = search_param(params, 'city')
+    if city:
+        cities = get_autocomplete_index().labels_containing('city', city)
+        keys.extend(sorted({_city_version_key(name) for name in cities}))
+    return keys or [_ALL_VERSION_KEY]
+
+
+def search_cache_key(params):
+    """Cache key for a search, changing whenever a version it depends on is bumped"""
+    version_keys = search_version_keys(params)
+    versions = cache.get_many(version_keys)
+    payload = json.dumps([
+        normalize_search_filters(params),
+        [[key, versions.get(key, 0)] for key in version_keys],
+    ])
+    return f'tutors:search:{SEARCH_CACHE_FORMAT}:{hashlib.md5(payload.encode()).hexdigest()}'
+
+
+def get_cached_search(params, build):
+    """
+    Get the cached result for a search, calling build() to compute and
+    store it on a miss.
+    """
+    key = search_cache_key(params)
+    result = cache.get(key)
+    if result is None:
+        result = build()
+        cache.set(key, result, SEARCH_CACHE_TIMEOUT)
+    return result
+
+
+def _bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def invalidate_search_cache(cities=(), subject_ids=()):
+    """
+    Expire cached searches a tutor change may affect: unscoped searches and
+    searches scoped to any of the given cities or subjects.
+    """
+    _bump(_ALL_VERSION_KEY)
+    for city in set(cities):
+        if city:
+            _bump(_city_version_key(city))
+    for subject_id in set(subject_ids):
+        _bump(_subject_version_key(subject_id))
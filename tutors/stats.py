@@ -0,0 +1,249 @@
+from collections import Counter, defaultdict
+from decimal import Decimal
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Min, Q, Sum
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+from core.models import ContributionMixin
+
+
+# Rollup columns that are counts, the rest are money
+COUNT_FIELDS = ('bookings', 'pending_bookings', 'new_students', 'completed_payments', 'reviews', 'rating_total')
+
+MONEY_FIELDS = ('earnings', 'revenue', 'commission', 'held_earnings', 'processing_earnings')
+
+STATS_FIELDS = COUNT_FIELDS + MONEY_FIELDS
+
+_CENT = Decimal('0.01')
+
+
+def money(value):
+    """Amount as a 2-place Decimal, the way the rollup stores it"""
+    return Decimal(str(value or 0)).quantize(_CENT)
+
+
+def stats_day(moment):
+    """The rollup day of a timestamp"""
+    return timezone.localdate(moment) if timezone.is_aware(moment) else moment.date()
+
+
+def record_stats(tutor_id, day, **deltas):
+    """
+    Add deltas to a tutor's rollup row for a day, creating the row when it
+    does not exist. Updates are F() expressions, so concurrent requests
+    never overwrite each other's counts.
+    """
+    from .models import TutorStats
+
+    deltas = {name: value for name, value in deltas.items() if value}
+    if not deltas:
+        return
+    updates = {name: F(name) + value for name, value in deltas.items()}
+    rows = TutorStats.objects.filter(tutor_id=tutor_id, day=day)
+    if rows.update(**updates):
+        return
+    try:
+        with transaction.atomic():
+            TutorStats.objects.create(tutor_id=tutor_id, day=day, **deltas)
+    except IntegrityError:
+        # Another request created the row first
+        rows.update(**updates)
+
+
+def apply_stats_change(old, new):
+    """
+    Move a row's contribution to the rollup from `old` to `new`. Both are
+    (tutor_id, day, {column: value}) or None, see stats_contribution().
+    """
+    changes = defaultdict(lambda: defaultdict(int))
+    if old is not None:
+        tutor_id, day, values = old
+        for name, value in values.items():
+            changes[tutor_id, day][name] -= value
+    if new is not None:
+        tutor_id, day, values = new
+        for name, value in values.items():
+            changes[tutor_id, day][name] += value
+    for (tutor_id, day), deltas in changes.items():
+        record_stats(tutor_id, day, **deltas)
+
+
+class TutorStatsMixin(ContributionMixin):
+    """
+    Keeps TutorStats in step with a model. Subclasses implement
+    stats_contribution(), returning (tutor_id, day, {column: value}) for the
+    row's current field values or None, see ContributionMixin. Queryset
+    update()/delete() bypass this; run rebuild_tutor_stats after bulk changes.
+    """
+    contributions = (('stats_contribution', 'update_tutor_stats'),)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if not callable(getattr(cls, 'stats_contribution', None)):
+            raise TypeError(f'{cls.__name__} must define stats_contribution()')
+
+    def update_tutor_stats(self, old, new):
+        apply_stats_change(old, new)
+
+
+def booking_stats(booking):
+    return booking.tutor_id, stats_day(booking.created_at), {
+        'bookings': 1,
+        'pending_bookings': 1 if booking.status == 'pending' else 0,
+    }
+
+
+def payment_stats(payment):
+    day = stats_day(payment.paid_at or payment.created_at)
+    if payment.status == 'completed':
+        return payment.tutor_id, day, {
+            'completed_payments': 1,
+            'earnings': money(payment.tutor_payout),
+            'revenue': money(payment.amount),
+            'commission': money(payment.commission_amount),
+        }
+    if payment.status == 'on_hold':
+        return payment.tutor_id, day, {'held_earnings': money(payment.tutor_payout)}
+    if payment.status == 'processing':
+        return payment.tutor_id, day, {'processing_earnings': money(payment.tutor_payout)}
+    return None
+
+
+def review_stats(review):
+    return review.tutor_id, stats_day(review.created_at), {
+        'reviews': 1,
+        'rating_total': review.rating,
+    }
+
+
+def record_new_student(booking):
+    """Count a booking's student as new to the tutor when it is their first booking together"""
+    from bookings.models import Booking
+
+    earlier = Booking.objects.filter(
+        tutor_id=booking.tutor_id,
+        student_id=booking.student_id,
+    ).exclude(pk=booking.pk).filter(created_at__lte=booking.created_at)
+    if not earlier.exists():
+        record_stats(booking.tutor_id, stats_day(booking.created_at), new_students=1)
+
+
+def record_deleted_booking_student(booking):
+    """
+    Once a booking is deleted, move its student's new-student count to
+    their next booking with the tutor, or drop it when none is left. Does
+    nothing when the student had booked the tutor before.
+    """
+    from bookings.models import Booking
+
+    bookings = Booking.objects.filter(tutor_id=booking.tutor_id, student_id=booking.student_id)
+    if bookings.filter(created_at__lt=booking.created_at).exists():
+        return
+    record_stats(booking.tutor_id, stats_day(booking.created_at), new_students=-1)
+    following = bookings.order_by('created_at').values_list('created_at', flat=True).first()
+    if following is not None:
+        record_stats(booking.tutor_id, stats_day(following), new_students=1)
+
+
+def record_left_pending(rows):
+    """
+    Take bookings moved out of pending by a queryset update() off the
+    pending counts. Rows are their (tutor_id, created_at) from before the update.
+    """
+    left = Counter((tutor_id, stats_day(created_at)) for tutor_id, created_at in rows)
+    for (tutor_id, day), count in left.items():
+        record_stats(tutor_id, day, pending_bookings=-count)
+
+
+def compute_tutor_stats(tutor_ids=None):
+    """
+    Rollup rows computed from scratch with a few grouped queries.
+    Returns {(tutor_id, day): {column: value}}.
+    """
+    from bookings.models import Booking
+    from payments.models import Payment
+    from reviews.models import Review
+
+    def scoped(queryset):
+        return queryset if tutor_ids is None else queryset.filter(tutor_id__in=tutor_ids)
+
+    rows = defaultdict(dict)
+
+    bookings = (
+        scoped(Booking.objects.all())
+        .annotate(day=TruncDate('created_at'))
+        .values('tutor_id', 'day')
+        .annotate(bookings=Count('id'), pending_bookings=Count('id', filter=Q(status='pending')))
+    )
+    for row in bookings:
+        rows[row['tutor_id'], row['day']].update(bookings=row['bookings'], pending_bookings=row['pending_bookings'])
+
+    first_bookings = scoped(Booking.objects.all()).values('tutor_id', 'student_id').annotate(first=Min('created_at'))
+    for row in first_bookings:
+        key = row['tutor_id'], stats_day(row['first'])
+        rows[key]['new_students'] = rows[key].get('new_students', 0) + 1
+
+    def payout(status):
+        return Sum('tutor_payout', filter=Q(status=status))
+
+    payments = (
+        scoped(Payment.objects.filter(status__in=['completed', 'on_hold', 'processing']))
+        .annotate(day=TruncDate(Coalesce('paid_at', 'created_at')))
+        .values('tutor_id', 'day')
+        .annotate(
+            completed_payments=Count('id', filter=Q(status='completed')),
+            earnings=payout('completed'),
+            revenue=Sum('amount', filter=Q(status='completed')),
+            commission=Sum('commission_amount', filter=Q(status='completed')),
+            held_earnings=payout('on_hold'),
+            processing_earnings=payout('processing'),
+        )
+    )
+    for row in payments:
+        rows[row['tutor_id'], row['day']].update(
+            completed_payments=row['completed_payments'],
+            **{name: money(row[name]) for name in MONEY_FIELDS},
+        )
+
+    reviews = (
+        scoped(Review.objects.all())
+        .annotate(day=TruncDate('created_at'))
+        .values('tutor_id', 'day')
+        .annotate(reviews=Count('id'), rating_total=Sum('rating'))
+    )
+    for row in reviews:
+        rows[row['tutor_id'], row['day']].update(reviews=row['reviews'], rating_total=row['rating_total'])
+
+    return rows
+
+
+def rebuild_tutor_stats(tutor_ids=None, batch_size=1000):
+    """Replace the rollup rows of some or all tutors with freshly computed ones. Returns the row count."""
+    from .models import TutorStats
+
+    stats = [
+        TutorStats(tutor_id=tutor_id, day=day, **values)
+        for (tutor_id, day), values in sorted(compute_tutor_stats(tutor_ids).items())
+    ]
+    existing = TutorStats.objects.all()
+    if tutor_ids is not None:
+        existing = existing.filter(tutor_id__in=tutor_ids)
+    with transaction.atomic():
+        existing.delete()
+        TutorStats.objects.bulk_create(stats, batch_size=batch_size)
+    return len(stats)
+
+
+def stats_totals(queryset):
+    """All-time sums of every rollup column over TutorStats rows"""
+    totals = queryset.aggregate(**{name: Sum(name) for name in STATS_FIELDS})
+    for name in COUNT_FIELDS:
+        totals[name] = totals[name] or 0
+    for name in MONEY_FIELDS:
+        totals[name] = totals[name] or Decimal('0.00')
+    return totals
+
+
+def average_rating(totals):
+    """Mean rating from summed rollup columns, 0 without reviews"""
+    return totals['rating_total'] / totals['reviews'] if totals['reviews'] else 0
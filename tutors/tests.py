@@ -1,3 +1,387 @@
-from django.test import TestCase
+import itertools
+from datetime import date, time, timedelta
+from decimal import Decimal
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from bookings.models import Booking
+from payments.models import Payment
+from reviews.models import Review
+from students.models import StudentProfile
+from .facets import compute_facets
+from .geo import parse_coordinates
+from .models import QualityAudit, Subject, TutorProfile, TutorStats
+from .pagination import decode_cursor, encode_cursor
+from .quality import MANUAL_AUDIT_HOLD, audit_tutors
+from .ranking import RANKING_KEYSET
+from .search import (
+    MAX_NEAREST, apply_base_filters, apply_search_filters, get_nearest_params, get_search_location,
+)
+from .stats import STATS_FIELDS, rebuild_tutor_stats, stats_totals
+from .utils import batch_match_scores, calculate_match_score, filter_tutors_by_service_area, match_score_expression
 
-# Create your tests here.
+
+User = get_user_model()
+
+
+class BatchMatchScoreTests(TestCase):
+    """batch_match_scores must agree with calculate_match_score for every tutor"""
+
+    @classmethod
+    def setUpTestData(cls):
+        # More than 64 subjects so tutor bitsets span several words
+        cls.subjects = [Subject.objects.create(name=f'Subject {index}') for index in range(70)]
+
+        levels = ['all', 'primary', 'secondary', 'graduate']
+        ratings = [Decimal('0.00'), Decimal('3.70'), Decimal('4.95'), Decimal('5.00')]
+        combinations = itertools.product(levels, ratings, [True, False], [0, 3, 8])
+        cls.tutors = []
+        for index, (level, rating, verified, experience) in enumerate(combinations):
+            user = User.objects.create_user(username=f'tutor{index}', password=None, role='tutor')
+            tutor = TutorProfile.objects.create(
+                user=user,
+                bio='Bio',
+                city='Pune',
+                state='Maharashtra',
+                pincode='411001',
+                teaching_levels=level,
+                average_rating=rating,
+                is_verified=verified,
+                years_of_experience=experience,
+                is_available_online=index % 3 != 0,
+                is_available_home=index % 2 == 0,
+            )
+            tutor.subjects.set(cls.subjects[index % 7::(index % 5) + 11])
+            cls.tutors.append(tutor)
+
+    def make_student(self, name, grade_level='', preferred_mode='both', subjects=()):
+        user = User.objects.create_user(username=name, password=None, role='student')
+        student = StudentProfile.objects.create(user=user, grade_level=grade_level, preferred_mode=preferred_mode)
+        student.preferred_subjects.set(subjects)
+        return student
+
+    def assert_scores_match(self, student):
+        tutors = TutorProfile.objects.all()
+        scores = batch_match_scores(tutors, student)
+        self.assertEqual(len(scores), len(self.tutors))
+        for tutor in tutors:
+            self.assertAlmostEqual(scores[tutor.id], calculate_match_score(tutor, student), places=9)
+
+        annotated = tutors.annotate(match_score=match_score_expression(student))
+        for tutor in annotated:
+            self.assertAlmostEqual(scores[tutor.id], tutor.match_score, places=6)
+
+    def test_no_preferences(self):
+        self.assert_scores_match(self.make_student('empty'))
+
+    def test_preference_combinations(self):
+        subject_sets = [self.subjects[:1], self.subjects[::9], self.subjects[60:70], self.subjects]
+        grades = ['', 'primary', 'graduate']
+        modes = ['online', 'home', 'both']
+        for index, (subjects, grade, mode) in enumerate(itertools.product(subject_sets, grades, modes)):
+            with self.subTest(subjects=len(subjects), grade=grade, mode=mode):
+                self.assert_scores_match(self.make_student(f'student{index}', grade, mode, subjects))
+
+    def test_query_count(self):
+        student = self.make_student('counted', 'primary', 'online', self.subjects[:20])
+        tutors = list(TutorProfile.objects.all())
+        # Preferred subjects and the tutor/subject pairs, regardless of tutor count
+        with self.assertNumQueries(2):
+            batch_match_scores(tutors, student)
+
+    def test_empty(self):
+        self.assertEqual(batch_match_scores([], self.make_student('nobody')), {})
+
+
+class CursorTests(SimpleTestCase):
+    """Tampered cursors must fall back to the first page instead of reaching the database"""
+
+    def test_round_trip(self):
+        self.assertEqual(decode_cursor(encode_cursor([10.25, 7]), RANKING_KEYSET), [10.25, 7])
+
+    def test_invalid_values(self):
+        for values in (['x', 'x'], [None, 3], ['NaN', 3], [[1], 3], [1.5, {}], [True, 3], [1.5]):
+            with self.subTest(values=values):
+                self.assertIsNone(decode_cursor(encode_cursor(values), RANKING_KEYSET))
+        self.assertIsNone(decode_cursor('not base64!', RANKING_KEYSET))
+
+
+class ServiceAreaTests(TestCase):
+    """Location searches match through the service area table, which saves keep in step"""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(username='tutor', password=None, role='tutor')
+        cls.tutor = TutorProfile.objects.create(
+            user=user,
+            bio='Bio',
+            city='Kolkata',
+            state='West Bengal',
+            pincode='700001',
+            service_areas='Salt Lake, 700 091',
+        )
+
+    def matches(self, location):
+        return filter_tutors_by_service_area(TutorProfile.objects.all(), location).exists()
+
+    def test_locations(self):
+        for location in ['kolkata', 'KOL', 'west bengal', 'Bengal', 'salt', '700001', '700091']:
+            with self.subTest(location=location):
+                self.assertTrue(self.matches(location))
+        for location in ['lake', 'olkata', '7000', 'Mumbai']:
+            with self.subTest(location=location):
+                self.assertFalse(self.matches(location))
+
+    def test_move(self):
+        self.tutor.city = 'Howrah'
+        self.tutor.save()
+        self.assertTrue(self.matches('howrah'))
+        self.assertFalse(self.matches('kolkata'))
+        self.assertTrue(self.matches('bengal'))
+
+
+class RatingAggregateTests(TestCase):
+    """Review saves and deletes move the tutor's rating aggregates, which full tutor saves leave alone"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tutor_user = User.objects.create_user(username='tutor', password=None, role='tutor')
+        cls.student = User.objects.create_user(username='student', password=None, role='student')
+        cls.tutor = TutorProfile.objects.create(
+            user=cls.tutor_user, bio='Bio', city='Pune', state='Maharashtra', pincode='411001',
+        )
+        cls.booking = Booking.objects.create(
+            student=cls.student,
+            tutor=cls.tutor_user,
+            mode='online',
+            subject=Subject.objects.create(name='Maths'),
+            lesson_date=date(2026, 1, 5),
+            lesson_time=time(10),
+            price_per_hour=Decimal('500.00'),
+            total_amount=Decimal('500.00'),
+        )
+
+    def aggregates(self):
+        return TutorProfile.objects.values('total_reviews', 'rating_sum', 'rating_4_count', 'average_rating').get(
+            pk=self.tutor.pk,
+        )
+
+    def test_review_lifecycle(self):
+        review = Review.objects.create(booking=self.booking, student=self.student, tutor=self.tutor_user, rating=4)
+        self.assertEqual(self.aggregates()['total_reviews'], 0)
+
+        review.is_approved = True
+        review.save()
+        self.assertEqual(self.aggregates(), {
+            'total_reviews': 1, 'rating_sum': 4, 'rating_4_count': 1, 'average_rating': Decimal('4.00'),
+        })
+
+        # Reloaded with deferred fields, the stored rating is read back
+        review = Review.objects.only('id').get(pk=review.pk)
+        review.rating = 2
+        review.save()
+        self.assertEqual(self.aggregates(), {
+            'total_reviews': 1, 'rating_sum': 2, 'rating_4_count': 0, 'average_rating': Decimal('2.00'),
+        })
+
+        Review.objects.get(pk=review.pk).delete()
+        self.assertEqual(self.aggregates()['total_reviews'], 0)
+
+    def test_stale_tutor_save(self):
+        stale = TutorProfile.objects.get(pk=self.tutor.pk)
+        Review.objects.create(
+            booking=self.booking, student=self.student, tutor=self.tutor_user, rating=4, is_approved=True,
+        )
+        stale.bio = 'New bio'
+        stale.save()
+        self.assertEqual(self.aggregates()['total_reviews'], 1)
+        self.assertEqual(TutorProfile.objects.get(pk=self.tutor.pk).bio, 'New bio')
+
+
+class TutorStatsTests(TestCase):
+    """The incrementally maintained TutorStats rollup must equal one rebuilt from scratch"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tutor_user = User.objects.create_user(username='tutor', password=None, role='tutor')
+        cls.students = [
+            User.objects.create_user(username=f'student{index}', password=None, role='student') for index in range(2)
+        ]
+        cls.subject = Subject.objects.create(name='Maths')
+
+    def book(self, student):
+        return Booking.objects.create(
+            student=student,
+            tutor=self.tutor_user,
+            mode='online',
+            subject=self.subject,
+            lesson_date=date(2026, 1, 5),
+            lesson_time=time(10),
+            price_per_hour=Decimal('500.00'),
+            total_amount=Decimal('500.00'),
+        )
+
+    def rollup(self):
+        rows = TutorStats.objects.filter(tutor=self.tutor_user).values('day', *STATS_FIELDS)
+        return {row.pop('day'): row for row in rows if any(row.values())}
+
+    def assertRollupMatchesRebuild(self):
+        incremental = self.rollup()
+        rebuild_tutor_stats([self.tutor_user.pk])
+        self.assertEqual(incremental, self.rollup())
+
+    def test_counters(self):
+        first = self.book(self.students[0])
+        self.book(self.students[0])
+        other = self.book(self.students[1])
+        totals = stats_totals(TutorStats.objects.filter(tutor=self.tutor_user))
+        self.assertEqual((totals['bookings'], totals['pending_bookings'], totals['new_students']), (3, 3, 2))
+
+        first.status = 'accepted'
+        first.save()
+        payment = Payment.objects.create(
+            booking=first,
+            student=self.students[0],
+            tutor=self.tutor_user,
+            amount=Decimal('500.00'),
+            commission_amount=Decimal('75.00'),
+            tutor_payout=Decimal('425.00'),
+            status='on_hold',
+        )
+        payment.status = 'completed'
+        payment.save()
+        Review.objects.create(booking=first, student=self.students[0], tutor=self.tutor_user, rating=5)
+        other.delete()
+
+        totals = stats_totals(TutorStats.objects.filter(tutor=self.tutor_user))
+        self.assertEqual((totals['bookings'], totals['pending_bookings']), (2, 1))
+        self.assertEqual((totals['completed_payments'], totals['earnings'], totals['held_earnings']), (1, Decimal('425.00'), 0))
+        self.assertEqual((totals['reviews'], totals['rating_total']), (1, 5))
+        self.assertRollupMatchesRebuild()
+
+
+class QualityAuditTests(TestCase):
+    """Scheduled audits must not undo admin audits or resolved interventions"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='admin', password=None, role='global_admin')
+        user = User.objects.create_user(username='tutor', password=None, role='tutor')
+        # A bare profile scores well below the intervention threshold
+        cls.tutor = TutorProfile.objects.create(user=user, city='Pune', state='Maharashtra', pincode='411001')
+
+    def audit(self, now):
+        return audit_tutors([self.tutor.pk], now)
+
+    def test_flag_is_only_raised(self):
+        now = timezone.now()
+        self.assertEqual(self.audit(now), (1, 1))
+        self.assertTrue(TutorProfile.objects.get(pk=self.tutor.pk).intervention_required)
+
+        TutorProfile.objects.filter(pk=self.tutor.pk).update(intervention_required=False)
+        QualityAudit.objects.create(tutor=self.tutor, audit_type='manual', quality_score=80, audited_by=self.admin)
+        TutorProfile.objects.filter(pk=self.tutor.pk).update(quality_score=80)
+        self.assertEqual(self.audit(now), (0, 0))
+        tutor = TutorProfile.objects.get(pk=self.tutor.pk)
+        self.assertEqual((tutor.quality_score, tutor.intervention_required), (80, False))
+
+        # Once the admin audit is older than the hold, scheduled audits score the tutor again
+        self.assertEqual(self.audit(now + MANUAL_AUDIT_HOLD + timedelta(days=1)), (1, 1))
+        self.assertTrue(TutorProfile.objects.get(pk=self.tutor.pk).intervention_required)
+
+
+class FacetTests(TestCase):
+    """Price buckets do not overlap and each facet group ignores its own filter"""
+
+    @classmethod
+    def setUpTestData(cls):
+        for index, (rate, online) in enumerate([(500, True), (1000, False), (1500, True)]):
+            user = User.objects.create_user(username=f'tutor{index}', password=None, role='tutor')
+            TutorProfile.objects.create(
+                user=user, city='Pune', state='Maharashtra', pincode='411001',
+                hourly_rate=Decimal(rate), is_available_online=online, is_available_home=not online,
+            )
+
+    def facets(self, params):
+        return compute_facets(apply_base_filters(TutorProfile.objects.all(), params), params)
+
+    def test_price_boundaries(self):
+        self.assertEqual([bucket['count'] for bucket in self.facets({})['prices']], [0, 1, 2, 0])
+
+    def test_own_filter_ignored(self):
+        facets = self.facets({'mode': 'online', 'min_price': '1000'})
+        self.assertEqual(facets['total'], 1)
+        self.assertEqual(facets['modes'], {'online': 1, 'home': 1})
+        self.assertEqual([bucket['count'] for bucket in facets['prices']], [0, 1, 1, 0])
+
+
+class RankingTierTests(TestCase):
+    """Saves only recompute the ranking tier when the premium flags change"""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(username='tutor', password=None, role='tutor')
+        cls.tutor = TutorProfile.objects.create(user=user, city='Pune', state='Maharashtra', pincode='411001')
+
+    def test_recomputed_on_flag_change(self):
+        tutor = TutorProfile.objects.get(pk=self.tutor.pk)
+        tutor.bio = 'New bio'
+        with mock.patch.object(TutorProfile, 'compute_ranking_tier', autospec=True) as compute:
+            tutor.save()
+        compute.assert_not_called()
+
+        tutor.is_featured = True
+        tutor.save()
+        tier = TutorProfile.objects.values_list('ranking_tier', flat=True).get(pk=self.tutor.pk)
+        self.assertEqual(tier, TutorProfile.TIER_FEATURED)
+
+
+class SearchLocationTests(SimpleTestCase):
+    """Only finite coordinates on the globe are used as the searcher's location"""
+
+    def test_parse_coordinates(self):
+        self.assertEqual(parse_coordinates('19.07', '72.87'), (19.07, 72.87))
+        self.assertEqual(parse_coordinates(-90, 180), (-90.0, 180.0))
+        for latitude, longitude in [('inf', '1'), ('1', '-inf'), ('nan', '1'), ('91', '1'), ('1', '180.5'), ('', '1'), (None, None)]:
+            with self.subTest(latitude=latitude, longitude=longitude):
+                self.assertIsNone(parse_coordinates(latitude, longitude))
+                self.assertIsNone(get_search_location({'lat': latitude, 'lon': longitude}))
+                self.assertIsNone(get_nearest_params({'nearest': '5', 'lat': latitude, 'lon': longitude}))
+
+    def test_nearest_params(self):
+        self.assertEqual(get_nearest_params({'nearest': '500', 'lat': '19', 'lon': '72'}), (19.0, 72.0, MAX_NEAREST))
+        self.assertIsNone(get_nearest_params({'nearest': '0', 'lat': '19', 'lon': '72'}))
+
+
+class HomeProximityTests(TestCase):
+    """Home tutoring searches skip the proximity filter for invalid locations or distances instead of failing"""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(username='tutor', password=None, role='tutor')
+        cls.tutor = TutorProfile.objects.create(
+            user=user, city='Mumbai', state='Maharashtra', pincode='400001',
+            latitude=Decimal('19.0760'), longitude=Decimal('72.8777'), max_travel_distance=10,
+            is_available_home=True,
+        )
+
+    def search(self, **params):
+        return list(apply_search_filters(TutorProfile.objects.all(), dict(mode='home', **params)))
+
+    def test_valid_location(self):
+        self.assertEqual(self.search(lat='19.08', lon='72.88'), [self.tutor])
+        self.assertEqual(self.search(lat='28.61', lon='77.21'), [])
+
+    def test_invalid_values(self):
+        for params in [
+            {'lat': 'nan', 'lon': '72.88'},
+            {'lat': 'inf', 'lon': 'inf'},
+            {'lat': '19.08', 'lon': '-inf'},
+            {'lat': '95', 'lon': '72.88'},
+            {'lat': '19.08', 'lon': '72.88', 'max_distance': 'nan'},
+            {'lat': '19.08', 'lon': '72.88', 'max_distance': 'inf'},
+            {'lat': '19.08', 'lon': '72.88', 'max_distance': '-5'},
+        ]:
+            with self.subTest(params=params):
+                self.assertEqual(self.search(**params), [self.tutor])
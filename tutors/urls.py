@@ -5,12 +5,14 @@ app_name = 'tutors'
 
 urlpatterns = [
     path('dashboard/', views.tutor_dashboard, name='dashboard'),
+    path('dashboard/charts/<slug:chart>/', views.dashboard_chart_data, name='dashboard_chart'),
     path('profile-builder/', views.tutor_profile_builder, name='profile_builder'),
     path('pricing/', views.manage_pricing, name='manage_pricing'),
     path('documents/', views.upload_documents, name='upload_documents'),
     path('premium/', views.premium_features, name='premium_features'),
     path('premium/payment/<int:payment_id>/', views.process_premium_payment, name='process_premium_payment'),
     path('search/', views.tutor_search, name='search'),
+    path('autocomplete/', views.autocomplete, name='autocomplete'),
     path('become-tutor/', views.become_tutor, name='become_tutor'),
     path('resources/', views.tutor_resources, name='resources'),
     path('disputes/', views.tutor_disputes, name='disputes'),
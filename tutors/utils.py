@@ -1,6 +1,10 @@
 import math
-from django.db.models import Q, Avg, Count, F
+import re
+import numpy as np
+from django.db.models import Q, Avg, Count, F, Case, When, Value, FloatField, OuterRef, Subquery, Exists
+from django.db.models.functions import Cast, Coalesce
 from django.conf import settings
+from .geo import EARTH_RADIUS_KM, covers_point, distance_expression, within_bounding_box
 
 
 def calculate_distance(lat1, lon1, lat2, lon2):
@@ -21,32 +25,159 @@ def calculate_distance(lat1, lon1, lat2, lon2):
     a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
     c = 2 * math.asin(math.sqrt(a))
     
-    # Radius of earth in kilometers
-    r = 6371
-    
-    return c * r
+    return c * EARTH_RADIUS_KM
 
 
 def filter_tutors_by_proximity(tutors, user_lat, user_lon, max_distance_km=10):
     """
     Filter tutors by proximity to user location
-    Returns tutors within max_distance_km
+    Returns a queryset of tutors within max_distance_km, annotated with distance
     """
     if not user_lat or not user_lon:
         return tutors
     
-    nearby_tutors = []
-    for tutor in tutors:
-        if tutor.latitude and tutor.longitude:
-            distance = calculate_distance(
-                user_lat, user_lon,
-                float(tutor.latitude), float(tutor.longitude)
-            )
-            if distance and distance <= max_distance_km:
-                tutor.distance = distance
-                nearby_tutors.append(tutor)
+    # Narrow candidates with the geohash/bounding box index before the exact check
+    return tutors.filter(
+        within_bounding_box(user_lat, user_lon, max_distance_km)
+    ).annotate(
+        distance=distance_expression(user_lat, user_lon)
+    ).filter(distance__lte=max_distance_km)
+
+
+def filter_tutors_by_coverage(tutors, user_lat, user_lon):
+    """
+    Filter tutors willing to travel to user location
+    Matches the point against each tutor's max_travel_distance circle:
+    the coverage bounding box narrows candidates, then the exact distance
+    is compared with the tutor's own radius in SQL
+    """
+    if not user_lat or not user_lon:
+        return tutors
     
-    return nearby_tutors
+    if 'distance' not in tutors.query.annotations:
+        tutors = tutors.annotate(distance=distance_expression(user_lat, user_lon))
+    return tutors.filter(
+        covers_point(user_lat, user_lon),
+        distance__lte=F('max_travel_distance')
+    )
+
+
+def nearest_tutors(tutors, user_lat, user_lon, k=10, initial_radius_km=5, max_radius_km=None):
+    """
+    Get the k nearest tutors to user location, ordered by distance
+    Expands the search radius until k tutors are found, so distances are
+    only computed for tutors inside the indexed bounding box of each ring
+    """
+    tutors = tutors.filter(latitude__isnull=False, longitude__isnull=False)
+    radius = initial_radius_km
+    while max_radius_km is None or radius < max_radius_km:
+        # Beyond half the earth's circumference every tutor is inside the ring
+        if radius >= math.pi * EARTH_RADIUS_KM:
+            break
+        if filter_tutors_by_proximity(tutors, user_lat, user_lon, radius).count() >= k:
+            break
+        radius *= 2
+    
+    if max_radius_km is not None:
+        radius = min(radius, max_radius_km)
+    if radius < math.pi * EARTH_RADIUS_KM:
+        tutors = filter_tutors_by_proximity(tutors, user_lat, user_lon, radius)
+    else:
+        tutors = tutors.annotate(distance=distance_expression(user_lat, user_lon))
+    return tutors.order_by('distance', 'id')[:k]
+
+
+_SERVICE_AREA_SEPARATORS = re.compile(r'[,;\n]+')
+
+
+def normalize_service_area(text):
+    """
+    Normalize a service area for lookups: lowercase with single spaces,
+    pincodes without inner spaces ("400 001" -> "400001").
+    Returns (kind, value) where kind is 'pincode' or 'area'.
+    """
+    value = ' '.join(str(text).lower().split())
+    compact = value.replace(' ', '')
+    if compact.isdigit():
+        return 'pincode', compact
+    return 'area', value
+
+
+def parse_service_areas(service_areas):
+    """Split a comma-separated service area list into unique (kind, value) pairs"""
+    from .models import TutorServiceArea
+    
+    max_length = TutorServiceArea._meta.get_field('value').max_length
+    areas = []
+    for part in _SERVICE_AREA_SEPARATORS.split(service_areas or ''):
+        kind, value = normalize_service_area(part)
+        value = value[:max_length]
+        if value and (kind, value) not in areas:
+            areas.append((kind, value))
+    return areas
+
+
+def tutor_service_areas(service_areas, city='', state=''):
+    """
+    The (kind, value) pairs a tutor is found by: its parsed service areas
+    plus its city and state. City and state names are also indexed from
+    each later word, so "bengal" finds tutors in West Bengal.
+    """
+    from .models import TutorServiceArea
+    
+    max_length = TutorServiceArea._meta.get_field('value').max_length
+    areas = parse_service_areas(service_areas)
+    for kind, text in (('city', city), ('state', state)):
+        words = str(text or '').lower().split()
+        for start in range(len(words)):
+            value = ' '.join(words[start:])[:max_length]
+            if (kind, value) not in areas:
+                areas.append((kind, value))
+    return areas
+
+
+def filter_tutors_by_service_area(tutors, location):
+    """
+    Filter tutors by city, state or service area using the service area table.
+    Pincodes match exactly (a tutor's own pincode counts), area, city and
+    state names by prefix.
+    """
+    from .models import TutorServiceArea
+    
+    kind, value = normalize_service_area(location)
+    if not value:
+        return tutors
+    if kind == 'pincode':
+        areas = TutorServiceArea.objects.filter(kind='pincode', value=value)
+        return tutors.filter(Q(pincode=value) | Q(id__in=areas.values('tutor_id')))
+    areas = TutorServiceArea.objects.filter(kind__in=TutorServiceArea.NAME_KINDS, value__startswith=value)
+    return tutors.filter(id__in=areas.values('tutor_id'))
+
+
+def price_condition(min_price=None, max_price=None, subject=None, mode=None):
+    """
+    Build a Q for tutors charging between min_price and max_price (either
+    may be None). Tutors with pricing for the given subject (and mode) are
+    matched on those prices through the pricing lookup index, the rest on
+    their overall min_price/max_price range.
+    """
+    from .models import PricingOption
+
+    in_range = Q()
+    option_in_range = Q()
+    if min_price is not None:
+        in_range &= Q(max_price__gte=min_price)
+        option_in_range &= Q(price_per_hour__gte=min_price)
+    if max_price is not None:
+        in_range &= Q(min_price__lte=max_price)
+        option_in_range &= Q(price_per_hour__lte=max_price)
+    if not subject:
+        return in_range
+
+    options = PricingOption.objects.filter(tutor=OuterRef('pk'), subject=subject, is_active=True)
+    if mode in ('online', 'home'):
+        options = options.filter(mode=mode)
+    return Q(Exists(options.filter(option_in_range))) | (~Q(Exists(options)) & in_range)
 
 
 def calculate_match_score(tutor_profile, student_profile, preferences=None):
@@ -96,9 +227,132 @@ def calculate_match_score(tutor_profile, student_profile, preferences=None):
     return min(score, max_score)
 
 
+def batch_match_scores(tutors, student_profile, preferred_subject_ids=None):
+    """
+    Calculate AI matchmaking scores for many tutors at once
+    Same 0-100 formula as calculate_match_score, but the student's preferences
+    are loaded once, each tutor's subjects are loaded in one query as integer
+    bitsets, and all scores are computed in one vectorized pass
+    Returns a dict of tutor id -> score
+    """
+    from .models import TutorProfile
+    
+    tutors = list(tutors)
+    if not tutors:
+        return {}
+    if preferred_subject_ids is None:
+        preferred_subject_ids = list(student_profile.preferred_subjects.values_list('id', flat=True))
+    tutor_ids = [tutor.id for tutor in tutors]
+    n = len(tutors)
+    score = np.zeros(n, dtype=np.float64)
+    
+    # Subject match (30 points): popcount of tutor subjects AND preferred subjects
+    if preferred_subject_ids:
+        subject_rows = list(
+            TutorProfile.subjects.through.objects.filter(
+                tutorprofile_id__in=tutor_ids
+            ).values_list('tutorprofile_id', 'subject_id')
+        )
+        subject_ids = sorted(set(preferred_subject_ids) | {subject_id for _, subject_id in subject_rows})
+        bit_positions = {subject_id: index for index, subject_id in enumerate(subject_ids)}
+        words = (len(subject_ids) + 63) // 64
+        row_positions = {tutor_id: index for index, tutor_id in enumerate(tutor_ids)}
+        
+        tutor_masks = np.zeros((n, words), dtype=np.uint64)
+        for tutor_id, subject_id in subject_rows:
+            bit = bit_positions[subject_id]
+            tutor_masks[row_positions[tutor_id], bit // 64] |= np.uint64(1 << (bit % 64))
+        preferred_mask = np.zeros(words, dtype=np.uint64)
+        for subject_id in set(preferred_subject_ids):
+            bit = bit_positions[subject_id]
+            preferred_mask[bit // 64] |= np.uint64(1 << (bit % 64))
+        
+        common_subjects = np.bitwise_count(tutor_masks & preferred_mask).sum(axis=1)
+        score += (common_subjects / len(preferred_subject_ids)) * 30
+    
+    # Level match (20 points)
+    if student_profile.grade_level:
+        level_match = np.array([
+            tutor.teaching_levels == 'all' or student_profile.grade_level in tutor.teaching_levels
+            for tutor in tutors
+        ], dtype=bool)
+        score += np.where(level_match, 20, 0)
+    
+    # Mode preference (15 points)
+    if student_profile.preferred_mode == 'both':
+        score += 15
+    elif student_profile.preferred_mode in ('online', 'home'):
+        available_field = f'is_available_{student_profile.preferred_mode}'
+        mode_match = np.array([getattr(tutor, available_field) for tutor in tutors], dtype=bool)
+        score += np.where(mode_match, 15, 0)
+    
+    # Rating (20 points)
+    ratings = np.array([float(tutor.average_rating or 0) for tutor in tutors], dtype=np.float64)
+    score += (ratings / 5.0) * 20
+    
+    # Verification status (10 points)
+    verified = np.array([tutor.is_verified for tutor in tutors], dtype=bool)
+    score += np.where(verified, 10, 0)
+    
+    # Experience (5 points)
+    experience = np.array([tutor.years_of_experience for tutor in tutors], dtype=np.int64)
+    score += np.where(experience >= 3, 5, 0)
+    
+    score = np.minimum(score, 100)
+    return dict(zip(tutor_ids, score.tolist()))
+
+
+def match_score_expression(student_profile):
+    """
+    Database expression equivalent to calculate_match_score for one student,
+    so match scores can be used for ordering and pagination in SQL
+    """
+    from .models import TutorProfile
+    
+    score = Value(0.0)
+    
+    # Subject match (30 points)
+    preferred_ids = list(student_profile.preferred_subjects.values_list('id', flat=True))
+    if preferred_ids:
+        through = TutorProfile.subjects.through
+        common_subjects = through.objects.filter(
+            tutorprofile_id=OuterRef('pk'),
+            subject_id__in=preferred_ids
+        ).values('tutorprofile_id').annotate(count=Count('id')).values('count')
+        score = score + (
+            Cast(Coalesce(Subquery(common_subjects), 0), FloatField()) / Value(float(len(preferred_ids)))
+        ) * Value(30.0)
+    
+    # Level match (20 points)
+    if student_profile.grade_level:
+        score = score + Case(
+            When(Q(teaching_levels='all') | Q(teaching_levels__contains=student_profile.grade_level), then=Value(20.0)),
+            default=Value(0.0),
+        )
+    
+    # Mode preference (15 points)
+    if student_profile.preferred_mode == 'both':
+        score = score + Value(15.0)
+    elif student_profile.preferred_mode in ('online', 'home'):
+        available_field = f'is_available_{student_profile.preferred_mode}'
+        score = score + Case(When(**{available_field: True}, then=Value(15.0)), default=Value(0.0))
+    
+    # Rating (20 points)
+    score = score + Coalesce(Cast(F('average_rating'), FloatField()), Value(0.0)) / Value(5.0) * Value(20.0)
+    
+    # Verification status (10 points)
+    score = score + Case(When(is_verified=True, then=Value(10.0)), default=Value(0.0))
+    
+    # Experience (5 points)
+    score = score + Case(When(years_of_experience__gte=3, then=Value(5.0)), default=Value(0.0))
+    
+    return score
+
+
 def get_ai_recommendations(student_profile, limit=10):
     """
     Get AI-powered tutor recommendations for a student
+    Returned tutors carry their score as `match_score`
     """
     from .models import TutorProfile
     
@@ -109,8 +363,9 @@ def get_ai_recommendations(student_profile, limit=10):
     )
     
     # Filter by preferred subjects
-    if student_profile.preferred_subjects.exists():
-        tutors = tutors.filter(subjects__in=student_profile.preferred_subjects.all()).distinct()
+    preferred_subject_ids = list(student_profile.preferred_subjects.values_list('id', flat=True))
+    if preferred_subject_ids:
+        tutors = tutors.filter(subjects__in=preferred_subject_ids).distinct()
     
     # Filter by mode
     if student_profile.preferred_mode == 'online':
@@ -118,14 +373,15 @@ def get_ai_recommendations(student_profile, limit=10):
     elif student_profile.preferred_mode == 'home':
         tutors = tutors.filter(is_available_home=True)
     
-    # Calculate match scores
-    scored_tutors = []
+    # Calculate match scores in one batch
+    tutors = list(tutors)
+    match_scores = batch_match_scores(tutors, student_profile, preferred_subject_ids)
+    
     for tutor in tutors:
-        match_score = calculate_match_score(tutor, student_profile)
-        scored_tutors.append((tutor, match_score))
+        tutor.match_score = match_scores[tutor.id]
     
     # Sort by match score (descending)
-    scored_tutors.sort(key=lambda x: x[1], reverse=True)
+    tutors.sort(key=lambda tutor: tutor.match_score, reverse=True)
     
     # Return top recommendations
-    return [tutor for tutor, score in scored_tutors[:limit]]
+    return tutors[:limit]
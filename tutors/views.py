@@ -1,17 +1,30 @@
 from django.shortcuts import render, redirect, get_object_or_404
+from django.http import JsonResponse
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.utils import timezone
 from django.db.models import Q, Avg, Count
+import time
 from datetime import timedelta
-from decimal import Decimal
 from .models import TutorProfile, TutorDocument, PricingOption, Subject, PremiumSubscription
 from .forms import PricingOptionForm, TutorDocumentForm
-from .utils import filter_tutors_by_proximity, calculate_distance, calculate_match_score
+from .utils import calculate_match_score
+from .search import (
+    apply_base_filters, apply_facet_filters, apply_nearest, get_nearest_params, ranked_search, fuzzy_correct_params,
+    SEARCH_PAGE_SIZE,
+)
+from .ranking import RANKING_KEYSET, assign_ranking_variant
+from .search_cache import normalize_search_filters
+from .pagination import paginate_keyset
+from .facets import compute_facets, price_facet_bounds
+from .autocomplete import get_autocomplete_index, MAX_SUGGESTIONS, SUGGESTION_KINDS
+from .dashboard import DASHBOARD_CHARTS, dashboard_cards, dashboard_chart
 from bookings.models import Booking, AvailabilitySlot
 from payments.models import PremiumPayment, Payment
 from reviews.models import Dispute, Review
 from messaging.models import Message, Conversation
+from analytics.search_log import log_search
+from core.cached_json import cached_json_response
 
 
 @login_required
@@ -30,9 +43,8 @@ def tutor_dashboard(request):
     
     tutor_profile, created = TutorProfile.objects.get_or_create(user=request.user)
     
-    # Get statistics
-    total_bookings = Booking.objects.filter(tutor=request.user).count()
-    pending_bookings_count = Booking.objects.filter(tutor=request.user, status='pending').count()
+    # Summary cards from the daily rollup, the charts are fetched after the page loads
+    cards = dashboard_cards(request.user)
     
     # Get actual pending bookings list (most recent first)
     pending_bookings = Booking.objects.filter(
@@ -74,117 +86,6 @@ def tutor_dashboard(request):
     total_fields = len(profile_fields)
     profile_completion = int((completed_fields / total_fields) * 100) if total_fields > 0 else 0
     
-    # Class per day chart data (last 7 days) - SQLite compatible
-    from django.db.models import Count
-    from collections import defaultdict
-    last_7_days = timezone.now() - timedelta(days=7)
-    classes_per_day_qs = Booking.objects.filter(
-        tutor=request.user,
-        status='accepted',
-        lesson_date__gte=last_7_days.date()
-    ).values('lesson_date').annotate(
-        count=Count('id')
-    ).order_by('lesson_date')
-    
-    # Prepare chart data - group by date
-    class_data_dict = defaultdict(int)
-    for item in classes_per_day_qs:
-        date_str = item['lesson_date'].strftime('%Y-%m-%d')
-        class_data_dict[date_str] = item['count']
-    
-    # Fill in all 7 days
-    from datetime import date
-    today = timezone.now().date()
-    class_dates = []
-    class_counts = []
-    for i in range(7):
-        day = today - timedelta(days=6-i)
-        day_str = day.strftime('%Y-%m-%d')
-        class_dates.append(day.strftime('%b %d'))
-        class_counts.append(class_data_dict.get(day_str, 0))
-    
-    # Weekly earnings (last 4 weeks) - use paid_at for completed payments
-    from django.db.models import Sum, Q
-    weekly_earnings = []
-    now = timezone.now()
-    
-    # Get all completed payments for this tutor with paid_at or created_at
-    all_completed_payments = list(Payment.objects.filter(
-        tutor=request.user,
-        status='completed'
-    ).select_related('booking'))
-    
-    # Calculate 4 weeks of data (most recent week first)
-    for week_num in range(4):
-        # Week 0 = current week (last 7 days)
-        # Week 1 = 7-14 days ago
-        # Week 2 = 14-21 days ago  
-        # Week 3 = 21-28 days ago
-        days_ago_start = (week_num + 1) * 7
-        days_ago_end = week_num * 7
-        
-        week_start = now - timedelta(days=days_ago_start)
-        week_end = now - timedelta(days=days_ago_end) if week_num > 0 else now
-        
-        # Calculate total for this week
-        week_total = 0.0
-        for payment in all_completed_payments:
-            # Use paid_at if available, otherwise use created_at
-            payment_date = payment.paid_at if payment.paid_at else payment.created_at
-            if payment_date:
-                # Ensure timezone-aware comparison
-                if hasattr(payment_date, 'tzinfo') and payment_date.tzinfo is None:
-                    payment_date = timezone.make_aware(payment_date)
-                elif hasattr(week_start, 'tzinfo') and week_start.tzinfo is None:
-                    week_start = timezone.make_aware(week_start)
-                    week_end = timezone.make_aware(week_end)
-                
-                if week_start <= payment_date <= week_end:
-                    week_total += float(payment.tutor_payout)
-        
-        weekly_earnings.insert(0, week_total)
-    
-    # Monthly earnings (last 6 months) - SQLite compatible
-    from collections import defaultdict
-    
-    # Get all completed payments
-    all_payments = Payment.objects.filter(
-        tutor=request.user,
-        status='completed'
-    )
-    
-    # Group by month in Python - use paid_at for completed payments, fallback to created_at
-    monthly_data = defaultdict(float)
-    for payment in all_payments:
-        # Use paid_at if available (when payment was actually completed), otherwise use created_at
-        payment_date = payment.paid_at if payment.paid_at else payment.created_at
-        # Convert to date if datetime
-        if hasattr(payment_date, 'date') and callable(getattr(payment_date, 'date', None)):
-            payment_date = payment_date.date()
-        
-        month_key = payment_date.strftime('%Y-%m')
-        monthly_data[month_key] += float(payment.tutor_payout)
-    
-    # Get last 6 months (current month + 5 previous) - proper month calculation
-    monthly_labels = []
-    monthly_amounts = []
-    from datetime import date
-    current = timezone.now()
-    current_date = current.date() if hasattr(current, 'date') else date.today()
-    
-    for i in range(5, -1, -1):  # 5 months ago to current month
-        # Calculate month properly
-        year = current_date.year
-        month = current_date.month - i
-        while month <= 0:
-            month += 12
-            year -= 1
-        month_date = date(year, month, 1)
-        
-        month_key = month_date.strftime('%Y-%m')
-        monthly_labels.append(month_date.strftime('%b %Y'))
-        monthly_amounts.append(float(monthly_data.get(month_key, 0)))
-    
     # Recent bookings for column
     recent_bookings = Booking.objects.filter(
         tutor=request.user
@@ -204,137 +105,32 @@ def tutor_dashboard(request):
         conversation__in=conversations
     ).exclude(sender=request.user).order_by('-created_at')[:5]
     
-    # Student statistics
-    from reviews.models import Review
-    all_students = Booking.objects.filter(tutor=request.user).values('student').distinct()
-    total_students = all_students.count()
-    
-    # New students monthly (last 6 months) - proper month calculation
-    new_students_monthly = []
-    students_monthly_labels = []
-    from datetime import date, datetime
-    
-    current = timezone.now()
-    current_date = current.date() if hasattr(current, 'date') else date.today()
-    
-    for i in range(5, -1, -1):  # Last 6 months
-        # Calculate month start and end properly
-        year = current_date.year
-        month = current_date.month - i
-        while month <= 0:
-            month += 12
-            year -= 1
-        
-        month_start = date(year, month, 1)
-        if i == 0:
-            month_end = current_date
-        else:
-            # Get last day of month
-            if month == 12:
-                month_end = date(year + 1, 1, 1) - timedelta(days=1)
-            else:
-                month_end = date(year, month + 1, 1) - timedelta(days=1)
-        
-        # Convert to datetime for query
-        month_start_dt = timezone.make_aware(datetime.combine(month_start, datetime.min.time()))
-        month_end_dt = timezone.make_aware(datetime.combine(month_end, datetime.max.time()))
-        
-        month_new = Booking.objects.filter(
-            tutor=request.user,
-            created_at__gte=month_start_dt,
-            created_at__lte=month_end_dt
-        ).values('student').distinct().count()
-        
-        new_students_monthly.append(month_new)
-        students_monthly_labels.append(month_start.strftime('%b %Y'))
-    
-    # Rating data (last 6 months) - properly grouped by month
-    rating_data = defaultdict(list)
-    reviews = Review.objects.filter(tutor=request.user).order_by('created_at')
-    for review in reviews:
-        # Use the actual created_at date
-        review_date = review.created_at
-        if hasattr(review_date, 'date'):
-            review_date = review_date.date()
-        month_key = review_date.strftime('%Y-%m')
-        rating_data[month_key].append(review.rating)
-    
-    # Calculate average rating per month (last 6 months) - proper month calculation
-    rating_labels = []
-    rating_averages = []
-    from datetime import date
-    
-    current = timezone.now()
-    current_date = current.date() if hasattr(current, 'date') else date.today()
-    
-    for i in range(5, -1, -1):
-        # Calculate month properly
-        year = current_date.year
-        month = current_date.month - i
-        while month <= 0:
-            month += 12
-            year -= 1
-        month_date = date(year, month, 1)
-        
-        month_key = month_date.strftime('%Y-%m')
-        month_label = month_date.strftime('%b %Y')
-        ratings = rating_data.get(month_key, [])
-        # If no ratings for this month, use previous month's average or 0
-        if ratings:
-            avg_rating = sum(ratings) / len(ratings)
-        else:
-            # Try to get the last known rating average
-            if rating_averages:
-                avg_rating = rating_averages[-1] if rating_averages else 0
-            else:
-                avg_rating = 0
-        rating_labels.append(month_label)
-        rating_averages.append(round(avg_rating, 1))
-    
-    # Current average rating
-    current_avg_rating = reviews.aggregate(avg=Avg('rating'))['avg'] or 0
-    
-    # Calculate earnings for dashboard
-    # Total earning this week (current week - weekly_earnings[0])
-    earnings_this_week = weekly_earnings[0] if weekly_earnings else 0.0
-    
-    # Total earning this month (current month - last item in monthly_amounts)
-    earnings_this_month = monthly_amounts[-1] if monthly_amounts else 0.0
-    
-    # Total earning till now (sum of all completed payments)
-    total_earnings = sum(float(payment.tutor_payout) for payment in all_completed_payments)
-    
     context = {
+        **cards,
         'tutor_profile': tutor_profile,
-        'total_bookings': total_bookings,
         'pending_bookings': pending_bookings,
-        'pending_bookings_count': pending_bookings_count,
         'upcoming_bookings': upcoming_bookings,
         'tutor_disputes': tutor_disputes,
         'is_premium_boosted': is_premium_boosted,
         'active_subscriptions': active_subscriptions,
         'profile_completion': profile_completion,
-        'class_dates': class_dates,
-        'class_counts': class_counts,
-        'weekly_earnings': weekly_earnings,
-        'monthly_labels': monthly_labels,
-        'monthly_amounts': monthly_amounts,
         'recent_bookings': recent_bookings,
         'recent_payments': recent_payments,
         'recent_messages': recent_messages,
-        'total_students': total_students,
-        'new_students_monthly': new_students_monthly,
-        'students_monthly_labels': students_monthly_labels,
-        'rating_labels': rating_labels,
-        'rating_averages': rating_averages,
-        'current_avg_rating': round(current_avg_rating, 1),
-        'earnings_this_week': earnings_this_week,
-        'earnings_this_month': earnings_this_month,
-        'total_earnings': total_earnings,
     }
     return render(request, 'tutors/dashboard.jinja', context)
 
 
+@login_required
+def dashboard_chart_data(request, chart):
+    """Data of one tutor dashboard chart, cached per tutor"""
+    if not request.user.is_tutor():
+        return JsonResponse({'error': 'Tutor access required.'}, status=403)
+    if chart not in DASHBOARD_CHARTS:
+        return JsonResponse({'error': 'Unknown chart.'}, status=404)
+    return cached_json_response(request, f'tutor-chart:{chart}', lambda: dashboard_chart(request.user, chart))
+
+
 @login_required
 def tutor_profile_builder(request):
     """Tutor profile builder - guided form"""
@@ -418,19 +214,15 @@ def tutor_profile_builder(request):
         if onboarding_data:
             # Pre-populate subjects from onboarding
             if onboarding_data.subjects and not selected_subjects:
-                # Try to match onboarding subjects with Subject model
-                onboarding_subject_names = onboarding_data.subjects
-                matched_subjects = []
-                for subject_name in onboarding_subject_names:
-                    # Try exact match first
-                    subject = Subject.objects.filter(name__iexact=subject_name.strip()).first()
-                    if subject:
-                        matched_subjects.append(subject)
-                    else:
-                        # Try partial match
-                        subject = Subject.objects.filter(name__icontains=subject_name.strip()).first()
-                        if subject:
-                            matched_subjects.append(subject)
+                # Match onboarding subjects to Subject names in memory: exact,
+                # then prefix, then closest spelling ("mathmatics")
+                index = get_autocomplete_index()
+                subject_ids = []
+                for subject_name in onboarding_data.subjects:
+                    match = index.resolve('subject', subject_name)
+                    if match and match[1] not in subject_ids:
+                        subject_ids.append(match[1])
+                matched_subjects = list(Subject.objects.filter(id__in=subject_ids)) if subject_ids else []
                 
                 if matched_subjects:
                     tutor_profile.subjects.set(matched_subjects)
@@ -457,120 +249,81 @@ def tutor_profile_builder(request):
     return render(request, 'tutors/profile_builder.jinja', context)
 
 
+def _search_page_url(request, **changes):
+    """Current search URL without the page cursor, with params changed (None removes one)"""
+    params = request.GET.copy()
+    params.pop('cursor', None)
+    for key, value in changes.items():
+        if value is None:
+            params.pop(key, None)
+        else:
+            params[key] = value
+    return f'?{params.urlencode()}'
+
+
 def tutor_search(request):
     """Search for tutors with geolocation support"""
+    started = time.perf_counter()
     tutors = TutorProfile.objects.filter(
         is_verified=True, 
         verification_status='approved'
-    ).select_related('user').prefetch_related('subjects', 'premium_subscriptions')
-    
-    # Filters
-    subject = request.GET.get('subject')
-    city = request.GET.get('city')
-    mode = request.GET.get('mode')
-    min_price = request.GET.get('min_price')
-    max_price = request.GET.get('max_price')
-    min_rating = request.GET.get('min_rating')
-    class_level = request.GET.get('class_level')
-    location = request.GET.get('location')
-    featured_param = request.GET.get('featured')
-    featured_only = featured_param in ('on', '1', 'true', 'True')
-    
-    # Premium boost: Show featured tutors first
-    if featured_only:
-        tutors = tutors.filter(is_featured=True)
-    
-    if subject:
-        tutors = tutors.filter(subjects__id=subject)
-    if city:
-        tutors = tutors.filter(city__icontains=city)
-    if location:
-        tutors = tutors.filter(
-            Q(city__icontains=location) | 
-            Q(state__icontains=location) | 
-            Q(service_areas__icontains=location)
-        )
-    if mode == 'online':
-        tutors = tutors.filter(is_available_online=True)
-    elif mode == 'home':
-        tutors = tutors.filter(is_available_home=True)
-        # For home tutoring, filter by proximity if location provided
-        user_lat = request.GET.get('lat')
-        user_lon = request.GET.get('lon')
-        max_distance = request.GET.get('max_distance', 10)
-        if user_lat and user_lon:
-            try:
-                tutors = filter_tutors_by_proximity(
-                    tutors,
-                    float(user_lat),
-                    float(user_lon),
-                    float(max_distance)
-                )
-            except (ValueError, TypeError):
-                pass
-    
-    # Price filters
-    if min_price:
-        try:
-            tutors = tutors.filter(hourly_rate__gte=Decimal(min_price))
-        except (ValueError, TypeError):
-            pass
-    if max_price:
-        try:
-            tutors = tutors.filter(hourly_rate__lte=Decimal(max_price))
-        except (ValueError, TypeError):
-            pass
-    
-    # Rating filter
-    if min_rating:
-        try:
-            min_rating_decimal = Decimal(min_rating)
-            tutors = tutors.filter(average_rating__gte=min_rating_decimal)
-        except (ValueError, TypeError):
-            pass
-    
-    # Class level filter
-    if class_level:
-        if class_level == 'all':
-            pass  # Show all
-        else:
-            tutors = tutors.filter(teaching_levels=class_level)
-    
-    # Annotate with average rating (reviews_received is on User, not TutorProfile)
-    tutors = tutors.annotate(avg_rating=Avg('user__reviews_received__rating'))
-    
-    # Sort: Premium Package first, then Featured, then Boost, then by rating
-    tutors_list = list(tutors)
+    ).select_related('user').prefetch_related('subjects')
     
     # AI matchmaking if user is logged in and has student profile
-    # Calculate match scores first, then combine with premium status
+    student_profile = None
     if request.user.is_authenticated and hasattr(request.user, 'student_profile'):
         student_profile = request.user.student_profile
-        # Calculate match scores
-        scored_tutors = []
-        for tutor in tutors_list:
-            match_score = calculate_match_score(tutor, student_profile)
-            scored_tutors.append((tutor, match_score))
-        
-        # Sort by premium status first, then match score
-        scored_tutors.sort(key=lambda x: (
-            not x[0].has_premium_package(),  # Premium package first
-            not (x[0].is_featured or x[0].has_featured_subscription()),  # Featured next
-            not x[0].is_premium_boosted(),  # Boost next
-            -x[1],  # Then by match score (higher is better)
-            -float(x[0].average_rating or 0),  # Then by rating
-            float(x[0].hourly_rate or 999999)  # Then by price
-        ))
-        tutors_list = [tutor for tutor, score in scored_tutors]
+    
+    next_cursor = None
+    timer = None
+    nearest_mode = get_nearest_params(request.GET) is not None
+    if nearest_mode:
+        # Nearest K tutors mode is ordered by distance
+        tutors = apply_base_filters(tutors, request.GET)
+        facets = compute_facets(tutors, request.GET)
+        tutors_list = list(apply_nearest(apply_facet_filters(tutors, request.GET), request.GET)[0])
+        result_count = len(tutors_list)
+        variant = None
     else:
-        # Sort: Premium Package first, then Featured, then Boost, then by rating
-        tutors_list.sort(key=lambda t: (
-            not t.has_premium_package(),  # Premium package first (False sorts before True)
-            not (t.is_featured or t.has_featured_subscription()),  # Featured next
-            not t.is_premium_boosted(),  # Boost next
-            -float(t.average_rating or 0),  # Then by rating
-            float(t.hourly_rate or 999999)  # Then by price
-        ))
+        # Scored in the database with this user's variant weights, one keyset page at a time
+        variant, weights = assign_ranking_variant(request)
+        tutors, summary, timer = ranked_search(tutors, request.GET, weights, student_profile)
+        facets = summary['facets']
+        result_count = summary['count']
+        with timer.stage('page'):
+            tutors_list, next_cursor = paginate_keyset(tutors, RANKING_KEYSET, request.GET.get('cursor'), SEARCH_PAGE_SIZE)
+        timer.log(variant, result_count)
+    
+    # Log new searches (not further pages) for the search analytics
+    if not request.GET.get('cursor'):
+        log_search(
+            request, normalize_search_filters(request.GET), result_count,
+            (time.perf_counter() - started) * 1000, variant=variant, nearest=nearest_mode,
+        )
+    
+    # Nothing found: retry once with typos corrected ("mathmatics", "bangalor")
+    if not tutors_list and not request.GET.get('cursor') and not request.GET.get('fuzzy_from'):
+        corrections = fuzzy_correct_params(request.GET)
+        if corrections:
+            original = ', '.join(request.GET.get(name) for name in corrections)
+            return redirect(request.path + _search_page_url(request, fuzzy_from=original, **corrections))
+    
+    # Facet links for the filter sidebar
+    city_facets = [
+        (city, count, _search_page_url(request, city=city))
+        for city, count in facets['cities']
+    ]
+    price_facets = []
+    for bucket in facets['prices']:
+        min_price, max_price = price_facet_bounds(bucket['min_price'], bucket['max_price'])
+        price_facets.append(dict(bucket, url=_search_page_url(request, min_price=min_price, max_price=max_price)))
+    
+    next_page_url = None
+    if next_cursor:
+        next_page_url = _search_page_url(request, cursor=next_cursor)
+    first_page_url = None
+    if request.GET.get('cursor'):
+        first_page_url = _search_page_url(request)
     
     subjects = Subject.objects.all()
     context = {
@@ -578,8 +331,30 @@ def tutor_search(request):
         'subjects': subjects,
         'user_lat': request.GET.get('lat'),
         'user_lon': request.GET.get('lon'),
+        'nearest_mode': nearest_mode,
+        'next_page_url': next_page_url,
+        'first_page_url': first_page_url,
+        'facets': facets,
+        'city_facets': city_facets,
+        'price_facets': price_facets,
     }
-    return render(request, 'tutors/search.jinja', context)
+    response = render(request, 'tutors/search.jinja', context)
+    if timer is not None:
+        response['Server-Timing'] = timer.server_timing()
+    return response
+
+
+def autocomplete(request):
+    """Typeahead suggestions for subjects, cities, areas and tutor names (JSON)"""
+    kinds = [kind for kind in request.GET.get('types', '').split(',') if kind in SUGGESTION_KINDS]
+    try:
+        limit = min(max(int(request.GET.get('limit', 10)), 1), MAX_SUGGESTIONS)
+    except (ValueError, TypeError):
+        limit = 10
+    results = get_autocomplete_index().suggest(request.GET.get('q', ''), limit, kinds or None)
+    response = JsonResponse({'results': results})
+    response['Cache-Control'] = 'public, max-age=60'
+    return response
 
 
 def tutor_detail(request, tutor_id):
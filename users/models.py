@@ -42,6 +42,28 @@ class User(AbstractUser):
     def __str__(self):
         return f"{self.get_full_name() or self.username} ({self.get_role_display()})"
     
+    # Fields shown as tutor names in search autocomplete
+    NAME_FIELDS = {'first_name', 'last_name'}
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored name so a rename can refresh tutor name suggestions
+        instance._loaded_name = (instance.__dict__.get('first_name'), instance.__dict__.get('last_name'))
+        return instance
+    
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        renamed = (
+            (update_fields is None or bool(self.NAME_FIELDS & set(update_fields)))
+            and getattr(self, '_loaded_name', None) != (self.first_name, self.last_name)
+        )
+        super().save(*args, **kwargs)
+        self._loaded_name = (self.first_name, self.last_name)
+        if renamed and self.is_tutor():
+            from tutors.autocomplete import invalidate_autocomplete
+            invalidate_autocomplete('tutor')
+    
     def get_full_name(self):
         """Return full name or username"""
         if self.first_name and self.last_name: